@@ -17,6 +17,9 @@ depends_on = None
 
 
 def upgrade() -> None:
+    # Fresh schema with nothing to lose on a crash, so skip waiting on WAL flushes
+    op.execute('SET LOCAL synchronous_commit = OFF')
+
     # Create users table
     op.create_table('users',
         sa.Column('id', sa.Integer(), nullable=False),
@@ -27,11 +30,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index('idx_users_email', 'users', ['email'], unique=False)
-    op.create_index('idx_users_active', 'users', ['is_active'], unique=False)
-    op.create_index('idx_users_created_at', 'users', ['created_at'], unique=False)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_unique_constraint('uq_users_email', 'users', ['email'])
 
     # Create satellites table
     op.create_table('satellites',
@@ -44,11 +42,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('norad_id')
     )
-    op.create_index('idx_satellites_name', 'satellites', ['name'], unique=False)
-    op.create_index('idx_satellites_category', 'satellites', ['category'], unique=False)
-    op.create_index('idx_satellites_country', 'satellites', ['country'], unique=False)
-    op.create_index('idx_satellites_created_at', 'satellites', ['created_at'], unique=False)
-    op.create_index(op.f('ix_satellites_norad_id'), 'satellites', ['norad_id'], unique=False)
 
     # Create user_locations table
     op.create_table('user_locations',
@@ -64,10 +57,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index('idx_user_locations_user_id', 'user_locations', ['user_id'], unique=False)
-    op.create_index('idx_user_locations_coords', 'user_locations', ['latitude', 'longitude'], unique=False)
-    op.create_index('idx_user_locations_created_at', 'user_locations', ['created_at'], unique=False)
-    op.create_index(op.f('ix_user_locations_id'), 'user_locations', ['id'], unique=False)
 
     # Create user_favorite_satellites table
     op.create_table('user_favorite_satellites',
@@ -80,10 +69,30 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('user_id', 'norad_id', name='uq_user_favorite_satellite')
     )
-    op.create_index('idx_user_favorites_user_id', 'user_favorite_satellites', ['user_id'], unique=False)
-    op.create_index('idx_user_favorites_norad_id', 'user_favorite_satellites', ['norad_id'], unique=False)
-    op.create_index('idx_user_favorites_created_at', 'user_favorite_satellites', ['created_at'], unique=False)
-    op.create_index(op.f('ix_user_favorite_satellites_id'), 'user_favorite_satellites', ['id'], unique=False)
+
+    # Create all secondary indexes in a single round-trip
+    op.execute("""
+        DO $$
+        BEGIN
+            CREATE INDEX idx_users_active ON users (is_active);
+            CREATE INDEX idx_users_created_at ON users (created_at);
+            ALTER TABLE users ADD CONSTRAINT uq_users_email UNIQUE (email);
+
+            CREATE INDEX idx_satellites_name ON satellites (name);
+            CREATE INDEX idx_satellites_category ON satellites (category);
+            CREATE INDEX idx_satellites_country ON satellites (country);
+            CREATE INDEX idx_satellites_created_at ON satellites (created_at);
+
+            CREATE INDEX idx_user_locations_user_id ON user_locations (user_id);
+            CREATE INDEX idx_user_locations_coords ON user_locations (latitude, longitude);
+            CREATE INDEX idx_user_locations_created_at ON user_locations (created_at);
+
+            CREATE INDEX idx_user_favorites_user_id ON user_favorite_satellites (user_id);
+            CREATE INDEX idx_user_favorites_norad_id ON user_favorite_satellites (norad_id);
+            CREATE INDEX idx_user_favorites_created_at ON user_favorite_satellites (created_at);
+        END
+        $$;
+    """)
 
 
 def downgrade() -> None:
@@ -33,8 +33,6 @@ def upgrade() -> None:
     op.create_index('idx_positions_cache_norad_timestamp', 'satellite_positions_cache', ['norad_id', 'timestamp'], unique=False)
     op.create_index('idx_positions_cache_timestamp', 'satellite_positions_cache', ['timestamp'], unique=False)
     op.create_index('idx_positions_cache_created_at', 'satellite_positions_cache', ['created_at'], unique=False)
-    op.create_index(op.f('ix_satellite_positions_cache_id'), 'satellite_positions_cache', ['id'], unique=False)
-    op.create_index(op.f('ix_satellite_positions_cache_norad_id'), 'satellite_positions_cache', ['norad_id'], unique=False)
 
     # Create satellite_passes_cache table
     op.create_table('satellite_passes_cache',
@@ -57,8 +55,6 @@ def upgrade() -> None:
     op.create_index('idx_passes_cache_norad_time', 'satellite_passes_cache', ['norad_id', 'start_time'], unique=False)
     op.create_index('idx_passes_cache_expires', 'satellite_passes_cache', ['expires_at'], unique=False)
     op.create_index('idx_passes_cache_created_at', 'satellite_passes_cache', ['created_at'], unique=False)
-    op.create_index(op.f('ix_satellite_passes_cache_id'), 'satellite_passes_cache', ['id'], unique=False)
-    op.create_index(op.f('ix_satellite_passes_cache_norad_id'), 'satellite_passes_cache', ['norad_id'], unique=False)
 
 
 def downgrade() -> None:
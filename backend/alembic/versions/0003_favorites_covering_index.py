@@ -0,0 +1,38 @@
+"""Add covering (user_id, norad_id) index for favorites lookups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-01-20 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serve both the per-user list and the per-user+norad point lookup from one
+    # index; INCLUDE lets the hot queries run as index-only scans
+    op.create_index(
+        'idx_user_favorites_user_norad_covering',
+        'user_favorite_satellites',
+        ['user_id', 'norad_id'],
+        unique=False,
+        postgresql_include=['id', 'created_at']
+    )
+
+    # The leading user_id column of the covering index makes this one redundant
+    op.drop_index('idx_user_favorites_user_id', table_name='user_favorite_satellites')
+
+    op.execute('ANALYZE user_favorite_satellites')
+
+
+def downgrade() -> None:
+    op.create_index('idx_user_favorites_user_id', 'user_favorite_satellites', ['user_id'], unique=False)
+    op.drop_index('idx_user_favorites_user_norad_covering', table_name='user_favorite_satellites')
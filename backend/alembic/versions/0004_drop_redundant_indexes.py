@@ -0,0 +1,43 @@
+"""Drop indexes duplicated by primary keys, unique constraints, or compound indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-01-20 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) for every index that duplicates one Postgres already
+# maintains: the PK btree, the uq_users_email btree, or the leading column of a
+# compound (norad_id, ...) cache index. Databases created from the current 0001/0002
+# never had these, hence IF EXISTS.
+REDUNDANT_INDEXES = [
+    ('idx_users_email', 'users', ['email']),
+    ('ix_users_id', 'users', ['id']),
+    ('ix_satellites_norad_id', 'satellites', ['norad_id']),
+    ('ix_user_locations_id', 'user_locations', ['id']),
+    ('ix_user_favorite_satellites_id', 'user_favorite_satellites', ['id']),
+    ('ix_satellite_positions_cache_id', 'satellite_positions_cache', ['id']),
+    ('ix_satellite_positions_cache_norad_id', 'satellite_positions_cache', ['norad_id']),
+    ('ix_satellite_passes_cache_id', 'satellite_passes_cache', ['id']),
+    ('ix_satellite_passes_cache_norad_id', 'satellite_passes_cache', ['norad_id']),
+]
+
+
+def upgrade() -> None:
+    for index_name, table_name, _ in REDUNDANT_INDEXES:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+
+
+def downgrade() -> None:
+    for index_name, table_name, columns in REDUNDANT_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False, if_not_exists=True)
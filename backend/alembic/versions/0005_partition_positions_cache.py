@@ -0,0 +1,71 @@
+"""Partition satellite_positions_cache by timestamp and index it with BRIN
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-01-22 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Postgres cannot convert a table to partitioned in place. The table only holds
+    # cached API responses, so drop and recreate it rather than copying rows.
+    op.drop_table('satellite_positions_cache')
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE satellite_positions_cache (
+            id SERIAL NOT NULL,
+            norad_id INTEGER NOT NULL REFERENCES satellites (norad_id) ON DELETE CASCADE,
+            latitude DECIMAL(10, 8) NOT NULL,
+            longitude DECIMAL(11, 8) NOT NULL,
+            altitude DECIMAL(10, 2) NOT NULL,
+            velocity DECIMAL(10, 2) NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+
+    # Catch-all for rows outside the hourly partitions rolled by CacheService
+    op.execute("CREATE TABLE satellite_positions_cache_default PARTITION OF satellite_positions_cache DEFAULT")
+
+    op.create_index('idx_positions_cache_norad_timestamp', 'satellite_positions_cache', ['norad_id', 'timestamp'], unique=False)
+    op.create_index('idx_positions_cache_created_at', 'satellite_positions_cache', ['created_at'], unique=False)
+    op.create_index(
+        'brin_positions_timestamp',
+        'satellite_positions_cache',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('satellite_positions_cache')
+
+    op.create_table('satellite_positions_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('norad_id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.DECIMAL(precision=10, scale=8), nullable=False),
+        sa.Column('longitude', sa.DECIMAL(precision=11, scale=8), nullable=False),
+        sa.Column('altitude', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('velocity', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['norad_id'], ['satellites.norad_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_positions_cache_norad_timestamp', 'satellite_positions_cache', ['norad_id', 'timestamp'], unique=False)
+    op.create_index('idx_positions_cache_timestamp', 'satellite_positions_cache', ['timestamp'], unique=False)
+    op.create_index('idx_positions_cache_created_at', 'satellite_positions_cache', ['created_at'], unique=False)
@@ -0,0 +1,52 @@
+"""Store cache table coordinates and measurements as double precision
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-01-22 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# (table, column, original DECIMAL precision, scale). user_locations keeps DECIMAL
+# since it stores user input verbatim.
+CACHE_NUMERIC_COLUMNS = [
+    ('satellite_positions_cache', 'latitude', 10, 8),
+    ('satellite_positions_cache', 'longitude', 11, 8),
+    ('satellite_positions_cache', 'altitude', 10, 2),
+    ('satellite_positions_cache', 'velocity', 10, 2),
+    ('satellite_passes_cache', 'latitude', 10, 8),
+    ('satellite_passes_cache', 'longitude', 11, 8),
+    ('satellite_passes_cache', 'max_elevation', 5, 2),
+    ('satellite_passes_cache', 'start_azimuth', 5, 2),
+    ('satellite_passes_cache', 'end_azimuth', 5, 2),
+    ('satellite_passes_cache', 'magnitude', 4, 2),
+]
+
+
+def upgrade() -> None:
+    for table, column, _, _ in CACHE_NUMERIC_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Double(),
+            existing_type=sa.DECIMAL(),
+            postgresql_using=f'{column}::float8'
+        )
+
+
+def downgrade() -> None:
+    for table, column, precision, scale in CACHE_NUMERIC_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DECIMAL(precision=precision, scale=scale),
+            existing_type=sa.Double(),
+            postgresql_using=f'{column}::numeric({precision}, {scale})'
+        )
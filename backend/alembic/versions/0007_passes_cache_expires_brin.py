@@ -0,0 +1,31 @@
+"""Replace the passes cache expires_at btree with a BRIN index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-01-22 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_passes_cache_expires', table_name='satellite_passes_cache')
+    op.create_index(
+        'brin_passes_cache_expires',
+        'satellite_passes_cache',
+        ['expires_at'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 16}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('brin_passes_cache_expires', table_name='satellite_passes_cache')
+    op.create_index('idx_passes_cache_expires', 'satellite_passes_cache', ['expires_at'], unique=False)
@@ -0,0 +1,39 @@
+"""Use (user_id, norad_id) as the primary key of user_favorite_satellites
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-01-23 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The covering index INCLUDEs id and the unique constraint duplicates the new key
+    op.drop_index('idx_user_favorites_user_norad_covering', table_name='user_favorite_satellites')
+    op.drop_constraint('uq_user_favorite_satellite', 'user_favorite_satellites', type_='unique')
+    op.drop_index('ix_user_favorite_satellites_id', table_name='user_favorite_satellites', if_exists=True)
+
+    # Dropping the SERIAL column also drops its primary key and owned sequence
+    op.drop_column('user_favorite_satellites', 'id')
+    op.create_primary_key('pk_user_favs', 'user_favorite_satellites', ['user_id', 'norad_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('pk_user_favs', 'user_favorite_satellites', type_='primary')
+    op.execute("ALTER TABLE user_favorite_satellites ADD COLUMN id SERIAL PRIMARY KEY")
+    op.create_unique_constraint('uq_user_favorite_satellite', 'user_favorite_satellites', ['user_id', 'norad_id'])
+    op.create_index(
+        'idx_user_favorites_user_norad_covering',
+        'user_favorite_satellites',
+        ['user_id', 'norad_id'],
+        unique=False,
+        postgresql_include=['id', 'created_at']
+    )
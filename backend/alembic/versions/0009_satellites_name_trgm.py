@@ -0,0 +1,32 @@
+"""Index satellites.name with pg_trgm for substring search
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-01-23 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'idx_satellites_name_trgm',
+        'satellites',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.drop_index('idx_satellites_name', table_name='satellites')
+
+
+def downgrade() -> None:
+    op.create_index('idx_satellites_name', 'satellites', ['name'], unique=False)
+    op.drop_index('idx_satellites_name_trgm', table_name='satellites')
@@ -0,0 +1,77 @@
+"""Store cache table timestamps as UTC timestamp without time zone
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-01-23 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+PASSES_CACHE_TIMESTAMPS = ['start_time', 'end_time', 'expires_at']
+
+
+def _create_positions_cache(timestamp_type: str) -> None:
+    op.execute(f"""
+        CREATE TABLE satellite_positions_cache (
+            id SERIAL NOT NULL,
+            norad_id INTEGER NOT NULL REFERENCES satellites (norad_id) ON DELETE CASCADE,
+            latitude DOUBLE PRECISION NOT NULL,
+            longitude DOUBLE PRECISION NOT NULL,
+            altitude DOUBLE PRECISION NOT NULL,
+            velocity DOUBLE PRECISION NOT NULL,
+            timestamp {timestamp_type} NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE satellite_positions_cache_default PARTITION OF satellite_positions_cache DEFAULT")
+
+    op.create_index('idx_positions_cache_norad_timestamp', 'satellite_positions_cache', ['norad_id', 'timestamp'], unique=False)
+    op.create_index('idx_positions_cache_created_at', 'satellite_positions_cache', ['created_at'], unique=False)
+    op.create_index(
+        'brin_positions_timestamp',
+        'satellite_positions_cache',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+
+
+def upgrade() -> None:
+    for column in PASSES_CACHE_TIMESTAMPS:
+        op.alter_column(
+            'satellite_passes_cache',
+            column,
+            type_=sa.DateTime(timezone=False),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=False,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
+
+    # timestamp is the partition key of the positions cache and can't be altered
+    # in place; the table only holds cached API data, so recreate it
+    op.drop_table('satellite_positions_cache')
+    _create_positions_cache('TIMESTAMP WITHOUT TIME ZONE')
+
+
+def downgrade() -> None:
+    op.drop_table('satellite_positions_cache')
+    _create_positions_cache('TIMESTAMP WITH TIME ZONE')
+
+    for column in PASSES_CACHE_TIMESTAMPS:
+        op.alter_column(
+            'satellite_passes_cache',
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(timezone=False),
+            existing_nullable=False,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
@@ -2,34 +2,28 @@
 Authentication API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 
-from app.database import get_db
 from app.schemas.auth import UserCreate, UserLogin, AuthResponse, UserResponse, RefreshTokenRequest, RefreshTokenResponse
 from app.services.auth_service import AuthService
 from app.services.token_blacklist_service import TokenBlacklistService
-from app.utils.dependencies import get_current_active_user, get_token_blacklist_service
+from app.utils.dependencies import get_current_active_user, get_auth_service, get_token_blacklist_service
 from app.models.user import User
 
-# HTTP Bearer token scheme for logout
-security = HTTPBearer()
-
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Register a new user account.
     
     Args:
         user_data: User registration data (email, password, confirm_password)
-        db: Database session
+        auth_service: Authentication service instance
         
     Returns:
         AuthResponse: JWT token and user information
@@ -37,21 +31,20 @@ async def register_user(
     Raises:
         HTTPException: If email already exists or validation fails
     """
-    auth_service = AuthService(db)
     return auth_service.register_user(user_data)
 
 
 @router.post("/login", response_model=AuthResponse)
 async def login_user(
     login_data: UserLogin,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Login with email and password.
     
     Args:
         login_data: User login credentials (email, password)
-        db: Database session
+        auth_service: Authentication service instance
         
     Returns:
         AuthResponse: JWT token and user information
@@ -59,7 +52,6 @@ async def login_user(
     Raises:
         HTTPException: If credentials are invalid
     """
-    auth_service = AuthService(db)
     return auth_service.login_user(login_data)
 
 
@@ -82,7 +74,7 @@ async def get_current_user_info(
 @router.post("/refresh", response_model=RefreshTokenResponse)
 async def refresh_access_token(
     refresh_request: RefreshTokenRequest,
-    db: Session = Depends(get_db),
+    auth_service: AuthService = Depends(get_auth_service),
     blacklist_service: TokenBlacklistService = Depends(get_token_blacklist_service)
 ):
     """
@@ -90,7 +82,7 @@ async def refresh_access_token(
     
     Args:
         refresh_request: Refresh token request data
-        db: Database session
+        auth_service: Authentication service instance
         blacklist_service: Token blacklist service instance
         
     Returns:
@@ -107,20 +99,26 @@ async def refresh_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    auth_service = AuthService(db)
     return auth_service.refresh_access_token(refresh_request)
 
 
 @router.post("/logout")
 async def logout_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
     blacklist_service: TokenBlacklistService = Depends(get_token_blacklist_service)
 ):
     """
     Logout user by blacklisting the JWT token.
     
+    The token is blacklisted in-process before responding; the Redis write
+    runs as a background task after the response is sent.
+    
     Args:
-        credentials: HTTP authorization credentials containing the JWT token
+        request: The incoming request, carrying the token resolved by authentication
+        background_tasks: FastAPI background task queue
+        current_user: Current authenticated user from JWT token
         blacklist_service: Token blacklist service instance
     
     Returns:
@@ -129,15 +127,17 @@ async def logout_user(
     Raises:
         HTTPException: If token is invalid or blacklisting fails
     """
-    token = credentials.credentials
+    token = request.state.raw_token
     
-    # Blacklist the token
-    success = blacklist_service.blacklist_token(token)
+    # Blacklist the token locally, persist it after responding
+    exp_datetime = blacklist_service.remember_blacklisted_token(token)
     
-    if not success:
+    if exp_datetime is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to logout. Invalid token."
         )
     
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+    background_tasks.add_task(blacklist_service.store_blacklisted_token, token, exp_datetime)
+    
+    return {"message": "Successfully logged out"}
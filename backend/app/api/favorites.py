@@ -2,20 +2,23 @@
 Favorites API endpoints for managing user's favorite satellites.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List
 
 from app.schemas.favorite import (
     FavoriteCreate,
     FavoriteResponse,
     FavoritesListResponse,
+    FavoritesSummaryResponse,
     FavoriteBatchCreate,
     FavoriteBatchResponse,
     FavoriteDeleteResponse,
     FavoritesWithPositionsRequest
 )
-from app.services.favorite_service import FavoriteService, get_favorite_service
+from app.services.favorite_service import FavoriteService, get_favorite_service, get_favorites_etag
 from app.utils.dependencies import get_db, get_current_user
 from app.utils.exceptions import (
     NotFoundError,
@@ -28,36 +31,88 @@ from app.models.user import User
 router = APIRouter(prefix="/users", tags=["favorites"])
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def ndjson_stream(favorites: AsyncIterator[Dict[str, Any]], limit: int,
+                       total: int) -> AsyncIterator[str]:
+    """
+    Serialize favorites as newline-delimited JSON, followed by a trailing metadata line.
+    
+    Args:
+        favorites: Async iterator of favorite dictionaries
+        limit: Page size, used to decide whether another page exists
+        total: Total number of favorites across all pages
+    """
+    count = 0
+    last_id = None
+    async for favorite in favorites:
+        yield FavoriteResponse(**favorite).model_dump_json() + "\n"
+        count += 1
+        last_id = favorite["id"]
+    
+    yield json.dumps({
+        "total": total,
+        "next_cursor": last_id if count == limit else None
+    }) + "\n"
+
+
 @router.get(
     "/favorites",
     response_model=FavoritesListResponse,
     summary="Get user's favorite satellites",
-    description="Retrieve all favorite satellites for the current user with optional position data."
+    description="Retrieve a page of favorite satellites for the current user with optional position data. "
+                "Favorites are ordered by NORAD ID ascending; pass `next_cursor` back as `cursor` to get "
+                "the next page. `total` counts all favorites, not just the page. "
+                "Send `Accept: application/x-ndjson` to stream one favorite per line."
 )
 async def get_user_favorites(
+    request: Request,
     include_positions: bool = Query(True, description="Include current position data for satellites"),
     use_cache: bool = Query(True, description="Use cached position data when available"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of favorites to return"),
+    cursor: Optional[int] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     current_user: User = Depends(get_current_user),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     """
-    Get all favorite satellites for the current user.
+    Get favorite satellites for the current user, ordered by NORAD ID.
     
     - **include_positions**: Whether to include current position data (requires user location)
     - **use_cache**: Whether to use cached position data for better performance
+    - **limit**: Page size (1-200)
+    - **cursor**: Continue after a previous page
     
-    Returns a list of favorite satellites with their details and optional position data.
+    Returns a list of favorite satellites with their details and optional position data,
+    ordered by NORAD ID ascending, with the total number of favorites across all pages.
+    With `Accept: application/x-ndjson` each favorite is streamed on its own line and
+    the last line carries `total` and `next_cursor`.
     """
     try:
+        total = favorite_service.get_favorites_count(user_id=current_user.id)
+        
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            favorites = favorite_service.iter_user_favorites(
+                user_id=current_user.id,
+                include_positions=include_positions,
+                use_cache=use_cache,
+                limit=limit,
+                cursor=cursor
+            )
+            return StreamingResponse(ndjson_stream(favorites, limit, total), media_type=NDJSON_MEDIA_TYPE)
+        
         favorites = await favorite_service.get_user_favorites(
             user_id=current_user.id,
             include_positions=include_positions,
-            use_cache=use_cache
+            use_cache=use_cache,
+            limit=limit,
+            cursor=cursor
         )
         
         return FavoritesListResponse(
             favorites=favorites,
-            total=len(favorites)
+            total=total,
+            next_cursor=favorites[-1]["id"] if len(favorites) == limit else None
         )
         
     except NotFoundError as e:
@@ -92,9 +147,11 @@ async def add_favorite_satellite(
     The satellite information will be automatically retrieved and cached.
     """
     try:
+        # Still create the favorite even if we can't get satellite details
         favorite = await favorite_service.add_favorite(
             user_id=current_user.id,
-            norad_id=favorite_data.norad_id
+            norad_id=favorite_data.norad_id,
+            allow_missing_satellite=True
         )
         
         return FavoriteResponse(**favorite)
@@ -115,18 +172,10 @@ async def add_favorite_satellite(
             detail=e.message
         )
     except ExternalAPIError as e:
-        # Still create the favorite even if we can't get satellite details
-        try:
-            favorite = await favorite_service.add_favorite(
-                user_id=current_user.id,
-                norad_id=favorite_data.norad_id
-            )
-            return FavoriteResponse(**favorite)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Unable to add satellite to favorites: {e.message}"
-            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Unable to add satellite to favorites: {e.message}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -154,7 +203,7 @@ async def add_multiple_favorites(
     Returns information about successfully added satellites and any that were skipped.
     """
     try:
-        result = await favorite_service.add_multiple_favorites(
+        result = await favorite_service.add_multiple_favorites_bulk(
             user_id=current_user.id,
             norad_ids=batch_data.norad_ids
         )
@@ -166,6 +215,11 @@ async def add_multiple_favorites(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message
         )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -174,27 +228,27 @@ async def add_multiple_favorites(
 
 
 @router.delete(
-    "/favorites/{favorite_id}",
+    "/favorites/{norad_id:int}",
     response_model=FavoriteDeleteResponse,
     summary="Remove satellite from favorites",
-    description="Remove a satellite from the user's favorites list by favorite ID."
+    description="Remove a satellite from the user's favorites list by NORAD ID."
 )
 async def remove_favorite_satellite(
-    favorite_id: int,
+    norad_id: int,
     current_user: User = Depends(get_current_user),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     """
     Remove a satellite from the user's favorites list.
     
-    - **favorite_id**: ID of the favorite entry to remove
+    - **norad_id**: NORAD catalog number of the satellite to remove
     
     Returns confirmation of the removal.
     """
     try:
         result = favorite_service.remove_favorite(
             user_id=current_user.id,
-            favorite_id=favorite_id
+            norad_id=norad_id
         )
         
         return FavoriteDeleteResponse(**result)
@@ -215,7 +269,8 @@ async def remove_favorite_satellite(
     "/favorites/satellite/{norad_id}",
     response_model=FavoriteDeleteResponse,
     summary="Remove satellite from favorites by NORAD ID",
-    description="Remove a satellite from the user's favorites list by NORAD ID."
+    description="Deprecated alias of `DELETE /favorites/{norad_id}`.",
+    deprecated=True
 )
 async def remove_favorite_by_norad_id(
     norad_id: int,
@@ -229,48 +284,31 @@ async def remove_favorite_by_norad_id(
     
     Returns confirmation of the removal.
     """
-    try:
-        result = favorite_service.remove_favorite_by_norad_id(
-            user_id=current_user.id,
-            norad_id=norad_id
-        )
-        
-        return FavoriteDeleteResponse(**result)
-        
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to remove satellite from favorites"
-        )
+    return await remove_favorite_satellite(norad_id, current_user, favorite_service)
 
 
 @router.get(
-    "/favorites/{favorite_id}",
+    "/favorites/{norad_id:int}",
     response_model=FavoriteResponse,
     summary="Get specific favorite satellite",
-    description="Get details of a specific favorite satellite by favorite ID."
+    description="Get details of a specific favorite satellite by NORAD ID."
 )
-async def get_favorite_by_id(
-    favorite_id: int,
+async def get_favorite(
+    norad_id: int,
     current_user: User = Depends(get_current_user),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     """
     Get details of a specific favorite satellite.
     
-    - **favorite_id**: ID of the favorite entry
+    - **norad_id**: NORAD catalog number of the favorite satellite
     
     Returns the favorite satellite information.
     """
     try:
-        favorite = favorite_service.get_favorite_by_id(
+        favorite = favorite_service.get_favorite(
             user_id=current_user.id,
-            favorite_id=favorite_id
+            norad_id=norad_id
         )
         
         return FavoriteResponse(**favorite)
@@ -290,10 +328,12 @@ async def get_favorite_by_id(
 @router.get(
     "/favorites/check/{norad_id}",
     summary="Check if satellite is in favorites",
-    description="Check if a specific satellite is in the user's favorites list."
+    description="Check if a specific satellite is in the user's favorites list. Supports ETag revalidation."
 )
 async def check_satellite_favorite(
     norad_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
@@ -303,7 +343,13 @@ async def check_satellite_favorite(
     - **norad_id**: NORAD catalog number of the satellite
     
     Returns whether the satellite is favorited and the favorite ID if it exists.
+    Responds with 304 Not Modified when `If-None-Match` matches the current ETag.
     """
+    # Without a readable version there is no safe ETag; answer from the database
+    etag = get_favorites_etag(current_user.id, norad_id)
+    if etag is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
     try:
         is_favorite = favorite_service.is_satellite_favorite(
             user_id=current_user.id,
@@ -316,16 +362,10 @@ async def check_satellite_favorite(
         }
         
         if is_favorite:
-            # Get the favorite details
-            favorites = await favorite_service.get_user_favorites(
-                user_id=current_user.id,
-                include_positions=False
-            )
-            for fav in favorites:
-                if fav["norad_id"] == norad_id:
-                    result["favorite_id"] = fav["id"]
-                    break
+            result["favorite_id"] = norad_id
         
+        if etag is not None:
+            response.headers["ETag"] = etag
         return result
         
     except Exception as e:
@@ -335,10 +375,84 @@ async def check_satellite_favorite(
         )
 
 
+@router.head(
+    "/favorites/check/{norad_id}",
+    summary="Check if satellite is in favorites (headers only)",
+    description="Existence check without a body: 204 if the satellite is a favorite, 404 otherwise."
+)
+async def head_satellite_favorite(
+    norad_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    favorite_service: FavoriteService = Depends(get_favorite_service)
+):
+    """
+    Check if a satellite is in the user's favorites list without a response body.
+    
+    - **norad_id**: NORAD catalog number of the satellite
+    """
+    # Without a readable version there is no safe ETag; answer from the database
+    etag = get_favorites_etag(current_user.id, norad_id)
+    if etag is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    is_favorite = favorite_service.is_satellite_favorite(
+        user_id=current_user.id,
+        norad_id=norad_id
+    )
+    
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT if is_favorite else status.HTTP_404_NOT_FOUND,
+        headers={"ETag": etag} if etag is not None else None
+    )
+
+
+FAVORITES_SUMMARY_PARTS = {"list", "count", "norad_ids"}
+
+
+@router.get(
+    "/favorites/summary",
+    response_model=FavoritesSummaryResponse,
+    response_model_exclude_none=True,
+    summary="Get favorites summary",
+    description="Get the favorites count, NORAD IDs and list in one request, from a single query."
+)
+async def get_favorites_summary(
+    include: str = Query("count,norad_ids", description="Comma-separated parts to return: list, count, norad_ids"),
+    current_user: User = Depends(get_current_user),
+    favorite_service: FavoriteService = Depends(get_favorite_service)
+):
+    """
+    Get several views of the user's favorites at once.
+    
+    - **include**: Comma-separated parts to return (`list`, `count`, `norad_ids`)
+    
+    Replaces separate calls to `/favorites/count`, `/favorites/norad-ids` and `/favorites`.
+    """
+    parts = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = parts - FAVORITES_SUMMARY_PARTS
+    if not parts or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must list one or more of: {', '.join(sorted(FAVORITES_SUMMARY_PARTS))}"
+        )
+    
+    try:
+        return favorite_service.get_favorites_summary(user_id=current_user.id, include=parts)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get favorites summary"
+        )
+
+
 @router.get(
     "/favorites/count",
     summary="Get favorites count",
-    description="Get the total number of favorite satellites for the user."
+    description="Get the total number of favorite satellites for the user. "
+                "Deprecated: use `/favorites/summary?include=count`.",
+    deprecated=True
 )
 async def get_favorites_count(
     current_user: User = Depends(get_current_user),
@@ -368,7 +482,9 @@ async def get_favorites_count(
     "/favorites/norad-ids",
     response_model=List[int],
     summary="Get favorite NORAD IDs",
-    description="Get a list of NORAD IDs for all favorite satellites."
+    description="Get a list of NORAD IDs for all favorite satellites. "
+                "Deprecated: use `/favorites/summary?include=norad_ids`.",
+    deprecated=True
 )
 async def get_favorite_norad_ids(
     current_user: User = Depends(get_current_user),
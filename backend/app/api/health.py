@@ -2,20 +2,60 @@
 Health check and monitoring endpoints.
 """
 
+import asyncio
 import time
 from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
 
-from app.database import get_db
-from app.redis_client import redis_client
-from app.services.n2yo_service import N2YOService
+from app.config import settings
+from app.database import engine
+from app.redis_client import async_redis_client
+from app.services.n2yo_service import n2yo_service
 from app.utils.logging_config import get_logger
+from app.utils.versioning import APIVersion
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Everything in the status response except the timestamp is fixed at startup
+_STATUS_TEMPLATE = {
+    "api": {
+        "name": "Satellite Tracker & Alerts Platform API",
+        "version": APIVersion.CURRENT_VERSION,
+        "status": "operational",
+        "environment": settings.environment,
+        "debug_mode": settings.debug
+    },
+    "features": {
+        "authentication": True,
+        "rate_limiting": settings.rate_limit_enabled,
+        "caching": True,
+        "real_time_tracking": True,
+        "pass_predictions": True
+    },
+    "external_services": {
+        "n2yo_api": {
+            "name": "N2YO Satellite API",
+            "url": settings.n2yo_base_url,
+            "status": "unknown"  # Would check in production
+        }
+    },
+    "documentation": {
+        "swagger_ui": "/api/docs",
+        "redoc": "/api/redoc",
+        "openapi_spec": "/api/openapi.json"
+    }
+}
+
+# Last N2YO probe result, reused for N2YO_HEALTH_CACHE_TTL seconds so health
+# traffic doesn't spend the N2YO rate-limit budget
+N2YO_HEALTH_CACHE_TTL = 30
+_n2yo_health_cache: Dict[str, Any] = {"ts": 0.0, "value": None}
+_n2yo_health_lock = asyncio.Lock()
+
 
 @router.get("/health", tags=["Health"])
 async def health_check():
@@ -32,99 +72,161 @@ async def health_check():
     }
 
 
-@router.get("/health/detailed", tags=["Health"])
-async def detailed_health_check(db: Session = Depends(get_db)):
+def _ping_database() -> None:
     """
-    Detailed health check with dependency status.
+    Run SELECT 1 on a short-lived connection of its own.
     
-    Args:
-        db: Database session
-        
-    Returns:
-        Dict with detailed health information
+    Health probes run this in a worker thread under a timeout. Using its own
+    connection rather than the request's Session means a thread that outlives
+    the timeout never shares a Session with the event loop closing it.
     """
-    health_status = {
-        "status": "healthy",
-        "timestamp": time.time(),
-        "version": "1.0.0",
-        "checks": {}
-    }
-    
-    overall_healthy = True
-    
-    # Database health check
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _check_database() -> Dict[str, Any]:
+    """Probe the database with a trivial query, off the event loop."""
     try:
         start_time = time.time()
-        db.execute(text("SELECT 1"))
+        await asyncio.to_thread(_ping_database)
         db_response_time = time.time() - start_time
         
-        health_status["checks"]["database"] = {
+        return {
             "status": "healthy",
             "response_time": round(db_response_time * 1000, 2),  # ms
             "message": "Database connection successful"
         }
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
-        health_status["checks"]["database"] = {
+        return {
             "status": "unhealthy",
             "error": str(e),
             "message": "Database connection failed"
         }
-        overall_healthy = False
+
+
+async def _check_redis() -> Dict[str, Any]:
+    """Probe Redis with PING on the pooled async client."""
+    if not async_redis_client:
+        return {
+            "status": "unavailable",
+            "message": "Redis client not configured"
+        }
     
-    # Redis health check
     try:
-        if redis_client:
-            start_time = time.time()
-            await redis_client.ping()
-            redis_response_time = time.time() - start_time
-            
-            health_status["checks"]["redis"] = {
-                "status": "healthy",
-                "response_time": round(redis_response_time * 1000, 2),  # ms
-                "message": "Redis connection successful"
-            }
-        else:
-            health_status["checks"]["redis"] = {
-                "status": "unavailable",
-                "message": "Redis client not configured"
-            }
+        start_time = time.time()
+        await async_redis_client.ping()
+        redis_response_time = time.time() - start_time
+        
+        return {
+            "status": "healthy",
+            "response_time": round(redis_response_time * 1000, 2),  # ms
+            "message": "Redis connection successful"
+        }
     except Exception as e:
         logger.error(f"Redis health check failed: {str(e)}")
-        health_status["checks"]["redis"] = {
+        # Redis failure is not critical for basic functionality
+        return {
             "status": "unhealthy",
             "error": str(e),
             "message": "Redis connection failed"
         }
-        # Redis failure is not critical for basic functionality
+
+
+async def _check_n2yo() -> Dict[str, Any]:
+    """Return the cached N2YO probe result, probing again once it is stale."""
+    if time.time() - _n2yo_health_cache["ts"] < N2YO_HEALTH_CACHE_TTL:
+        return _n2yo_health_cache["value"]
     
-    # N2YO API health check
+    async with _n2yo_health_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.time() - _n2yo_health_cache["ts"] < N2YO_HEALTH_CACHE_TTL:
+            return _n2yo_health_cache["value"]
+        
+        try:
+            value = await asyncio.wait_for(_probe_n2yo(), timeout=settings.n2yo_health_timeout)
+        except asyncio.TimeoutError:
+            # Cache timeouts too, so a hung upstream isn't re-probed on every request
+            value = {"status": "degraded", "message": f"timeout after {settings.n2yo_health_timeout}s"}
+        _n2yo_health_cache.update(ts=time.time(), value=value)
+        return value
+
+
+async def _probe_n2yo() -> Dict[str, Any]:
+    """Probe the N2YO API with a lightweight HEAD request."""
     try:
-        n2yo_service = N2YOService()
         start_time = time.time()
-        # Try a simple API call to check connectivity
-        await n2yo_service._make_request("/satellites/above/41.702/-76.014/0/70/18/")
+        # Reachability only; a real API call would spend request quota
+        async with n2yo_service as n2yo:
+            await n2yo.health_ping()
         api_response_time = time.time() - start_time
         
-        health_status["checks"]["n2yo_api"] = {
+        return {
             "status": "healthy",
             "response_time": round(api_response_time * 1000, 2),  # ms
             "message": "N2YO API accessible"
         }
     except Exception as e:
         logger.warning(f"N2YO API health check failed: {str(e)}")
-        health_status["checks"]["n2yo_api"] = {
+        # External API failure is not critical for basic functionality
+        return {
             "status": "degraded",
             "error": str(e),
             "message": "N2YO API may be unavailable"
         }
-        # External API failure is not critical for basic functionality
+
+
+@router.get("/health/detailed", tags=["Health"])
+async def detailed_health_check():
+    """
+    Detailed health check with dependency status.
     
-    # Set overall status
-    if not overall_healthy:
-        health_status["status"] = "unhealthy"
-    elif any(check.get("status") == "degraded" for check in health_status["checks"].values()):
-        health_status["status"] = "degraded"
+    All dependency probes run concurrently, each bounded by its own timeout
+    setting, so one slow dependency can't stall the response.
+    
+    Returns:
+        Dict with detailed health information
+    """
+    health_status = {
+        "status": "healthy",
+        "timestamp": time.time(),
+        "version": "1.0.0",
+        "checks": {}
+    }
+    
+    # name -> (probe, timeout in seconds). The N2YO check applies its own
+    # timeout so that a timed-out probe is cached; an outer timeout of the same
+    # length would always fire first and skip that.
+    checks = {
+        "database": (_check_database(), settings.db_health_timeout),
+        "redis": (_check_redis(), settings.redis_health_timeout),
+        "n2yo_api": (_check_n2yo(), None),
+    }
+    results = await asyncio.gather(
+        *(asyncio.wait_for(check, timeout=timeout) for check, timeout in checks.values()),
+        return_exceptions=True
+    )
+    
+    statuses = []
+    for (name, (_, timeout)), result in zip(checks.items(), results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning(f"{name} health check timed out after {timeout}s")
+            result = {"status": "degraded", "message": f"timeout after {timeout}s"}
+        elif isinstance(result, Exception):
+            result = {"status": "degraded", "error": str(result), "message": "Health check failed"}
+        health_status["checks"][name] = result
+        
+        # Only the database is critical for basic functionality
+        check_status = result.get("status")
+        if check_status == "unhealthy" and name != "database":
+            check_status = "degraded"
+        statuses.append(check_status)
+    
+    health_status["status"] = (
+        "unhealthy" if "unhealthy" in statuses
+        else "degraded" if "degraded" in statuses
+        else "healthy"
+    )
     
     # Return appropriate HTTP status
     if health_status["status"] == "unhealthy":
@@ -137,19 +239,29 @@ async def detailed_health_check(db: Session = Depends(get_db)):
 
 
 @router.get("/health/readiness", tags=["Health"])
-async def readiness_check(db: Session = Depends(get_db)):
+async def readiness_check(
+    deep: bool = Query(False, description="Always verify the database with SELECT 1")
+):
     """
     Kubernetes readiness probe endpoint.
     
+    When the pool already holds idle connections the pod is reported ready
+    without a query: those connections worked when they were returned, and
+    pool_pre_ping re-validates them on checkout. Otherwise, or with ?deep=true,
+    a SELECT 1 runs in a worker thread so a slow database can't block the
+    event loop.
+    
     Args:
-        db: Database session
+        deep: Force the database query
         
     Returns:
         Dict with readiness status
     """
     try:
-        # Check database connectivity
-        db.execute(text("SELECT 1"))
+        pool = engine.pool
+        if deep or not isinstance(pool, QueuePool) or pool.checkedin() == 0:
+            # Check database connectivity
+            await asyncio.to_thread(_ping_database)
         
         return {
             "status": "ready",
@@ -172,6 +284,8 @@ async def liveness_check():
     """
     Kubernetes liveness probe endpoint.
     
+    Deliberately checks no dependencies, so a database outage doesn't get pods restarted.
+    
     Returns:
         Dict with liveness status
     """
@@ -184,20 +298,12 @@ async def liveness_check():
 @router.get("/metrics", tags=["Monitoring"])
 async def get_metrics():
     """
-    Basic application metrics endpoint.
+    Prometheus metrics endpoint.
     
     Returns:
-        Dict with application metrics
+        Response in the Prometheus text exposition format
     """
-    # In a production environment, you would integrate with
-    # Prometheus or another metrics system
-    return {
-        "timestamp": time.time(),
-        "uptime": time.time(),  # Would track actual uptime
-        "requests_total": 0,    # Would track total requests
-        "errors_total": 0,      # Would track total errors
-        "active_connections": 0  # Would track active connections
-    }
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @router.get("/status", tags=["Health"])
@@ -208,35 +314,4 @@ async def get_api_status():
     Returns:
         Dict with API status and configuration information
     """
-    from app.config import settings
-    from app.utils.versioning import APIVersion
-    
-    return {
-        "api": {
-            "name": "Satellite Tracker & Alerts Platform API",
-            "version": APIVersion.CURRENT_VERSION,
-            "status": "operational",
-            "environment": settings.environment,
-            "debug_mode": settings.debug
-        },
-        "features": {
-            "authentication": True,
-            "rate_limiting": settings.rate_limit_enabled,
-            "caching": True,
-            "real_time_tracking": True,
-            "pass_predictions": True
-        },
-        "external_services": {
-            "n2yo_api": {
-                "name": "N2YO Satellite API",
-                "url": settings.n2yo_base_url,
-                "status": "unknown"  # Would check in production
-            }
-        },
-        "documentation": {
-            "swagger_ui": "/api/docs",
-            "redoc": "/api/redoc",
-            "openapi_spec": "/api/openapi.json"
-        },
-        "timestamp": time.time()
-    }
\ No newline at end of file
+    return {**_STATUS_TEMPLATE, "timestamp": time.time()}
\ No newline at end of file
@@ -2,7 +2,7 @@
 Location API endpoints for user location management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -164,32 +164,21 @@ async def delete_user_location(
     description="Validate latitude and longitude coordinates without saving them."
 )
 async def validate_coordinates(
-    latitude: float,
-    longitude: float,
+    latitude: float = Query(..., ge=-90, le=90, description="Latitude in degrees"),
+    longitude: float = Query(..., ge=-180, le=180, description="Longitude in degrees"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Validate coordinate values.
     
-    - **latitude**: Latitude coordinate to validate
-    - **longitude**: Longitude coordinate to validate
+    - **latitude**: Latitude coordinate to validate (-90 to 90)
+    - **longitude**: Longitude coordinate to validate (-180 to 180)
     
-    Returns validation result and any error messages.
+    Out-of-range coordinates are rejected with a 422 validation error.
     """
-    from app.utils.location import validate_coordinates
-    
-    is_valid = validate_coordinates(latitude, longitude)
-    
-    errors = []
-    if not is_valid:
-        if not -90 <= latitude <= 90:
-            errors.append("Latitude must be between -90 and 90 degrees")
-        if not -180 <= longitude <= 180:
-            errors.append("Longitude must be between -180 and 180 degrees")
-    
     return {
-        "valid": is_valid,
+        "valid": True,
         "latitude": latitude,
         "longitude": longitude,
-        "errors": errors
+        "errors": []
     }
\ No newline at end of file
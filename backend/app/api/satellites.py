@@ -3,10 +3,8 @@ API endpoints for satellite search and information.
 """
 
 import logging
-from datetime import datetime
 from typing import List, Optional
-from functools import wraps
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, Query, Path
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -20,92 +18,13 @@ from app.schemas.satellite import (
     APIRateLimitStatus,
     ErrorResponse
 )
-from app.utils.exceptions import (
-    ValidationError,
-    NotFoundError,
-    ExternalAPIError,
-    RateLimitExceededError
-)
+from app.utils.exceptions import http_error
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/satellites", tags=["satellites"])
 
 
-def handle_satellite_exceptions(func):
-    """Decorator to handle common satellite service exceptions."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except ValidationError as e:
-            logger.warning(f"Validation error: {e}")
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except NotFoundError as e:
-            logger.warning(f"Not found error: {e}")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except RateLimitExceededError as e:
-            logger.warning(f"Rate limit exceeded: {e}")
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except ExternalAPIError as e:
-            logger.error(f"External API error: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": {
-                        "code": "INTERNAL_ERROR",
-                        "message": "An unexpected error occurred",
-                        "details": {"error": str(e)},
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-    return wrapper
-
-
 @router.get(
     "/search",
     response_model=SatelliteSearchResponse,
@@ -117,7 +36,6 @@ def handle_satellite_exceptions(func):
     summary="Search satellites by name",
     description="Search for satellites by name using the N2YO API. Results are enhanced with categorization and cached for performance."
 )
-@handle_satellite_exceptions
 async def search_satellites(
     query: str = Query(..., min_length=2, max_length=100, description="Search query (satellite name)"),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -137,17 +55,14 @@ async def search_satellites(
     """
     logger.info(f"Searching satellites with query: '{query}', category: {category}, limit: {limit}")
     
-    satellites = await satellite_service.search_satellites(query, use_cache=use_cache)
-    
-    # Apply category filter if specified
-    if category:
-        satellites = [sat for sat in satellites if sat.get("category", "").lower() == category.lower()]
-    
-    # Apply limit
-    satellites = satellites[:limit]
+    satellites = await satellite_service.search_satellites(
+        query, category=category, limit=limit, use_cache=use_cache
+    )
     
-    response = SatelliteSearchResponse(
-        satellites=[SatelliteInfo(**sat) for sat in satellites],
+    # Search results are normalized by the service; skip per-item validation here
+    # since the response model is validated once more on serialization
+    response = SatelliteSearchResponse.model_construct(
+        satellites=[SatelliteInfo.model_construct(**sat) for sat in satellites],
         total=len(satellites),
         query=query
     )
@@ -168,7 +83,6 @@ async def search_satellites(
     summary="Get satellite information",
     description="Get detailed information about a specific satellite by its NORAD ID."
 )
-@handle_satellite_exceptions
 async def get_satellite_info(
     norad_id: int = Path(..., description="NORAD catalog number", ge=1, le=999999),
     use_cache: bool = Query(True, description="Whether to use cached data"),
@@ -202,7 +116,6 @@ async def get_satellite_info(
     summary="Get satellite current position",
     description="Get the current position of a satellite as observed from a specific location."
 )
-@handle_satellite_exceptions
 async def get_satellite_position(
     norad_id: int = Path(..., description="NORAD catalog number", ge=1, le=999999),
     latitude: float = Query(..., ge=-90, le=90, description="Observer latitude in degrees"),
@@ -224,14 +137,13 @@ async def get_satellite_position(
     """
     logger.info(f"Getting position for satellite {norad_id} from location ({latitude}, {longitude})")
     
-    # Get satellite info and position
-    satellite_data = await satellite_service.get_satellite_info(norad_id, use_cache=use_cache)
-    position_data = await satellite_service.get_satellite_position(
-        norad_id, latitude, longitude, altitude, use_cache=use_cache
+    bundle = await satellite_service.get_satellite_bundle(
+        norad_id, latitude, longitude, altitude, include="position", use_cache=use_cache
     )
     
     # Combine satellite info with position
-    satellite_data["current_position"] = position_data
+    satellite_data = bundle["satellite"]
+    satellite_data["current_position"] = bundle["position"]
     
     logger.info(f"Retrieved position for satellite {norad_id}")
     return SatelliteInfo(**satellite_data)
@@ -249,7 +161,6 @@ async def get_satellite_position(
     summary="Get satellite pass predictions",
     description="Get upcoming pass predictions for a satellite over a specific location."
 )
-@handle_satellite_exceptions
 async def get_satellite_passes(
     norad_id: int = Path(..., description="NORAD catalog number", ge=1, le=999999),
     latitude: float = Query(..., ge=-90, le=90, description="Observer latitude in degrees"),
@@ -275,11 +186,11 @@ async def get_satellite_passes(
     """
     logger.info(f"Getting passes for satellite {norad_id} from location ({latitude}, {longitude}) for {days} days")
     
-    # Get satellite info and passes
-    satellite_data = await satellite_service.get_satellite_info(norad_id, use_cache=use_cache)
-    passes_data = await satellite_service.get_satellite_passes(
-        norad_id, latitude, longitude, altitude, days, min_elevation, use_cache=use_cache
+    bundle = await satellite_service.get_satellite_bundle(
+        norad_id, latitude, longitude, altitude, include="passes",
+        days=days, min_elevation=min_elevation, use_cache=use_cache
     )
+    satellite_data, passes_data = bundle["satellite"], bundle["passes"]
     
     response = SatellitePassesResponse(
         satellite=SatelliteInfo(**satellite_data),
@@ -347,16 +258,7 @@ async def invalidate_satellite_cache(
         return {"message": f"Cache invalidated for satellite {norad_id}"}
     else:
         logger.error(f"Failed to invalidate cache for satellite {norad_id}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error": {
-                    "code": "CACHE_ERROR",
-                    "message": f"Failed to invalidate cache for satellite {norad_id}",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            }
-        )
+        raise http_error(500, "CACHE_ERROR", f"Failed to invalidate cache for satellite {norad_id}")
 
 
 @router.post(
@@ -3,108 +3,121 @@ API endpoints for enhanced satellite position tracking and pass predictions.
 Provides real-time position tracking, pass predictions, and background task management.
 """
 
+import inspect
+import itertools
 import logging
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from functools import wraps
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, BackgroundTasks
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, Query, Path, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from app.database import get_db
 from app.services.position_tracking_service import PositionTrackingService, get_position_tracking_service
-from app.services.pass_prediction_service import PassPredictionService, get_pass_prediction_service
+from app.services.pass_prediction_service import (
+    DEFAULT_ALERT_MINUTES,
+    PassPredictionService,
+    get_pass_prediction_service
+)
 from app.services.background_tasks import BackgroundTaskService, get_background_task_service
 from app.utils.dependencies import get_current_user
 from app.utils.exceptions import (
+    SatelliteTrackerException,
     ValidationError,
     NotFoundError,
     ExternalAPIError,
     RateLimitExceededError
 )
-from app.schemas.satellite import ErrorResponse
+from app.utils.responses import PayloadResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tracking", tags=["tracking"])
 
 
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, computed once per response."""
+    return datetime.utcnow().isoformat()
+
+
+# Service exception -> (HTTP status code, log method)
+_EXC_MAP: Dict[type, Tuple[int, Callable[..., None]]] = {
+    ValidationError: (422, logger.warning),
+    NotFoundError: (404, logger.warning),
+    RateLimitExceededError: (429, logger.warning),
+    ExternalAPIError: (502, logger.error),
+}
+
+
+def _error_body(code: str, message: str, details: Optional[Dict[str, Any]], ts: str) -> Dict[str, Any]:
+    """Build the standard ErrorResponse body."""
+    return {"error": {"code": code, "message": message, "details": details, "timestamp": ts}}
+
+
+def _build_error_detail(e: SatelliteTrackerException, ts: str) -> Dict[str, Any]:
+    """Build the standard error body for a service exception."""
+    return _error_body(e.error_code, e.message, e.details, ts)
+
+
+def _error_response(e: Exception) -> ORJSONResponse:
+    """Log an exception raised by a tracking endpoint and build its error response."""
+    for exc_type in type(e).__mro__:
+        entry = _EXC_MAP.get(exc_type)
+        if entry is not None:
+            status_code, log = entry
+            log("%s: %s", type(e).__name__, e)
+            return ORJSONResponse(status_code=status_code, content=_build_error_detail(e, _now_iso()))
+    
+    logger.error("Unexpected error: %s", e)
+    return ORJSONResponse(
+        status_code=500,
+        content=_error_body("INTERNAL_ERROR", "An unexpected error occurred", {"error": str(e)}, _now_iso())
+    )
+
+
 def handle_tracking_exceptions(func):
-    """Decorator to handle common tracking service exceptions."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except ValidationError as e:
-            logger.warning(f"Validation error: {e}")
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except NotFoundError as e:
-            logger.warning(f"Not found error: {e}")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except RateLimitExceededError as e:
-            logger.warning(f"Rate limit exceeded: {e}")
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except ExternalAPIError as e:
-            logger.error(f"External API error: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail={
-                    "error": {
-                        "code": e.error_code,
-                        "message": e.message,
-                        "details": e.details,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": {
-                        "code": "INTERNAL_ERROR",
-                        "message": "An unexpected error occurred",
-                        "details": {"error": str(e)},
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                }
-            )
+    """
+    Decorator to handle common tracking service exceptions.
+    
+    Errors are returned directly as orjson-encoded responses in the documented
+    ErrorResponse shape rather than raised through the HTTPException handler.
+    Sync endpoints keep a sync wrapper so FastAPI still runs them in its threadpool.
+    """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                return _error_response(e)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return _error_response(e)
     return wrapper
 
 
+def _get(path: str, **kwargs):
+    """
+    Register a GET route whose handler returns its own PayloadResponse.
+    
+    Handlers return a response instead of a dict, so FastAPI skips its
+    jsonable_encoder pass and the body is encoded once by orjson.
+    """
+    return router.get(path, response_class=PayloadResponse, **kwargs)
+
+
+def _post(path: str, **kwargs):
+    """Register a POST route whose handler returns its own PayloadResponse."""
+    return router.post(path, response_class=PayloadResponse, **kwargs)
+
+
 # Position Tracking Endpoints
 
-@router.get(
+@_get(
     "/satellites/{norad_id}/position/realtime",
     summary="Get real-time satellite position",
     description="Get enhanced real-time position data for a satellite with additional calculations and formatting."
@@ -129,26 +142,26 @@ async def get_realtime_position(
     
     Returns enhanced position data with distance calculations, visibility info, and coordinate formatting.
     """
-    logger.info(f"Getting real-time position for satellite {norad_id} from ({latitude}, {longitude})")
+    logger.info("Getting real-time position for satellite %s from (%s, %s)", norad_id, latitude, longitude)
     
     position_data = await position_service.get_real_time_position(
         norad_id, latitude, longitude, altitude, force_refresh
     )
     
-    return {
+    return PayloadResponse(content={
         "norad_id": norad_id,
         "position": position_data,
-        "retrieved_at": datetime.utcnow().isoformat()
-    }
+        "retrieved_at": _now_iso()
+    })
 
 
-@router.get(
+@_get(
     "/satellites/{norad_id}/position/history",
     summary="Get satellite position history",
     description="Get historical position data for a satellite from cache."
 )
 @handle_tracking_exceptions
-async def get_position_history(
+def get_position_history(
     norad_id: int = Path(..., description="NORAD catalog number", ge=1, le=999999),
     hours: int = Query(24, ge=1, le=168, description="Number of hours of history"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
@@ -162,20 +175,31 @@ async def get_position_history(
     - **limit**: Maximum number of position records (1-500)
     
     Returns list of historical position data with timestamps.
+    The body is streamed record by record as it is read from the database.
     """
-    logger.info(f"Getting position history for satellite {norad_id} ({hours} hours, limit {limit})")
+    logger.info("Getting position history for satellite %s (%s hours, limit %s)", norad_id, hours, limit)
     
-    history = position_service.get_position_history(norad_id, hours, limit)
+    history = position_service.iter_position_history(norad_id, hours, limit)
+    # Read the first record here so query errors still reach handle_tracking_exceptions
+    # instead of breaking the stream after the status line has been sent
+    first = next(history, None)
+    if first is not None:
+        history = itertools.chain((first,), history)
     
-    return {
-        "norad_id": norad_id,
-        "history": history,
-        "total_records": len(history),
-        "hours_requested": hours
-    }
+    return StreamingResponse(_stream_history(norad_id, hours, history), media_type="application/json")
+
+
+def _stream_history(norad_id: int, hours: int, history: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Write the position history body as one JSON object, encoding a record at a time."""
+    yield b'{"norad_id":%d,"history":[' % norad_id
+    total_records = 0
+    for position in history:
+        yield (b"," if total_records else b"") + orjson.dumps(position)
+        total_records += 1
+    yield b'],"total_records":%d,"hours_requested":%d}' % (total_records, hours)
 
 
-@router.get(
+@_get(
     "/users/favorites/positions",
     summary="Get positions for all favorite satellites",
     description="Get current positions for all user's favorite satellites."
@@ -194,23 +218,23 @@ async def get_favorite_positions(
     Returns list of favorite satellites with current position data.
     Requires user authentication and saved location.
     """
-    logger.info(f"Getting favorite positions for user {current_user['id']}")
+    logger.info("Getting favorite positions for user %s", current_user['id'])
     
     favorites_with_positions = await position_service.get_favorite_positions(
         current_user["id"], force_refresh
     )
     
-    return {
+    return PayloadResponse(content={
         "user_id": current_user["id"],
         "favorites": favorites_with_positions,
         "total_favorites": len(favorites_with_positions),
-        "retrieved_at": datetime.utcnow().isoformat()
-    }
+        "retrieved_at": _now_iso()
+    })
 
 
 # Pass Prediction Endpoints
 
-@router.get(
+@_get(
     "/satellites/{norad_id}/passes",
     summary="Get enhanced satellite pass predictions",
     description="Get enhanced pass predictions with filtering, sorting, and additional calculations."
@@ -241,13 +265,13 @@ async def get_satellite_passes(
     
     Returns enhanced pass predictions with visibility quality, priority scores, and timing information.
     """
-    logger.info(f"Getting enhanced passes for satellite {norad_id} from ({latitude}, {longitude})")
+    logger.info("Getting enhanced passes for satellite %s from (%s, %s)", norad_id, latitude, longitude)
     
     passes = await pass_service.get_satellite_passes(
         norad_id, latitude, longitude, altitude, days, min_elevation, visibility_filter, use_cache
     )
     
-    return {
+    return PayloadResponse(content={
         "norad_id": norad_id,
         "location": {
             "latitude": latitude,
@@ -261,10 +285,10 @@ async def get_satellite_passes(
             "min_elevation": min_elevation,
             "visibility_filter": visibility_filter
         }
-    }
+    })
 
 
-@router.get(
+@_get(
     "/users/passes",
     summary="Get passes for all favorite satellites",
     description="Get pass predictions for all user's favorite satellites with enhanced filtering."
@@ -289,13 +313,13 @@ async def get_user_passes(
     Returns combined pass predictions for all favorite satellites, sorted by time and priority.
     Requires user authentication and saved location.
     """
-    logger.info(f"Getting passes for all favorites for user {current_user['id']}")
+    logger.info("Getting passes for all favorites for user %s", current_user['id'])
     
     all_passes = await pass_service.get_all_favorite_passes(
         current_user["id"], days, min_elevation, visibility_filter, max_passes_per_satellite
     )
     
-    return {
+    return PayloadResponse(content={
         "user_id": current_user["id"],
         "passes": all_passes,
         "total_passes": len(all_passes),
@@ -305,16 +329,16 @@ async def get_user_passes(
             "visibility_filter": visibility_filter,
             "max_passes_per_satellite": max_passes_per_satellite
         }
-    }
+    })
 
 
-@router.get(
+@_get(
     "/users/passes/upcoming",
     summary="Get upcoming passes (fast lookup)",
     description="Get upcoming passes for user's favorites from cache for fast lookup."
 )
 @handle_tracking_exceptions
-async def get_upcoming_passes(
+def get_upcoming_passes(
     hours: int = Query(24, ge=1, le=168, description="Number of hours to look ahead"),
     min_elevation: float = Query(10, ge=0, le=90, description="Minimum elevation for passes"),
     current_user: dict = Depends(get_current_user),
@@ -329,29 +353,29 @@ async def get_upcoming_passes(
     Returns upcoming passes from cache for fast response times.
     Requires user authentication and saved location.
     """
-    logger.info(f"Getting upcoming passes for user {current_user['id']} ({hours} hours)")
+    logger.info("Getting upcoming passes for user %s (%s hours)", current_user['id'], hours)
     
     upcoming_passes = pass_service.get_upcoming_passes(
         current_user["id"], hours, min_elevation
     )
     
-    return {
+    return PayloadResponse(content={
         "user_id": current_user["id"],
         "upcoming_passes": upcoming_passes,
         "total_passes": len(upcoming_passes),
         "hours_ahead": hours,
-        "retrieved_at": datetime.utcnow().isoformat()
-    }
+        "retrieved_at": _now_iso()
+    })
 
 
-@router.get(
+@_get(
     "/users/passes/alerts",
     summary="Get pass alerts",
     description="Get passes that should trigger alerts based on timing."
 )
 @handle_tracking_exceptions
-async def get_pass_alerts(
-    alert_minutes: List[int] = Query([60, 15, 5], description="Minutes before pass to trigger alerts"),
+def get_pass_alerts(
+    alert_minutes: List[int] = Query(DEFAULT_ALERT_MINUTES, description="Minutes before pass to trigger alerts"),
     current_user: dict = Depends(get_current_user),
     pass_service: PassPredictionService = Depends(get_pass_prediction_service)
 ):
@@ -363,22 +387,22 @@ async def get_pass_alerts(
     Returns passes requiring alerts with timing information.
     Requires user authentication and saved location.
     """
-    logger.info(f"Getting pass alerts for user {current_user['id']}")
+    logger.info("Getting pass alerts for user %s", current_user['id'])
     
     alerts = pass_service.get_pass_alerts(current_user["id"], alert_minutes)
     
-    return {
+    return PayloadResponse(content={
         "user_id": current_user["id"],
         "alerts": alerts,
         "total_alerts": len(alerts),
         "alert_minutes": alert_minutes,
-        "generated_at": datetime.utcnow().isoformat()
-    }
+        "generated_at": _now_iso()
+    })
 
 
 # Background Task Management Endpoints
 
-@router.post(
+@_post(
     "/background/refresh-positions",
     summary="Manually refresh all positions",
     description="Manually trigger a refresh of all favorite satellite positions."
@@ -395,20 +419,20 @@ async def manual_refresh_positions(
     This endpoint triggers a background refresh of position data for all satellites
     that are in users' favorites lists.
     """
-    logger.info(f"Manual position refresh requested by user {current_user['id']}")
+    logger.info("Manual position refresh requested by user %s", current_user['id'])
     
     # Add background task
     background_tasks.add_task(task_service.manual_refresh_all_positions)
     
-    return {
+    return PayloadResponse(content={
         "message": "Position refresh started",
         "status": "background_task_queued",
         "requested_by": current_user["id"],
-        "requested_at": datetime.utcnow().isoformat()
-    }
+        "requested_at": _now_iso()
+    })
 
 
-@router.post(
+@_post(
     "/background/cleanup-cache",
     summary="Manually cleanup cache",
     description="Manually trigger cleanup of expired cache entries."
@@ -424,20 +448,20 @@ async def manual_cleanup_cache(
     
     This endpoint triggers a background cleanup of expired position and pass cache data.
     """
-    logger.info(f"Manual cache cleanup requested by user {current_user['id']}")
+    logger.info("Manual cache cleanup requested by user %s", current_user['id'])
     
     # Add background task
     background_tasks.add_task(task_service.manual_cleanup_cache)
     
-    return {
+    return PayloadResponse(content={
         "message": "Cache cleanup started",
         "status": "background_task_queued",
         "requested_by": current_user["id"],
-        "requested_at": datetime.utcnow().isoformat()
-    }
+        "requested_at": _now_iso()
+    })
 
 
-@router.get(
+@_get(
     "/background/status",
     summary="Get background task status",
     description="Get status of all background tasks."
@@ -452,19 +476,19 @@ async def get_background_task_status(
     """
     status = task_service.get_task_status()
     
-    return {
+    return PayloadResponse(content={
         "tasks": status,
-        "checked_at": datetime.utcnow().isoformat()
-    }
+        "checked_at": _now_iso()
+    })
 
 
-@router.post(
+@_post(
     "/cache/optimize",
     summary="Optimize pass cache",
     description="Optimize pass cache by pre-computing passes for popular locations."
 )
 @handle_tracking_exceptions
-async def optimize_pass_cache(
+def optimize_pass_cache(
     location_radius_km: float = Query(50, ge=1, le=500, description="Radius around user locations"),
     current_user: dict = Depends(get_current_user),
     pass_service: PassPredictionService = Depends(get_pass_prediction_service)
@@ -476,13 +500,13 @@ async def optimize_pass_cache(
     
     This endpoint analyzes user locations and pre-caches pass predictions for popular areas.
     """
-    logger.info(f"Cache optimization requested by user {current_user['id']}")
+    logger.info("Cache optimization requested by user %s", current_user['id'])
     
     optimization_stats = pass_service.optimize_pass_cache(location_radius_km)
     
-    return {
+    return PayloadResponse(content={
         "message": "Cache optimization completed",
         "statistics": optimization_stats,
         "optimized_by": current_user["id"],
-        "optimized_at": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+        "optimized_at": _now_iso()
+    })
\ No newline at end of file
@@ -1,13 +1,28 @@
 import os
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List, Optional
 
 class Settings(BaseSettings):
     # Database settings
     database_url: str = os.getenv("DATABASE_URL")
+    # Keep db_pool_size + db_max_overflow, times the number of worker
+    # processes, below PostgreSQL's max_connections (100 by default)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Recycle connections after 30 minutes
+    db_query_cache_size: int = 1200  # Compiled SQL statements kept per engine
+    db_pool_warm_connections: int = 5  # Connections opened at startup, before the first request
+    # Set when DATABASE_URL points at a transaction-pooling PgBouncer: the
+    # engine then opens a connection per checkout and leaves pooling to it
+    db_use_null_pool: bool = os.getenv("DB_USE_NULL_POOL", "false").lower() == "true"
     
     # Redis settings
     redis_url: str = os.getenv("REDIS_URL")
+    redis_max_connections: int = 50
+    redis_pool_timeout: int = 2  # seconds to wait for a free connection when the pool is exhausted
+    redis_health_check_interval: int = 30  # seconds idle before a connection is re-checked
     
     # JWT settings
     secret_key: str = os.getenv("SECRET_KEY")
@@ -17,10 +32,15 @@ class Settings(BaseSettings):
     # N2YO API settings
     n2yo_api_key: str = os.getenv("N2YO_API_KEY")
     n2yo_base_url: str = "https://api.n2yo.com/rest/v1"
+    n2yo_max_concurrent_requests: int = 8
     
     # Cache settings
     satellite_position_cache_ttl: int = 300  # 5 minutes
     satellite_passes_cache_ttl: int = 86400  # 24 hours
+    satellite_search_cache_ttl: int = 600  # 10 minutes
+    satellite_info_cache_ttl: int = 3600  # 1 hour
+    upcoming_passes_cache_ttl: int = 60  # 1 minute
+    position_history_cache_ttl: int = 60  # 1 minute
     
     # API settings
     api_v1_prefix: str = "/api/v1"
@@ -46,11 +66,22 @@ class Settings(BaseSettings):
     cors_allow_credentials: bool = True
     cors_max_age: int = 86400  # 24 hours
     
+    # Health check settings
+    # Seconds each dependency probe may take before it is reported as degraded
+    db_health_timeout: float = 2.0
+    redis_health_timeout: float = 1.0
+    n2yo_health_timeout: float = 3.0
+    
     # Rate limiting settings
     rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
     
-    class Config:
-        env_file = ".env"
-        extra = "ignore"
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, loaded and validated once."""
+    return Settings()
+
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -3,26 +3,40 @@ Database connection and session management for the Satellite Tracker application
 """
 
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 from typing import Generator
 import logging
 
 from app.config import settings
+from app.metrics import db_pool_checkout_timeout_total, instrument_engine
 
 logger = logging.getLogger(__name__)
 
-# Create SQLAlchemy engine with connection pooling
+# Create SQLAlchemy engine with connection pooling, unless an external
+# pooler such as PgBouncer already does it
+if settings.db_use_null_pool:
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {
+        "poolclass": QueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
 engine = create_engine(
     settings.database_url,
-    poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,  # Recycle connections after 1 hour
+    **pool_options,
+    # Bigger compiled-statement cache so repeated ORM queries skip SQL compilation
+    query_cache_size=settings.db_query_cache_size,
     echo=False  # Set to True for SQL query logging in development
 )
+instrument_engine(engine)
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -42,6 +56,11 @@ def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
+    except PoolTimeoutError as e:
+        db_pool_checkout_timeout_total.inc()
+        logger.error(f"Timed out waiting for a database connection: {e}")
+        db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Database session error: {e}")
         db.rollback()
@@ -67,6 +86,28 @@ def init_db() -> None:
         raise
 
 
+def warm_db_pool() -> int:
+    """
+    Open pool connections ahead of the first requests.
+    All connections are held at once so the pool keeps that many idle ones
+    instead of reusing a single connection.
+    Returns the number of connections opened.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    
+    connections = []
+    try:
+        for _ in range(min(settings.db_pool_warm_connections, settings.db_pool_size)):
+            connections.append(engine.connect())
+    except Exception as e:
+        logger.warning(f"Database pool warm-up stopped after {len(connections)} connections: {e}")
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
 def check_db_connection() -> bool:
     """
     Check if database connection is working.
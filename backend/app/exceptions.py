@@ -8,6 +8,8 @@ from typing import Any, Dict, Optional
 class SatelliteTrackerException(Exception):
     """Base exception for all application-specific errors."""
     
+    __slots__ = ("message", "code", "details", "status_code")
+    
     def __init__(
         self,
         message: str,
@@ -25,6 +27,8 @@ class SatelliteTrackerException(Exception):
 class ValidationError(SatelliteTrackerException):
     """Raised when input validation fails."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, field: str = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if field:
@@ -41,6 +45,8 @@ class ValidationError(SatelliteTrackerException):
 class AuthenticationError(SatelliteTrackerException):
     """Raised when authentication fails."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Authentication failed", details: Optional[Dict[str, Any]] = None):
         super().__init__(
             message=message,
@@ -53,6 +59,8 @@ class AuthenticationError(SatelliteTrackerException):
 class AuthorizationError(SatelliteTrackerException):
     """Raised when authorization fails."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Access denied", details: Optional[Dict[str, Any]] = None):
         super().__init__(
             message=message,
@@ -65,6 +73,8 @@ class AuthorizationError(SatelliteTrackerException):
 class NotFoundError(SatelliteTrackerException):
     """Raised when a requested resource is not found."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, resource_type: str = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if resource_type:
@@ -81,6 +91,8 @@ class NotFoundError(SatelliteTrackerException):
 class ConflictError(SatelliteTrackerException):
     """Raised when a resource conflict occurs."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, resource_type: str = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if resource_type:
@@ -97,6 +109,8 @@ class ConflictError(SatelliteTrackerException):
 class ExternalAPIError(SatelliteTrackerException):
     """Raised when external API calls fail."""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         message: str,
@@ -121,6 +135,8 @@ class ExternalAPIError(SatelliteTrackerException):
 class DatabaseError(SatelliteTrackerException):
     """Raised when database operations fail."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, operation: str = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if operation:
@@ -137,6 +153,8 @@ class DatabaseError(SatelliteTrackerException):
 class CacheError(SatelliteTrackerException):
     """Raised when cache operations fail."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, operation: str = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if operation:
@@ -153,6 +171,8 @@ class CacheError(SatelliteTrackerException):
 class RateLimitError(SatelliteTrackerException):
     """Raised when rate limits are exceeded."""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         message: str = "Rate limit exceeded",
@@ -1,5 +1,8 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.auth import router as auth_router
 from app.api.location import router as location_router
@@ -8,17 +11,20 @@ from app.api.favorites import router as favorites_router
 from app.api.tracking import router as tracking_router
 from app.api.health import router as health_router
 from app.config import settings
+from app.database import warm_db_pool
 from app.middleware.auth_middleware import AuthenticationMiddleware, RateLimitMiddleware
 from app.middleware.error_handler import (
     ErrorHandlingMiddleware,
-    RequestLoggingMiddleware,
     create_exception_handlers
 )
-from app.services.background_tasks import background_task_service
-from app.utils.logging_config import setup_logging, get_logger
-from app.utils.api_docs import custom_openapi_schema
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.services.n2yo_service import n2yo_service
+from app.utils.logging_config import setup_logging, stop_logging, get_logger
 from app.utils.versioning import VersioningMiddleware
-from app.redis_client import redis_client
+from app.redis_client import async_redis_client
+
+# The event loop is picked by the server, which creates it before importing this
+# module; run with `uvicorn app.main:app --loop uvloop --http httptools` (see Dockerfile)
 
 # Set up logging
 setup_logging()
@@ -54,6 +60,7 @@ app = FastAPI(
     All errors follow a consistent format with correlation IDs for tracking.
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Satellite Tracker API Support",
         "email": "support@satellitetracker.com",
@@ -75,22 +82,32 @@ for exception_type, handler in exception_handlers.items():
     app.add_exception_handler(exception_type, handler)
 
 # Add middleware (order matters - add in reverse order of execution)
-# Error handling middleware should be first to catch all exceptions
-app.add_middleware(ErrorHandlingMiddleware, debug=settings.debug)
-
-# Request logging middleware
-app.add_middleware(RequestLoggingMiddleware, log_requests=True, log_responses=True)
+# Error handling middleware should be first to catch all exceptions; it also
+# assigns correlation IDs and logs requests and responses
+app.add_middleware(
+    ErrorHandlingMiddleware,
+    debug=settings.debug,
+    log_requests=True,
+    log_responses=True
+)
 
 # Authentication middleware
 app.add_middleware(AuthenticationMiddleware)
 
-# Rate limiting middleware with Redis support
-app.add_middleware(RateLimitMiddleware, redis_client=redis_client)
-
 # API versioning middleware
 app.add_middleware(VersioningMiddleware)
 
-# CORS middleware should be last
+# Rate limiting middleware with Redis support, directly inside metrics and CORS
+# so rejected requests never reach versioning, auth, logging or error handling
+# (and 429s are still measured and carry CORS headers)
+app.add_middleware(RateLimitMiddleware, redis_client=async_redis_client)
+
+# Request latency metrics, just inside CORS so requests rejected by the rate
+# limiter or authentication (429s and 401s) are measured too
+app.add_middleware(MetricsMiddleware)
+
+# CORS middleware should be last so it is the outermost layer: preflights and
+# disallowed origins are answered before logging, auth or rate limiting run
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -136,8 +153,13 @@ async def root():
     }
 
 
-# Set custom OpenAPI schema
-app.openapi = lambda: custom_openapi_schema(app)
+# Set custom OpenAPI schema (the docs helpers are only imported once the schema is requested)
+def _openapi_schema():
+    from app.utils.api_docs import custom_openapi_schema
+    return custom_openapi_schema(app)
+
+
+app.openapi = _openapi_schema
 
 
 @app.get("/api/version", tags=["API Info"])
@@ -177,11 +199,18 @@ async def get_api_info():
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on application startup."""
+    from app.services.background_tasks import background_task_service
+    
     logger.info("Starting Satellite Tracker API v1.0.0...")
+    warmed = await asyncio.to_thread(warm_db_pool)
+    logger.info(f"Database pool warmed with {warmed} connections")
+    await background_task_service.prepare_position_partitions()
     logger.info("Starting background tasks...")
-    await background_task_service.start_position_refresh_task()
-    await background_task_service.start_cache_cleanup_task()
-    await background_task_service.start_stale_data_refresh_task()
+    await asyncio.gather(
+        background_task_service.start_position_refresh_task(),
+        background_task_service.start_cache_cleanup_task(),
+        background_task_service.start_stale_data_refresh_task()
+    )
     logger.info("Background tasks started")
     logger.info("API startup complete")
 
@@ -189,8 +218,13 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop background tasks on application shutdown."""
+    from app.services.background_tasks import background_task_service
+    
     logger.info("Shutting down Satellite Tracker API...")
     logger.info("Stopping background tasks...")
     await background_task_service.stop_all_tasks()
     logger.info("Background tasks stopped")
-    logger.info("API shutdown complete")
\ No newline at end of file
+    await n2yo_service.aclose()
+    await async_redis_client.aclose(close_connection_pool=True)
+    logger.info("API shutdown complete")
+    stop_logging()
\ No newline at end of file
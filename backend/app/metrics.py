@@ -0,0 +1,67 @@
+"""
+Prometheus metrics for the Satellite Tracker application.
+"""
+
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds) tuned so P95/P99 of typical API calls are resolvable
+REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds",
+    ["method", "route", "status_code"],
+    buckets=REQUEST_LATENCY_BUCKETS
+)
+
+# Pool state gauges are read from the pool when /metrics is scraped
+db_pool_size = Gauge("db_pool_size", "Configured size of the database connection pool")
+db_pool_checked_out = Gauge("db_pool_checked_out", "Database connections currently checked out")
+db_pool_overflow = Gauge("db_pool_overflow", "Current overflow of the database connection pool")
+
+db_pool_connect_total = Counter("db_pool_connect_total", "New database connections opened by the pool")
+db_pool_checkout_total = Counter("db_pool_checkout_total", "Database connection checkouts")
+db_pool_checkin_total = Counter("db_pool_checkin_total", "Database connection checkins")
+db_pool_invalidate_total = Counter("db_pool_invalidate_total", "Database connections invalidated")
+db_pool_checkout_timeout_total = Counter(
+    "db_pool_checkout_timeout_total",
+    "Requests that timed out waiting for a database connection"
+)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Register pool gauges and event counters for a SQLAlchemy engine.
+
+    Args:
+        engine: Engine whose connection pool should be observed
+    """
+    pool = engine.pool
+    # Only QueuePool tracks its size; NullPool leaves these gauges at zero
+    if isinstance(pool, QueuePool):
+        db_pool_size.set_function(pool.size)
+        db_pool_checked_out.set_function(pool.checkedout)
+        db_pool_overflow.set_function(pool.overflow)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        db_pool_connect_total.inc()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkout_total.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        db_pool_checkin_total.inc()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        db_pool_invalidate_total.inc()
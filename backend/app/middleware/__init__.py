@@ -5,16 +5,16 @@ Middleware package for the Satellite Tracker application.
 from .auth_middleware import AuthenticationMiddleware, RateLimitMiddleware
 from .error_handler import (
     ErrorHandlingMiddleware,
-    RequestLoggingMiddleware,
     ErrorResponse,
     create_exception_handlers
 )
+from .metrics_middleware import MetricsMiddleware
 
 __all__ = [
     "AuthenticationMiddleware",
     "RateLimitMiddleware", 
     "ErrorHandlingMiddleware",
-    "RequestLoggingMiddleware",
     "ErrorResponse",
-    "create_exception_handlers"
+    "create_exception_handlers",
+    "MetricsMiddleware"
 ]
\ No newline at end of file
@@ -2,20 +2,139 @@
 Authentication middleware for FastAPI application.
 """
 
-from typing import Callable
-from fastapi import Request, Response, HTTPException, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-import time
+from collections import OrderedDict, deque
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from secrets import token_hex
+from time import monotonic, time as wall_time
+from typing import List, Tuple
+import heapq
 import logging
+import re
 
-from app.utils.auth import is_token_expired
-from app.services.token_blacklist_service import TokenBlacklistService
+import orjson
+
+from app.config import settings
+from app.utils.auth import decode_token_claims, is_claims_expired
+from app.utils.dependencies import get_token_blacklist_service
 
 logger = logging.getLogger(__name__)
 
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
+# Clients tracked by the in-memory rate limiter before the least recently seen is dropped
+MEMORY_RATE_LIMIT_MAX_CLIENTS = 50_000
+
+# Health probes, metrics scrapes and API docs; load balancers and monitoring
+# hit these constantly, so neither middleware does any work for them
+INFRASTRUCTURE_PATHS = frozenset([
+    "/",
+    "/health",
+    f"{settings.api_v1_prefix}/health",
+    f"{settings.api_v1_prefix}/health/liveness",
+    f"{settings.api_v1_prefix}/health/readiness",
+    f"{settings.api_v1_prefix}/metrics",
+    "/api/docs",
+    "/api/redoc",
+    "/api/openapi.json",
+    "/api/version",
+    "/api/info"
+])
+
+# Paths that bypass the authentication middleware
+DEFAULT_EXCLUDED_PATHS = INFRASTRUCTURE_PATHS | {
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/v1/auth/register",
+    "/api/v1/auth/login",
+    "/api/v1/auth/refresh"
+}
+
+# Path prefixes that bypass the authentication middleware (documentation assets)
+DEFAULT_EXCLUDED_PREFIXES = ("/docs/", "/redoc/")
+
+# Authorization scheme prefix, matched against the raw header bytes
+BEARER_PREFIX = b"Bearer "
+BEARER_PREFIX_LENGTH = len(BEARER_PREFIX)
+
+# Raw headers of the pre-encoded error responses
+JSON_HEADERS = [(b"content-type", b"application/json")]
+TOKEN_REJECTION_HEADERS = [*JSON_HEADERS, (b"www-authenticate", b"Bearer")]
+
+# Outcomes of a rate limit check
+RATE_LIMIT_ALLOWED = 0
+RATE_LIMIT_BLOCKED = 1
+RATE_LIMIT_EXCEEDED = 2
+
+# Sliding-window rate limit evaluated atomically in Redis.
+# KEYS: rate key, block key.
+# ARGV: now, window seconds, max requests, block seconds, unique request member.
+# Returns one of the RATE_LIMIT_* outcomes above.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local blocked_until = tonumber(redis.call('GET', KEYS[2]))
+if blocked_until and blocked_until > now then
+    return 1
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local block = tonumber(ARGV[4])
+    redis.call('SET', KEYS[2], tostring(now + block), 'EX', block)
+    return 2
+end
+redis.call('ZADD', KEYS[1], now, ARGV[5])
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return 0
+"""
+
+
+def _error_body_template(code: str, message: str, details: dict) -> Tuple[bytes, bytes]:
+    """
+    Pre-encode a constant error body, leaving a gap for the timestamp.
+    
+    Args:
+        code: Error code
+        message: Human-readable error message
+        details: Extra details; the timestamp is appended as the last key
+        
+    Returns:
+        Encoded body before and after the timestamp value
+    """
+    body = orjson.dumps({
+        "error": {
+            "code": code,
+            "message": message,
+            "details": {**details, "timestamp": None}
+        }
+    })
+    prefix, _, suffix = body.rpartition(b"null")
+    return prefix, suffix
+
+
+async def _send_timestamped_error(send: Send, template: Tuple[bytes, bytes], status_code: int,
+                                  headers: list) -> None:
+    """
+    Send an error response built from a pre-encoded body template.
+    
+    Args:
+        send: ASGI send channel
+        template: Body prefix and suffix from _error_body_template
+        status_code: HTTP status code
+        headers: Raw response headers other than content-length
+    """
+    prefix, suffix = template
+    body = prefix + orjson.dumps(wall_time()) + suffix
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [*headers, (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AuthenticationMiddleware:
     """
     Middleware for handling authentication-related concerns.
     
@@ -23,140 +142,180 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
     - Logs authentication attempts
     - Handles token expiration gracefully
     - Provides consistent error responses
+    
+    It is a plain ASGI middleware rather than a BaseHTTPMiddleware, so requests
+    pass through without an extra task and response stream per middleware.
     """
     
-    def __init__(self, app, excluded_paths: list = None):
-        super().__init__(app)
-        self.excluded_paths = excluded_paths or [
-            "/",
-            "/health",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/v1/auth/register",
-            "/api/v1/auth/login",
-            "/api/v1/auth/refresh"
-        ]
-        self.blacklist_service = TokenBlacklistService()
+    def __init__(self, app: ASGIApp, excluded_paths: list = None, excluded_prefixes: tuple = None):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths) if excluded_paths else DEFAULT_EXCLUDED_PATHS
+        self._excluded_prefixes = tuple(excluded_prefixes) if excluded_prefixes else DEFAULT_EXCLUDED_PREFIXES
+        self.blacklist_service = get_token_blacklist_service()
+        
+        # Bodies of the frequent token rejections, encoded once
+        self._expired_body = _error_body_template(
+            "TOKEN_EXPIRED",
+            "Your session has expired. Please login again to continue.",
+            {"action": "redirect_to_login"}
+        )
+        self._revoked_body = _error_body_template(
+            "TOKEN_REVOKED",
+            "Your session has been revoked. Please login again.",
+            {"action": "redirect_to_login"}
+        )
+        self._internal_error_body = _error_body_template(
+            "INTERNAL_SERVER_ERROR",
+            "An unexpected error occurred. Please try again.",
+            {}
+        )
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process the request and handle authentication concerns.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware or endpoint
-            
-        Returns:
-            Response: The response from the next middleware or endpoint
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        start_time = time.time()
+        # Skip authentication middleware for non-HTTP traffic and excluded paths
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Skip authentication middleware for excluded paths
-        if request.url.path in self.excluded_paths:
-            response = await call_next(request)
-            return response
+        path = scope["path"]
+        if path in self.excluded_paths or path.startswith(self._excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
         
-        # Extract authorization header
-        auth_header = request.headers.get("authorization")
+        # Extract authorization header from the raw (lower-cased) ASGI headers
+        auth_header = None
+        for header_name, header_value in scope["headers"]:
+            if header_name == b"authorization":
+                auth_header = header_value
+                break
         
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
+        if auth_header and auth_header.startswith(BEARER_PREFIX):
+            token = auth_header[BEARER_PREFIX_LENGTH:].decode("latin-1")
             
             # Check if token is expired and provide clear message
-            if is_token_expired(token):
-                logger.warning(f"Expired token used for {request.url.path}")
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={
-                        "error": {
-                            "code": "TOKEN_EXPIRED",
-                            "message": "Your session has expired. Please login again to continue.",
-                            "details": {
-                                "action": "redirect_to_login",
-                                "timestamp": time.time()
-                            }
-                        }
-                    },
-                    headers={"WWW-Authenticate": "Bearer"}
+            claims = decode_token_claims(token)
+            if claims is None or is_claims_expired(claims):
+                logger.warning(f"Expired token used for {path}")
+                await _send_timestamped_error(
+                    send, self._expired_body, status.HTTP_401_UNAUTHORIZED, TOKEN_REJECTION_HEADERS
                 )
+                return
             
             # Check if token is blacklisted
-            if self.blacklist_service.is_token_blacklisted(token):
-                logger.warning(f"Blacklisted token used for {request.url.path}")
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={
-                        "error": {
-                            "code": "TOKEN_REVOKED",
-                            "message": "Your session has been revoked. Please login again.",
-                            "details": {
-                                "action": "redirect_to_login",
-                                "timestamp": time.time()
-                            }
-                        }
-                    },
-                    headers={"WWW-Authenticate": "Bearer"}
+            if await self.blacklist_service.is_token_blacklisted_async(token, claims.get("exp")):
+                logger.warning(f"Blacklisted token used for {path}")
+                await _send_timestamped_error(
+                    send, self._revoked_body, status.HTTP_401_UNAUTHORIZED, TOKEN_REJECTION_HEADERS
                 )
+                return
+            
+            # Hand the verified claims to get_current_user through request.state
+            state = scope.setdefault("state", {})
+            state["jwt_token"] = token
+            state["jwt_claims"] = claims
+        
+        response_status = None
+        # Per-request auth timing is debug-only; ErrorHandlingMiddleware
+        # already logs every request
+        log_timing = bool(auth_header) and logger.isEnabledFor(logging.DEBUG)
+        start_time = monotonic() if log_timing else 0.0
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
         
         try:
-            response = await call_next(request)
-            
-            # Log successful authenticated requests
-            if auth_header and response.status_code < 400:
-                process_time = time.time() - start_time
-                logger.info(f"Authenticated request to {request.url.path} completed in {process_time:.3f}s")
-            
-            return response
+            await self.app(scope, receive, send_wrapper)
             
         except HTTPException as e:
             # Handle authentication-related HTTP exceptions
-            if e.status_code == status.HTTP_401_UNAUTHORIZED:
-                logger.warning(f"Authentication failed for {request.url.path}: {e.detail}")
-                return JSONResponse(
-                    status_code=e.status_code,
-                    content={
-                        "error": {
-                            "code": "AUTHENTICATION_FAILED",
-                            "message": e.detail,
-                            "details": {
-                                "action": "redirect_to_login",
-                                "timestamp": time.time()
-                            }
-                        }
-                    },
-                    headers=e.headers or {}
-                )
-            raise e
+            if e.status_code != status.HTTP_401_UNAUTHORIZED or response_status is not None:
+                raise
+            logger.warning(f"Authentication failed for {path}: {e.detail}")
+            response = self._error_response(
+                e.status_code,
+                "AUTHENTICATION_FAILED",
+                e.detail,
+                {"action": "redirect_to_login"},
+                e.headers or {}
+            )
+            await response(scope, receive, send)
+            return
         
         except Exception as e:
-            logger.error(f"Unexpected error in auth middleware for {request.url.path}: {str(e)}")
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "error": {
-                        "code": "INTERNAL_SERVER_ERROR",
-                        "message": "An unexpected error occurred. Please try again.",
-                        "details": {
-                            "timestamp": time.time()
-                        }
-                    }
-                }
+            if response_status is not None:
+                raise
+            logger.error(f"Unexpected error in auth middleware for {path}: {str(e)}")
+            await _send_timestamped_error(
+                send, self._internal_error_body, status.HTTP_500_INTERNAL_SERVER_ERROR, JSON_HEADERS
             )
+            return
+        
+        # Log successful authenticated requests
+        if log_timing and response_status is not None and response_status < 400:
+            process_time = monotonic() - start_time
+            logger.debug(f"Authenticated request to {path} completed in {process_time:.3f}s")
+    
+    @staticmethod
+    def _error_response(status_code: int, code: str, message: str,
+                        details: dict = None, headers: dict = None) -> ORJSONResponse:
+        """
+        Build an error response in the application's error format.
+        
+        Args:
+            status_code: HTTP status code
+            code: Error code
+            message: Human-readable error message
+            details: Extra details, merged with the timestamp
+            headers: Response headers
+            
+        Returns:
+            ORJSONResponse with the error
+        """
+        return ORJSONResponse(
+            status_code=status_code,
+            content={
+                "error": {
+                    "code": code,
+                    "message": message,
+                    "details": {**(details or {}), "timestamp": wall_time()}
+                }
+            },
+            headers=headers
+        )
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Enhanced rate limiting middleware with multiple strategies.
     
     This middleware implements rate limiting to prevent abuse and brute force attacks
-    with different limits for different endpoint types.
+    with different limits for different endpoint types. Like AuthenticationMiddleware
+    it is a plain ASGI middleware.
     """
     
-    def __init__(self, app, redis_client=None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, redis_client=None, bypass_paths: list = None):
+        self.app = app
+        self._bypass_paths = frozenset(bypass_paths) if bypass_paths else INFRASTRUCTURE_PATHS
         self.redis_client = redis_client
-        self.request_counts = {}  # Fallback when Redis is not available
+        self._rate_limit_script = None  # Registered on first use
+        self._now = monotonic  # Clock for the in-memory limiter
+        # In-memory fallback when Redis is not available, bounded in both the
+        # number of clients tracked and the timestamps kept per client
+        self._request_windows: "OrderedDict[str, deque]" = OrderedDict()
+        self._blocked_until: "OrderedDict[str, float]" = OrderedDict()
+        # (expiry, key, window seconds) min-heap so idle entries are dropped
+        # by popping from the head instead of scanning every key
+        self._expiry_heap: List[Tuple[float, str, float]] = []
         
         # Rate limiting configurations for different endpoint types
         self.rate_limits = {
@@ -179,59 +338,83 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 "block_duration": 180   # 3 minutes
             }
         }
+        
+        # Path lookup tables built once: exact paths, then "/"-terminated
+        # prefixes, each mapped to its config with "type" attached
+        self._exact_limits = {}
+        self._prefix_limits = {}
+        for limit_type, config in self.rate_limits.items():
+            typed_config = {**config, "type": limit_type}
+            for limit_path in config["paths"]:
+                self._exact_limits.setdefault(limit_path, typed_config)
+                if limit_path.endswith("/"):
+                    self._prefix_limits.setdefault(limit_path, typed_config)
+        # Alternatives are tried left to right, so listing prefixes longest
+        # first makes a single match return the most specific one
+        self._prefix_pattern = re.compile("|".join(
+            re.escape(prefix) for prefix in sorted(self._prefix_limits, key=len, reverse=True)
+        )) if self._prefix_limits else None
+        
+        # 429 bodies differ only by retry_after, so encode one per block duration
+        self._rate_limit_bodies = {
+            config["block_duration"]: self._rate_limit_body(config["block_duration"])
+            for config in self.rate_limits.values()
+        }
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process the request and apply appropriate rate limiting.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware or endpoint
-            
-        Returns:
-            Response: The response from the next middleware or endpoint
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = time.time()
+        # OPTIONS requests (CORS preflights) and infrastructure paths are not
+        # counted against the limit
+        if (scope["type"] != "http" or scope["method"] == "OPTIONS"
+                or scope["path"] in self._bypass_paths):
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
         # Determine which rate limit to apply
-        rate_limit_config = self._get_rate_limit_config(request.url.path)
+        rate_limit_config = self._get_rate_limit_config(path)
         if not rate_limit_config:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         
-        # Check if client is currently blocked
-        if await self._is_client_blocked(client_ip, rate_limit_config, current_time):
+        decision = await self._try_admit(client_ip, rate_limit_config)
+        
+        if decision == RATE_LIMIT_BLOCKED:
             logger.warning(
-                f"Blocked client {client_ip} attempted access to {request.url.path}",
+                f"Blocked client {client_ip} attempted access to {path}",
                 extra={
                     "client_ip": client_ip,
-                    "path": request.url.path,
+                    "path": path,
                     "rate_limit_type": rate_limit_config["type"]
                 }
             )
-            return self._create_rate_limit_response(rate_limit_config["block_duration"])
-        
-        # Check current rate limit
-        if await self._check_rate_limit(client_ip, request.url.path, rate_limit_config, current_time):
-            # Rate limit exceeded - block the client
-            await self._block_client(client_ip, rate_limit_config, current_time)
-            
+        elif decision == RATE_LIMIT_EXCEEDED:
             logger.warning(
-                f"Rate limit exceeded for {client_ip} on {request.url.path}",
+                f"Rate limit exceeded for {client_ip} on {path}",
                 extra={
                     "client_ip": client_ip,
-                    "path": request.url.path,
+                    "path": path,
                     "rate_limit_type": rate_limit_config["type"],
                     "max_requests": rate_limit_config["max_requests"],
                     "window_seconds": rate_limit_config["window_seconds"]
                 }
             )
-            return self._create_rate_limit_response(rate_limit_config["block_duration"])
         
-        # Record the request
-        await self._record_request(client_ip, request.url.path, rate_limit_config, current_time)
+        if decision != RATE_LIMIT_ALLOWED:
+            await self._send_rate_limit_response(send, rate_limit_config["block_duration"])
+            return
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
     
     def _get_rate_limit_config(self, path: str) -> dict:
         """
@@ -244,153 +427,193 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             Rate limit configuration or None if no limits apply
         """
         # Check specific paths first (most restrictive)
-        for limit_type, config in self.rate_limits.items():
-            for limit_path in config["paths"]:
-                if path == limit_path or (limit_path.endswith("/") and path.startswith(limit_path)):
-                    return {**config, "type": limit_type}
+        config = self._exact_limits.get(path)
+        if config is not None:
+            return config
+        
+        if self._prefix_pattern is not None:
+            match = self._prefix_pattern.match(path)
+            if match:
+                return self._prefix_limits[match.group(0)]
         
         return None
     
-    async def _is_client_blocked(self, client_ip: str, config: dict, current_time: float) -> bool:
+    async def _try_admit(self, client_ip: str, config: dict) -> int:
         """
-        Check if a client is currently blocked.
+        Decide whether a request may proceed, recording it if so.
+        
+        With Redis the whole decision is one EVALSHA round-trip; if Redis fails
+        the in-memory limiter is used instead. Redis state is shared between
+        processes and hosts, so it is keyed on wall-clock time; the in-memory
+        limiter uses the monotonic clock, which NTP steps cannot move.
         
         Args:
             client_ip: Client IP address
             config: Rate limit configuration
-            current_time: Current timestamp
             
         Returns:
-            True if client is blocked, False otherwise
+            RATE_LIMIT_ALLOWED, RATE_LIMIT_BLOCKED or RATE_LIMIT_EXCEEDED
         """
-        block_key = f"blocked:{config['type']}:{client_ip}"
-        
         if self.redis_client:
             try:
-                blocked_until = await self.redis_client.get(block_key)
-                if blocked_until and float(blocked_until) > current_time:
-                    return True
+                if self._rate_limit_script is None:
+                    self._rate_limit_script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
+                return int(await self._rate_limit_script(
+                    keys=[f"rate:{config['type']}:{client_ip}", f"blocked:{config['type']}:{client_ip}"],
+                    args=[
+                        wall_time(),
+                        config["window_seconds"],
+                        config["max_requests"],
+                        config["block_duration"],
+                        # Unique per request, so concurrent requests with equal
+                        # timestamps are each counted
+                        token_hex(8)
+                    ]
+                ))
             except Exception as e:
-                logger.error(f"Redis error checking block status: {e}")
-        else:
-            # Fallback to in-memory storage
-            if block_key in self.request_counts:
-                blocked_until = self.request_counts[block_key]
-                if blocked_until > current_time:
-                    return True
-                else:
-                    del self.request_counts[block_key]
+                logger.error(f"Redis error checking rate limit: {e}")
+                # Fall back to in-memory check
         
-        return False
+        current_time = self._now()
+        self._prune_expired(current_time)
+        if self._is_client_blocked(client_ip, config, current_time):
+            return RATE_LIMIT_BLOCKED
+        if not self._admit_in_memory(client_ip, config, current_time):
+            self._block_client(client_ip, config, current_time)
+            return RATE_LIMIT_EXCEEDED
+        return RATE_LIMIT_ALLOWED
     
-    async def _check_rate_limit(self, client_ip: str, path: str, config: dict, current_time: float) -> bool:
+    def _prune_expired(self, current_time: float) -> None:
         """
-        Check if the rate limit has been exceeded.
+        Drop in-memory windows and block markers that have expired.
+        
+        Only entries at the head of the expiry heap are examined; a window that
+        saw requests since it was scheduled is pushed back with a later expiry.
+        
+        Args:
+            current_time: Current monotonic time
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= current_time:
+            _, key, window_seconds = heapq.heappop(heap)
+            if key in self._blocked_until:
+                if self._blocked_until[key] <= current_time:
+                    del self._blocked_until[key]
+                continue
+            window = self._request_windows.get(key)
+            if window is None:
+                continue  # Already evicted
+            expires_at = window[-1] + window_seconds if window else current_time
+            if expires_at <= current_time:
+                del self._request_windows[key]
+            else:
+                heapq.heappush(heap, (expires_at, key, window_seconds))
+    
+    def _is_client_blocked(self, client_ip: str, config: dict, current_time: float) -> bool:
+        """
+        Check if a client is currently blocked in the in-memory limiter.
         
         Args:
             client_ip: Client IP address
-            path: Request path
             config: Rate limit configuration
-            current_time: Current timestamp
+            current_time: Current monotonic time
             
         Returns:
-            True if rate limit exceeded, False otherwise
+            True if client is blocked, False otherwise
         """
-        rate_key = f"rate:{config['type']}:{client_ip}"
-        
-        if self.redis_client:
-            try:
-                # Use Redis sliding window
-                pipe = self.redis_client.pipeline()
-                pipe.zremrangebyscore(rate_key, 0, current_time - config["window_seconds"])
-                pipe.zcard(rate_key)
-                pipe.zadd(rate_key, {str(current_time): current_time})
-                pipe.expire(rate_key, config["window_seconds"])
-                results = await pipe.execute()
-                
-                request_count = results[1]
-                return request_count >= config["max_requests"]
-                
-            except Exception as e:
-                logger.error(f"Redis error checking rate limit: {e}")
-                # Fall back to in-memory check
-        
-        # Fallback to in-memory storage
-        if rate_key not in self.request_counts:
-            self.request_counts[rate_key] = []
-        
-        # Clean old entries
-        self.request_counts[rate_key] = [
-            timestamp for timestamp in self.request_counts[rate_key]
-            if current_time - timestamp < config["window_seconds"]
-        ]
+        block_key = f"blocked:{config['type']}:{client_ip}"
         
-        # Check if limit exceeded
-        if len(self.request_counts[rate_key]) >= config["max_requests"]:
+        blocked_until = self._blocked_until.get(block_key)
+        if blocked_until is None:
+            return False
+        if blocked_until > current_time:
             return True
-        
+        del self._blocked_until[block_key]
         return False
     
-    async def _record_request(self, client_ip: str, path: str, config: dict, current_time: float):
+    def _admit_in_memory(self, client_ip: str, config: dict, current_time: float) -> bool:
         """
-        Record a request for rate limiting purposes.
+        Check the in-memory rate limit and record the request if it is admitted.
         
         Args:
             client_ip: Client IP address
-            path: Request path
             config: Rate limit configuration
-            current_time: Current timestamp
+            current_time: Current monotonic time
+            
+        Returns:
+            True if the request was admitted and recorded, False if the limit is exceeded
         """
         rate_key = f"rate:{config['type']}:{client_ip}"
         
-        if not self.redis_client:
-            # Add to in-memory storage
-            if rate_key not in self.request_counts:
-                self.request_counts[rate_key] = []
-            self.request_counts[rate_key].append(current_time)
+        window = self._request_windows.get(rate_key)
+        if window is None:
+            # At most max_requests timestamps matter for the decision
+            window = self._request_windows[rate_key] = deque(maxlen=config["max_requests"])
+            heapq.heappush(
+                self._expiry_heap,
+                (current_time + config["window_seconds"], rate_key, config["window_seconds"])
+            )
+            if len(self._request_windows) > MEMORY_RATE_LIMIT_MAX_CLIENTS:
+                self._request_windows.popitem(last=False)
+        else:
+            self._request_windows.move_to_end(rate_key)
+        
+        # Drop timestamps that have left the window
+        cutoff = current_time - config["window_seconds"]
+        while window and window[0] <= cutoff:
+            window.popleft()
+        
+        # Only admitted requests count towards the window
+        if len(window) >= config["max_requests"]:
+            return False
+        window.append(current_time)
+        return True
     
-    async def _block_client(self, client_ip: str, config: dict, current_time: float):
+    def _block_client(self, client_ip: str, config: dict, current_time: float):
         """
-        Block a client for the specified duration.
+        Block a client in the in-memory limiter for the configured duration.
         
         Args:
             client_ip: Client IP address
             config: Rate limit configuration
-            current_time: Current timestamp
+            current_time: Current monotonic time
         """
         block_key = f"blocked:{config['type']}:{client_ip}"
-        blocked_until = current_time + config["block_duration"]
-        
-        if self.redis_client:
-            try:
-                await self.redis_client.setex(block_key, config["block_duration"], str(blocked_until))
-            except Exception as e:
-                logger.error(f"Redis error blocking client: {e}")
-        else:
-            # Fallback to in-memory storage
-            self.request_counts[block_key] = blocked_until
+        self._blocked_until[block_key] = current_time + config["block_duration"]
+        heapq.heappush(self._expiry_heap, (current_time + config["block_duration"], block_key, 0))
+        self._blocked_until.move_to_end(block_key)
+        if len(self._blocked_until) > MEMORY_RATE_LIMIT_MAX_CLIENTS:
+            self._blocked_until.popitem(last=False)
     
-    def _create_rate_limit_response(self, retry_after: int) -> JSONResponse:
+    @staticmethod
+    def _rate_limit_body(retry_after: int) -> Tuple[bytes, bytes]:
         """
-        Create a rate limit exceeded response.
+        Pre-encode the rate limit exceeded body for a retry delay.
         
         Args:
             retry_after: Seconds to wait before retrying
             
         Returns:
-            JSONResponse with rate limit error
+            Body template for _send_timestamped_error
         """
-        return JSONResponse(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            content={
-                "error": {
-                    "code": "RATE_LIMIT_EXCEEDED",
-                    "message": f"Too many requests. Please try again in {retry_after} seconds.",
-                    "details": {
-                        "retry_after": retry_after,
-                        "timestamp": time.time()
-                    }
-                }
-            },
-            headers={"Retry-After": str(retry_after)}
-        )
\ No newline at end of file
+        return _error_body_template(
+            "RATE_LIMIT_EXCEEDED",
+            f"Too many requests. Please try again in {retry_after} seconds.",
+            {"retry_after": retry_after}
+        )
+    
+    async def _send_rate_limit_response(self, send: Send, retry_after: int) -> None:
+        """
+        Send a rate limit exceeded response straight to the ASGI server.
+        
+        Args:
+            send: ASGI send channel
+            retry_after: Seconds to wait before retrying
+        """
+        template = self._rate_limit_bodies.get(retry_after) or self._rate_limit_body(retry_after)
+        await _send_timestamped_error(
+            send,
+            template,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            [*JSON_HEADERS, (b"retry-after", str(retry_after).encode())]
+        )
@@ -3,16 +3,16 @@ Global error handling middleware and exception handlers for FastAPI.
 """
 
 import logging
-import traceback
 import time
-import uuid
+from secrets import token_hex
 from typing import Any, Dict, Optional, Union
 
-from fastapi import Request, Response, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import Request, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, QueryParams
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from pydantic import ValidationError as PydanticValidationError
 
@@ -28,9 +28,43 @@ from app.exceptions import (
     CacheError,
     RateLimitError
 )
+from app.utils.exceptions import (
+    SatelliteTrackerException as ServiceException,
+    http_error,
+    status_code_for
+)
 
 logger = logging.getLogger(__name__)
 
+# Error codes for HTTP exceptions, by status code
+_HTTP_ERROR_CODE_MAP: Dict[int, str] = {
+    400: "BAD_REQUEST",
+    401: "UNAUTHORIZED",
+    403: "FORBIDDEN",
+    404: "NOT_FOUND",
+    405: "METHOD_NOT_ALLOWED",
+    409: "CONFLICT",
+    422: "UNPROCESSABLE_ENTITY",
+    429: "TOO_MANY_REQUESTS",
+    500: "INTERNAL_SERVER_ERROR",
+    502: "BAD_GATEWAY",
+    503: "SERVICE_UNAVAILABLE"
+}
+
+
+def _correlation_id(request: Request) -> str:
+    """
+    Get the request's correlation ID, generating one if the middleware did not.
+    
+    Args:
+        request: The incoming request
+        
+    Returns:
+        Correlation ID as a 32-character hex string
+    """
+    correlation_id = getattr(request.state, 'correlation_id', None)
+    return correlation_id if correlation_id is not None else token_hex(16)
+
 
 class ErrorResponse:
     """Standardized error response format."""
@@ -74,49 +108,111 @@ class ErrorResponse:
         return error_response
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+class ErrorHandlingMiddleware:
     """
-    Middleware for handling uncaught exceptions and providing consistent error responses.
+    Middleware for request correlation, request/response logging and handling
+    uncaught exceptions with consistent error responses.
+    
+    It is a single plain ASGI middleware: the correlation ID and processing time
+    headers are added to the response start message as it passes through,
+    without buffering the response.
     """
     
-    def __init__(self, app, debug: bool = False):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, debug: bool = False,
+                 log_requests: bool = True, log_responses: bool = True):
+        self.app = app
         self.debug = debug
+        self.log_requests = log_requests
+        self.log_responses = log_responses
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Process the request and handle any uncaught exceptions.
+        Process the request, log it and handle any uncaught exceptions.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware or endpoint
-            
-        Returns:
-            Response: The response from the next middleware or endpoint
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        
         # Generate correlation ID for request tracking
-        correlation_id = str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
+        correlation_id = token_hex(16)
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        correlation_header = (b"x-correlation-id", correlation_id.encode())
+        response_started = False
+        
+        # Log incoming request
+        if self.log_requests:
+            client = scope.get("client")
+            request_headers = Headers(scope=scope)
+            logger.info(
+                f"Incoming request {correlation_id}: {method} {path}",
+                extra={
+                    "correlation_id": correlation_id,
+                    "method": method,
+                    "path": path,
+                    "query_params": dict(QueryParams(scope["query_string"])),
+                    "client_ip": client[0] if client else None,
+                    "user_agent": request_headers.get("user-agent")
+                }
+            )
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                process_time = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                
+                # Add correlation ID to responses that do not carry it yet
+                if not any(name == b"x-correlation-id" for name, _ in headers):
+                    headers.append(correlation_header)
+                # Add processing time header
+                headers.append((b"x-process-time", f"{process_time:.3f}".encode()))
+                message["headers"] = headers
+                
+                # Log response
+                if self.log_responses:
+                    status_code = message["status"]
+                    logger.info(
+                        f"Response for request {correlation_id}: {status_code} in {process_time:.3f}s",
+                        extra={
+                            "correlation_id": correlation_id,
+                            "status_code": status_code,
+                            "process_time": process_time,
+                            "response_size": next(
+                                (value.decode() for name, value in headers if name == b"content-length"),
+                                None
+                            )
+                        }
+                    )
+            await send(message)
         
         try:
-            response = await call_next(request)
-            
-            # Add correlation ID to successful responses
-            response.headers["X-Correlation-ID"] = correlation_id
-            
-            return response
+            await self.app(scope, receive, send_wrapper)
             
         except Exception as e:
+            if response_started:
+                raise
+            
             # Log the error with correlation ID
             logger.error(
                 f"Unhandled exception in request {correlation_id}: {str(e)}",
                 extra={
                     "correlation_id": correlation_id,
-                    "path": request.url.path,
-                    "method": request.method,
+                    "path": path,
+                    "method": method,
                     "exception_type": type(e).__name__
                 },
-                exc_info=True
+                # Tracebacks only for unexpected errors, or always in debug mode
+                exc_info=self.debug or not isinstance(e, SatelliteTrackerException)
             )
             
             # Create error response
@@ -140,238 +236,179 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 )
                 status_code = 500
             
-            return JSONResponse(
+            response = ORJSONResponse(
                 status_code=status_code,
                 content=error_response,
                 headers={"X-Correlation-ID": correlation_id}
             )
+            await response(scope, receive, send_wrapper)
 
 
-def create_exception_handlers():
-    """
-    Create FastAPI exception handlers for various error types.
+async def satellite_tracker_exception_handler(request: Request, exc: SatelliteTrackerException):
+    """Handle custom application exceptions."""
+    correlation_id = _correlation_id(request)
     
-    Returns:
-        Dict of exception handlers
-    """
+    logger.warning(
+        f"Application exception in request {correlation_id}: {exc.code} - {exc.message}",
+        extra={
+            "correlation_id": correlation_id,
+            "path": request.url.path,
+            "method": request.method,
+            "error_code": exc.code,
+            "error_details": exc.details
+        }
+    )
     
-    async def satellite_tracker_exception_handler(request: Request, exc: SatelliteTrackerException):
-        """Handle custom application exceptions."""
-        correlation_id = getattr(request.state, 'correlation_id', str(uuid.uuid4()))
-        
-        logger.warning(
-            f"Application exception in request {correlation_id}: {exc.code} - {exc.message}",
-            extra={
-                "correlation_id": correlation_id,
-                "path": request.url.path,
-                "method": request.method,
-                "error_code": exc.code,
-                "error_details": exc.details
-            }
-        )
-        
-        error_response = ErrorResponse.create_error_response(
-            code=exc.code,
-            message=exc.message,
-            details=exc.details,
-            correlation_id=correlation_id,
-            status_code=exc.status_code
-        )
-        
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=error_response,
-            headers={"X-Correlation-ID": correlation_id}
-        )
+    error_response = ErrorResponse.create_error_response(
+        code=exc.code,
+        message=exc.message,
+        details=exc.details,
+        correlation_id=correlation_id,
+        status_code=exc.status_code
+    )
     
-    async def http_exception_handler(request: Request, exc: HTTPException):
-        """Handle FastAPI HTTP exceptions."""
-        correlation_id = getattr(request.state, 'correlation_id', str(uuid.uuid4()))
-        
-        logger.warning(
-            f"HTTP exception in request {correlation_id}: {exc.status_code} - {exc.detail}",
-            extra={
-                "correlation_id": correlation_id,
-                "path": request.url.path,
-                "method": request.method,
-                "status_code": exc.status_code
-            }
-        )
-        
-        # Map HTTP status codes to error codes
-        error_code_map = {
-            400: "BAD_REQUEST",
-            401: "UNAUTHORIZED",
-            403: "FORBIDDEN",
-            404: "NOT_FOUND",
-            405: "METHOD_NOT_ALLOWED",
-            409: "CONFLICT",
-            422: "UNPROCESSABLE_ENTITY",
-            429: "TOO_MANY_REQUESTS",
-            500: "INTERNAL_SERVER_ERROR",
-            502: "BAD_GATEWAY",
-            503: "SERVICE_UNAVAILABLE"
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content=error_response,
+        headers={"X-Correlation-ID": correlation_id}
+    )
+
+
+async def http_exception_handler(request: Request, exc: HTTPException):
+    """Handle FastAPI HTTP exceptions."""
+    correlation_id = _correlation_id(request)
+    
+    logger.warning(
+        f"HTTP exception in request {correlation_id}: {exc.status_code} - {exc.detail}",
+        extra={
+            "correlation_id": correlation_id,
+            "path": request.url.path,
+            "method": request.method,
+            "status_code": exc.status_code
         }
-        
-        error_code = error_code_map.get(exc.status_code, "HTTP_ERROR")
-        
+    )
+    
+    error_code = _HTTP_ERROR_CODE_MAP.get(exc.status_code, "HTTP_ERROR")
+    
+    error_response = ErrorResponse.create_error_response(
+        code=error_code,
+        message=exc.detail,
+        correlation_id=correlation_id,
+        status_code=exc.status_code
+    )
+    
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content=error_response,
+        headers={"X-Correlation-ID": correlation_id}
+    )
+
+
+async def service_exception_handler(request: Request, exc: ServiceException):
+    """Handle service-layer exceptions that were not caught by a router."""
+    status_code = status_code_for(exc)
+    if status_code >= 500:
+        logger.error(f"Service error: {exc}")
+    else:
+        logger.warning(f"Service error: {exc}")
+    http_exc = http_error(status_code, exc.error_code, exc.message, exc.details)
+    return await http_exception_handler(request, http_exc)
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Handle Pydantic validation errors."""
+    correlation_id = _correlation_id(request)
+    
+    # Extract validation error details
+    validation_errors = []
+    for error in exc.errors():
+        field_path = " -> ".join(str(loc) for loc in error["loc"])
+        validation_errors.append({
+            "field": field_path,
+            "message": error["msg"],
+            "type": error["type"]
+        })
+    
+    logger.warning(
+        f"Validation error in request {correlation_id}: {len(validation_errors)} validation errors",
+        extra={
+            "correlation_id": correlation_id,
+            "path": request.url.path,
+            "method": request.method,
+            "validation_errors": validation_errors
+        }
+    )
+    
+    error_response = ErrorResponse.create_error_response(
+        code="VALIDATION_ERROR",
+        message="Input validation failed",
+        details={"validation_errors": validation_errors},
+        correlation_id=correlation_id,
+        status_code=422
+    )
+    
+    return ORJSONResponse(
+        status_code=422,
+        content=error_response,
+        headers={"X-Correlation-ID": correlation_id}
+    )
+
+
+async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Handle SQLAlchemy database errors."""
+    correlation_id = _correlation_id(request)
+    
+    logger.error(
+        f"Database error in request {correlation_id}: {str(exc)}",
+        extra={
+            "correlation_id": correlation_id,
+            "path": request.url.path,
+            "method": request.method,
+            "exception_type": type(exc).__name__
+        },
+        # Integrity violations are expected conflicts; no traceback needed
+        exc_info=not isinstance(exc, IntegrityError)
+    )
+    
+    # Handle specific SQLAlchemy errors
+    if isinstance(exc, IntegrityError):
         error_response = ErrorResponse.create_error_response(
-            code=error_code,
-            message=exc.detail,
+            code="INTEGRITY_ERROR",
+            message="Data integrity constraint violation",
+            details={"constraint_type": "database_constraint"},
             correlation_id=correlation_id,
-            status_code=exc.status_code
-        )
-        
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=error_response,
-            headers={"X-Correlation-ID": correlation_id}
+            status_code=409
         )
-    
-    async def validation_exception_handler(request: Request, exc: RequestValidationError):
-        """Handle Pydantic validation errors."""
-        correlation_id = getattr(request.state, 'correlation_id', str(uuid.uuid4()))
-        
-        # Extract validation error details
-        validation_errors = []
-        for error in exc.errors():
-            field_path = " -> ".join(str(loc) for loc in error["loc"])
-            validation_errors.append({
-                "field": field_path,
-                "message": error["msg"],
-                "type": error["type"]
-            })
-        
-        logger.warning(
-            f"Validation error in request {correlation_id}: {len(validation_errors)} validation errors",
-            extra={
-                "correlation_id": correlation_id,
-                "path": request.url.path,
-                "method": request.method,
-                "validation_errors": validation_errors
-            }
-        )
-        
+        status_code = 409
+    else:
         error_response = ErrorResponse.create_error_response(
-            code="VALIDATION_ERROR",
-            message="Input validation failed",
-            details={"validation_errors": validation_errors},
+            code="DATABASE_ERROR",
+            message="Database operation failed",
             correlation_id=correlation_id,
-            status_code=422
-        )
-        
-        return JSONResponse(
-            status_code=422,
-            content=error_response,
-            headers={"X-Correlation-ID": correlation_id}
+            status_code=500
         )
+        status_code = 500
     
-    async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-        """Handle SQLAlchemy database errors."""
-        correlation_id = getattr(request.state, 'correlation_id', str(uuid.uuid4()))
-        
-        logger.error(
-            f"Database error in request {correlation_id}: {str(exc)}",
-            extra={
-                "correlation_id": correlation_id,
-                "path": request.url.path,
-                "method": request.method,
-                "exception_type": type(exc).__name__
-            },
-            exc_info=True
-        )
-        
-        # Handle specific SQLAlchemy errors
-        if isinstance(exc, IntegrityError):
-            error_response = ErrorResponse.create_error_response(
-                code="INTEGRITY_ERROR",
-                message="Data integrity constraint violation",
-                details={"constraint_type": "database_constraint"},
-                correlation_id=correlation_id,
-                status_code=409
-            )
-            status_code = 409
-        else:
-            error_response = ErrorResponse.create_error_response(
-                code="DATABASE_ERROR",
-                message="Database operation failed",
-                correlation_id=correlation_id,
-                status_code=500
-            )
-            status_code = 500
-        
-        return JSONResponse(
-            status_code=status_code,
-            content=error_response,
-            headers={"X-Correlation-ID": correlation_id}
-        )
+    return ORJSONResponse(
+        status_code=status_code,
+        content=error_response,
+        headers={"X-Correlation-ID": correlation_id}
+    )
+
+
+def create_exception_handlers():
+    """
+    Create FastAPI exception handlers for various error types.
     
+    Returns:
+        Dict of exception handlers
+    """
     return {
         SatelliteTrackerException: satellite_tracker_exception_handler,
+        ServiceException: service_exception_handler,
         HTTPException: http_exception_handler,
         StarletteHTTPException: http_exception_handler,
         RequestValidationError: validation_exception_handler,
         SQLAlchemyError: sqlalchemy_exception_handler,
     }
 
-
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for logging API requests and responses.
-    """
-    
-    def __init__(self, app, log_requests: bool = True, log_responses: bool = True):
-        super().__init__(app)
-        self.log_requests = log_requests
-        self.log_responses = log_responses
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Log request and response information.
-        
-        Args:
-            request: The incoming request
-            call_next: The next middleware or endpoint
-            
-        Returns:
-            Response: The response from the next middleware or endpoint
-        """
-        start_time = time.time()
-        correlation_id = getattr(request.state, 'correlation_id', str(uuid.uuid4()))
-        
-        # Log incoming request
-        if self.log_requests:
-            logger.info(
-                f"Incoming request {correlation_id}: {request.method} {request.url.path}",
-                extra={
-                    "correlation_id": correlation_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "query_params": dict(request.query_params),
-                    "client_ip": request.client.host if request.client else None,
-                    "user_agent": request.headers.get("user-agent")
-                }
-            )
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        if self.log_responses:
-            logger.info(
-                f"Response for request {correlation_id}: {response.status_code} in {process_time:.3f}s",
-                extra={
-                    "correlation_id": correlation_id,
-                    "status_code": response.status_code,
-                    "process_time": process_time,
-                    "response_size": response.headers.get("content-length")
-                }
-            )
-        
-        # Add processing time header
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
-        
-        return response
\ No newline at end of file
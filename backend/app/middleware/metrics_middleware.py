@@ -0,0 +1,55 @@
+"""
+Prometheus request metrics middleware for FastAPI.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import http_request_duration_seconds
+
+
+class MetricsMiddleware:
+    """
+    Middleware that records request latency per route template.
+    
+    It is a plain ASGI middleware that reads the status code from the response
+    start message, and records in a finally block so requests that end in an
+    exception are counted as 500s.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Time the request and record it in the latency histogram.
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template rather than raw path to keep cardinality bounded
+            route = scope.get("route")
+            http_request_duration_seconds.labels(
+                method=scope["method"],
+                route=route.path if route else "unmatched",
+                status_code=status_code
+            ).observe(time.perf_counter() - start_time)
@@ -1,8 +1,12 @@
 """
 Cache models for storing satellite positions and pass predictions.
+
+Data timestamps (timestamp, start_time, end_time, expires_at) are stored as
+naive UTC ``timestamp without time zone``; always write and compare them
+using ``datetime.utcnow()`` / ``datetime.utcfromtimestamp()``.
 """
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, DECIMAL
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, Double
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime, timedelta
@@ -16,20 +20,20 @@ class SatellitePositionCache(Base):
     
     __tablename__ = "satellite_positions_cache"
     
-    # Primary key
-    id = Column(Integer, primary_key=True, index=True)
+    # Primary key (the partition key has to be part of it)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Foreign key to satellite
-    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False, index=True)
+    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False)
     
     # Position data
-    latitude = Column(DECIMAL(10, 8), nullable=False)
-    longitude = Column(DECIMAL(11, 8), nullable=False)
-    altitude = Column(DECIMAL(10, 2), nullable=False)  # in kilometers
-    velocity = Column(DECIMAL(10, 2), nullable=False)  # in km/s
+    latitude = Column(Double, nullable=False)
+    longitude = Column(Double, nullable=False)
+    altitude = Column(Double, nullable=False)  # in kilometers
+    velocity = Column(Double, nullable=False)  # in km/s
     
-    # Timestamp of the position data
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    # Timestamp of the position data (partition key)
+    timestamp = Column(DateTime(timezone=False), primary_key=True, nullable=False)
     
     # Cache metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -37,11 +41,12 @@ class SatellitePositionCache(Base):
     # Relationships
     satellite = relationship("Satellite", back_populates="position_cache")
     
-    # Indexes
+    # Indexes and hourly range partitioning on timestamp
     __table_args__ = (
         Index('idx_positions_cache_norad_timestamp', 'norad_id', 'timestamp', postgresql_using='btree'),
-        Index('idx_positions_cache_timestamp', 'timestamp'),
+        Index('brin_positions_timestamp', 'timestamp', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
         Index('idx_positions_cache_created_at', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
     def __repr__(self):
@@ -74,9 +79,11 @@ class SatellitePositionCache(Base):
         """
         # Parse timestamp from N2YO format
         timestamp = datetime.utcnow()  # Default to current time
-        if data.get('timestamp'):
+        if isinstance(data.get('timestamp'), datetime):
+            timestamp = data['timestamp']
+        elif data.get('timestamp'):
             try:
-                timestamp = datetime.fromtimestamp(data['timestamp'])
+                timestamp = datetime.utcfromtimestamp(data['timestamp'])
             except (ValueError, TypeError):
                 pass
         
@@ -99,10 +106,10 @@ class SatellitePositionCache(Base):
         Returns:
             True if expired, False otherwise
         """
-        if not self.created_at:
+        if not self.timestamp:
             return True
         
-        expiry_time = self.created_at + timedelta(minutes=ttl_minutes)
+        expiry_time = self.timestamp + timedelta(minutes=ttl_minutes)
         return datetime.utcnow() > expiry_time
 
 
@@ -112,28 +119,28 @@ class SatellitePassCache(Base):
     __tablename__ = "satellite_passes_cache"
     
     # Primary key
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     # Foreign key to satellite
-    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False, index=True)
+    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False)
     
     # Location for which the pass was calculated
-    latitude = Column(DECIMAL(10, 8), nullable=False)
-    longitude = Column(DECIMAL(11, 8), nullable=False)
+    latitude = Column(Double, nullable=False)
+    longitude = Column(Double, nullable=False)
     
     # Pass timing
-    start_time = Column(DateTime(timezone=True), nullable=False)
-    end_time = Column(DateTime(timezone=True), nullable=False)
+    start_time = Column(DateTime(timezone=False), nullable=False)
+    end_time = Column(DateTime(timezone=False), nullable=False)
     
     # Pass characteristics
-    max_elevation = Column(DECIMAL(5, 2), nullable=False)  # in degrees
-    start_azimuth = Column(DECIMAL(5, 2), nullable=True)   # in degrees
-    end_azimuth = Column(DECIMAL(5, 2), nullable=True)     # in degrees
-    magnitude = Column(DECIMAL(4, 2), nullable=True)       # brightness magnitude
+    max_elevation = Column(Double, nullable=False)  # in degrees
+    start_azimuth = Column(Double, nullable=True)   # in degrees
+    end_azimuth = Column(Double, nullable=True)     # in degrees
+    magnitude = Column(Double, nullable=True)       # brightness magnitude
     
     # Cache metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=False), nullable=False)
     
     # Relationships
     satellite = relationship("Satellite", back_populates="passes_cache")
@@ -142,7 +149,7 @@ class SatellitePassCache(Base):
     __table_args__ = (
         Index('idx_passes_cache_location_time', 'latitude', 'longitude', 'start_time'),
         Index('idx_passes_cache_norad_time', 'norad_id', 'start_time'),
-        Index('idx_passes_cache_expires', 'expires_at'),
+        Index('brin_passes_cache_expires', 'expires_at', postgresql_using='brin', postgresql_with={'pages_per_range': 16}),
         Index('idx_passes_cache_created_at', 'created_at'),
     )
     
@@ -192,13 +199,13 @@ class SatellitePassCache(Base):
         
         if data.get('startUTC'):
             try:
-                start_time = datetime.fromtimestamp(data['startUTC'])
+                start_time = datetime.utcfromtimestamp(data['startUTC'])
             except (ValueError, TypeError):
                 pass
         
         if data.get('endUTC'):
             try:
-                end_time = datetime.fromtimestamp(data['endUTC'])
+                end_time = datetime.utcfromtimestamp(data['endUTC'])
             except (ValueError, TypeError):
                 pass
         
@@ -2,7 +2,7 @@
 User favorite satellites model for managing user's favorite satellite list.
 """
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -14,35 +14,30 @@ class UserFavoriteSatellite(Base):
     
     __tablename__ = "user_favorite_satellites"
     
-    # Primary key
-    id = Column(Integer, primary_key=True, index=True)
-    
-    # Foreign keys
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False, index=True)
+    # Foreign keys, together forming the primary key
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    norad_id = Column(Integer, ForeignKey("satellites.norad_id", ondelete="CASCADE"), nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     user = relationship("User", back_populates="favorite_satellites")
-    satellite = relationship("Satellite", back_populates="favorite_satellites")
+    satellite = relationship("Satellite", back_populates="favorite_satellites", lazy="selectin")
     
     # Constraints and indexes
     __table_args__ = (
-        UniqueConstraint('user_id', 'norad_id', name='uq_user_favorite_satellite'),
-        Index('idx_user_favorites_user_id', 'user_id'),
+        PrimaryKeyConstraint('user_id', 'norad_id', name='pk_user_favs'),
         Index('idx_user_favorites_norad_id', 'norad_id'),
         Index('idx_user_favorites_created_at', 'created_at'),
     )
     
     def __repr__(self):
-        return f"<UserFavoriteSatellite(id={self.id}, user_id={self.user_id}, norad_id={self.norad_id})>"
+        return f"<UserFavoriteSatellite(user_id={self.user_id}, norad_id={self.norad_id})>"
     
     def to_dict(self):
         """Convert favorite satellite instance to dictionary."""
         return {
-            'id': self.id,
             'user_id': self.user_id,
             'norad_id': self.norad_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
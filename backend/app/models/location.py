@@ -16,10 +16,10 @@ class UserLocation(Base):
     __tablename__ = "user_locations"
     
     # Primary key
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     # Foreign key to user
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Geographical coordinates
     latitude = Column(DECIMAL(10, 8), nullable=False)
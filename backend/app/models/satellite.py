@@ -16,13 +16,13 @@ class Satellite(Base):
     __tablename__ = "satellites"
     
     # Primary key (NORAD ID)
-    norad_id = Column(Integer, primary_key=True, index=True)
+    norad_id = Column(Integer, primary_key=True)
     
     # Satellite information
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
     launch_date = Column(Date, nullable=True)
     country = Column(String(100), nullable=True)
-    category = Column(String(100), nullable=True, index=True)
+    category = Column(String(100), nullable=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -35,7 +35,7 @@ class Satellite(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_satellites_name', 'name'),
+        Index('idx_satellites_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
         Index('idx_satellites_category', 'category'),
         Index('idx_satellites_country', 'country'),
         Index('idx_satellites_created_at', 'created_at'),
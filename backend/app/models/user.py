@@ -16,14 +16,14 @@ class User(Base):
     __tablename__ = "users"
     
     # Primary key
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     # User credentials
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     
     # User status
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -35,7 +35,6 @@ class User(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_users_email', 'email'),
         Index('idx_users_active', 'is_active'),
         Index('idx_users_created_at', 'created_at'),
     )
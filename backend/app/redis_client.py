@@ -3,26 +3,44 @@ Redis client configuration and utilities for caching.
 """
 
 import redis
+import redis.asyncio as aioredis
 import json
 import logging
-from typing import Optional, Any, Union
+from typing import Optional, Any, Dict, List, Union
 from datetime import timedelta
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create Redis connection pool
-redis_pool = redis.ConnectionPool.from_url(
+# Create Redis connection pools. Blocking pools make callers wait briefly for a
+# free connection under load instead of failing once max_connections is reached.
+redis_pool = redis.BlockingConnectionPool.from_url(
     settings.redis_url,
-    max_connections=20,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    health_check_interval=settings.redis_health_check_interval,
+    decode_responses=True,
     retry_on_timeout=True,
     socket_keepalive=True,
     socket_keepalive_options={}
 )
 
 # Create Redis client
-redis_client = redis.Redis(connection_pool=redis_pool, decode_responses=True)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+# Async client sharing the same settings, for code running on the event loop
+async_redis_pool = aioredis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    health_check_interval=settings.redis_health_check_interval,
+    decode_responses=True,
+    retry_on_timeout=True,
+    socket_keepalive=True,
+    socket_keepalive_options={}
+)
+async_redis_client = aioredis.Redis(connection_pool=async_redis_pool)
 
 
 class RedisCache:
@@ -45,6 +63,28 @@ class RedisCache:
             logger.error(f"Error getting cache key {key}: {e}")
             return None
     
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values in one round-trip.
+        Returns a list aligned with keys, with None for missing or unreadable entries.
+        """
+        if not keys:
+            return []
+        try:
+            values = self.client.mget(keys)
+        except redis.RedisError as e:
+            logger.error(f"Error getting {len(keys)} cache keys: {e}")
+            return [None] * len(keys)
+        
+        result = []
+        for key, value in zip(keys, values):
+            try:
+                result.append(json.loads(value) if value is not None else None)
+            except ValueError as e:
+                logger.error(f"Error decoding cache key {key}: {e}")
+                result.append(None)
+        return result
+    
     def set(self, key: str, value: Any, ttl: Optional[Union[int, timedelta]] = None) -> bool:
         """
         Set value in cache with optional TTL.
@@ -62,6 +102,98 @@ class RedisCache:
             logger.error(f"Error setting cache key {key}: {e}")
             return False
     
+    def set_many(self, items: Dict[str, Any], ttl: Optional[Union[int, timedelta]] = None) -> bool:
+        """
+        Set several values in one round-trip with an optional shared TTL.
+        Returns True if successful, False otherwise.
+        """
+        if not items:
+            return True
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                serialized_value = json.dumps(value, default=str)
+                if ttl:
+                    pipe.setex(key, ttl, serialized_value)
+                else:
+                    pipe.set(key, serialized_value)
+            pipe.execute()
+            return True
+        except (redis.RedisError, TypeError) as e:
+            logger.error(f"Error setting {len(items)} cache keys: {e}")
+            return False
+    
+    def get_field(self, key: str, field: str) -> Optional[Any]:
+        """
+        Get a field of a hash by key.
+        Returns None if the key or field doesn't exist.
+        """
+        try:
+            value = self.client.hget(key, field)
+            if value is None:
+                return None
+            return json.loads(value)
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Error getting cache field {key}[{field}]: {e}")
+            return None
+    
+    def set_field(self, key: str, field: str, value: Any, ttl: Optional[Union[int, timedelta]] = None) -> bool:
+        """
+        Set a field of a hash, refreshing the TTL of the whole hash.
+        Deleting the key drops every field at once.
+        Returns True if successful, False otherwise.
+        """
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(key, field, json.dumps(value, default=str))
+            if ttl:
+                pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except (redis.RedisError, TypeError) as e:
+            logger.error(f"Error setting cache field {key}[{field}]: {e}")
+            return False
+    
+    def get_counter(self, key: str, seed: int, ttl: Optional[Union[int, timedelta]] = None) -> Optional[int]:
+        """
+        Get an integer counter, creating it at seed (with the TTL) if it doesn't exist.
+        Returns None on error, so callers can tell a failure from a new counter.
+        """
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(key, seed, nx=True, ex=ttl or None)
+            pipe.get(key)
+            _, value = pipe.execute()
+            return int(value)
+        except (redis.RedisError, TypeError, ValueError) as e:
+            logger.error(f"Error getting counter {key}: {e}")
+            return None
+    
+    def incr(self, key: str, seed: Optional[int] = None,
+             ttl: Optional[Union[int, timedelta]] = None) -> Optional[int]:
+        """
+        Atomically increment an integer key. A missing key starts from seed
+        (with the TTL) when one is given, otherwise from 0.
+        Returns the new value, or None on error.
+        """
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            if seed is not None:
+                pipe.set(key, seed, nx=True, ex=ttl or None)
+            pipe.incr(key)
+            return pipe.execute()[-1]
+        except redis.RedisError as e:
+            logger.error(f"Error incrementing cache key {key}: {e}")
+            return None
+    
     def delete(self, key: str) -> bool:
         """
         Delete key from cache.
@@ -22,7 +22,7 @@ class FavoriteCreate(BaseModel):
 
 class FavoriteResponse(BaseModel):
     """Schema for favorite satellite response."""
-    id: int = Field(..., description="Unique favorite ID")
+    id: int = Field(..., description="Favorite identifier; favorites are keyed by satellite, so this equals norad_id")
     norad_id: int = Field(..., description="NORAD catalog number")
     name: str = Field(..., description="Satellite name")
     category: Optional[str] = Field(None, description="Satellite category")
@@ -38,9 +38,17 @@ class FavoriteResponse(BaseModel):
 class FavoritesListResponse(BaseModel):
     """Schema for favorites list response."""
     favorites: List[FavoriteResponse] = Field(..., description="List of favorite satellites")
-    total: int = Field(..., description="Total number of favorites")
+    total: int = Field(..., description="Total number of favorites across all pages")
+    next_cursor: Optional[int] = Field(None, description="Cursor for the next page, or null on the last page")
     
     
+class FavoritesSummaryResponse(BaseModel):
+    """Schema for the combined favorites summary response."""
+    count: Optional[int] = Field(None, description="Total number of favorites")
+    norad_ids: Optional[List[int]] = Field(None, description="NORAD IDs of all favorites")
+    favorites: Optional[List[FavoriteResponse]] = Field(None, description="All favorites, without position data")
+
+
 class FavoriteBatchCreate(BaseModel):
     """Schema for batch creating favorite satellites."""
     norad_ids: List[int] = Field(..., min_items=1, max_items=50, description="List of NORAD IDs to add to favorites")
@@ -90,8 +98,7 @@ class ErrorResponse(BaseModel):
                     "code": "DUPLICATE_FAVORITE",
                     "message": "Satellite is already in favorites",
                     "details": {
-                        "norad_id": 25544,
-                        "existing_favorite_id": 123
+                        "norad_id": 25544
                     },
                     "timestamp": "2024-01-15T10:30:00Z"
                 }
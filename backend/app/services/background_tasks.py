@@ -43,6 +43,16 @@ class BackgroundTaskService:
         finally:
             db.close()
     
+    async def prepare_position_partitions(self) -> None:
+        """
+        Create the position cache partitions for the current and upcoming hours.
+        
+        Runs before any background task writes positions, so fresh rows go to
+        their hourly partition instead of the default one.
+        """
+        async with self.get_db_session() as db:
+            CacheService(db).roll_position_partitions()
+    
     async def start_position_refresh_task(self) -> None:
         """
         Start the automatic position refresh background task.
@@ -154,8 +164,8 @@ class BackgroundTaskService:
         """Stop all running background tasks."""
         tasks_to_stop = list(self.running_tasks.keys())
         
-        for task_name in tasks_to_stop:
-            await self.stop_task(task_name)
+        # Cancel all tasks and wait for them together
+        await asyncio.gather(*(self.stop_task(task_name) for task_name in tasks_to_stop))
         
         logger.info("All background tasks stopped")
     
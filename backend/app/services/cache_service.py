@@ -4,9 +4,9 @@ Cache service for managing satellite position and pass prediction caching.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, text
 
 from app.models.cache import SatellitePositionCache, SatellitePassCache
 from app.models.satellite import Satellite
@@ -15,6 +15,9 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+POSITIONS_PARTITION_PREFIX = "satellite_positions_cache_p"
+POSITIONS_DEFAULT_PARTITION = "satellite_positions_cache_default"
+
 
 class CacheService:
     """Service for managing satellite data caching."""
@@ -42,10 +45,12 @@ class CacheService:
                 logger.debug(f"Position cache hit (Redis) for satellite {norad_id}")
                 return cached_data
             
-            # Then try database cache
+            # Then try database cache; the timestamp bound prunes expired partitions
+            cutoff_time = datetime.utcnow() - timedelta(seconds=settings.satellite_position_cache_ttl)
             position_cache = self.db.query(SatellitePositionCache).filter(
-                SatellitePositionCache.norad_id == norad_id
-            ).order_by(SatellitePositionCache.created_at.desc()).first()
+                SatellitePositionCache.norad_id == norad_id,
+                SatellitePositionCache.timestamp > cutoff_time
+            ).order_by(SatellitePositionCache.timestamp.desc()).first()
             
             if position_cache and not position_cache.is_expired(settings.satellite_position_cache_ttl // 60):
                 position_data = position_cache.to_dict()
@@ -61,6 +66,56 @@ class CacheService:
             logger.error(f"Error getting cached position for satellite {norad_id}: {e}")
             return None
     
+    def get_cached_positions(self, norad_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get cached position data for several satellites at once.
+        
+        Uses one Redis MGET, then a single DISTINCT ON query for the satellites
+        Redis did not have.
+        
+        Args:
+            norad_ids: NORAD IDs of the satellites
+            
+        Returns:
+            Dictionary mapping NORAD ID to position data, for cache hits only
+        """
+        norad_ids = list(dict.fromkeys(norad_ids))
+        if not norad_ids:
+            return {}
+        
+        positions = {}
+        try:
+            cached_values = cache.get_many([f"satellite_position:{norad_id}" for norad_id in norad_ids])
+            for norad_id, cached_data in zip(norad_ids, cached_values):
+                if cached_data:
+                    positions[norad_id] = cached_data
+            
+            missing_ids = [norad_id for norad_id in norad_ids if norad_id not in positions]
+            if missing_ids:
+                cutoff_time = datetime.utcnow() - timedelta(seconds=settings.satellite_position_cache_ttl)
+                rows = self.db.query(SatellitePositionCache).filter(
+                    SatellitePositionCache.norad_id.in_(missing_ids),
+                    SatellitePositionCache.timestamp > cutoff_time
+                ).order_by(
+                    SatellitePositionCache.norad_id,
+                    SatellitePositionCache.timestamp.desc()
+                ).distinct(SatellitePositionCache.norad_id).all()
+                
+                refreshed = {}
+                for position_cache in rows:
+                    position_data = position_cache.to_dict()
+                    refreshed[f"satellite_position:{position_cache.norad_id}"] = position_data
+                    positions[position_cache.norad_id] = position_data
+                # Backfill Redis for all database hits in one round trip
+                cache.set_many(refreshed, ttl=settings.satellite_position_cache_ttl)
+            
+            logger.debug(f"Position cache hits for {len(positions)}/{len(norad_ids)} satellites")
+            return positions
+            
+        except Exception as e:
+            logger.error(f"Error getting cached positions for {len(norad_ids)} satellites: {e}")
+            return positions
+    
     def cache_position(self, norad_id: int, position_data: Dict[str, Any]) -> bool:
         """
         Cache satellite position data.
@@ -97,31 +152,76 @@ class CacheService:
             self.db.rollback()
             return False
     
-    def cleanup_expired_positions(self) -> int:
+    def roll_position_partitions(self, hours_ahead: int = 3) -> int:
         """
-        Clean up expired position cache entries.
+        Create hourly partitions of the position cache for the current and upcoming
+        hours, drop partitions that lie entirely before the retention cutoff, and
+        delete expired rows that landed in the default partition.
         
+        Args:
+            hours_ahead: Number of future hourly partitions to keep ready
+            
         Returns:
-            Number of entries cleaned up
+            Number of partitions dropped
         """
+        now = datetime.utcnow()
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        cutoff_time = now - timedelta(seconds=settings.satellite_position_cache_ttl * 2)
+        
+        for offset in range(hours_ahead + 1):
+            start = current_hour + timedelta(hours=offset)
+            end = start + timedelta(hours=1)
+            try:
+                self.db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {POSITIONS_PARTITION_PREFIX}{start:%Y%m%d%H} "
+                    f"PARTITION OF satellite_positions_cache "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+                self.db.commit()
+            except Exception as e:
+                # Fails when the default partition already holds rows for this hour
+                logger.warning(f"Could not create position cache partition for {start:%Y-%m-%d %H}:00: {e}")
+                self.db.rollback()
+        
+        dropped = 0
         try:
-            cutoff_time = datetime.utcnow() - timedelta(seconds=settings.satellite_position_cache_ttl * 2)
-            
-            deleted_count = self.db.query(SatellitePositionCache).filter(
-                SatellitePositionCache.created_at < cutoff_time
-            ).delete()
+            partitions = self.db.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'satellite_positions_cache'::regclass"
+            )).scalars().all()
+            
+            # Rows land in the default partition whenever their hour had no partition
+            # yet; they block creating that partition until they are deleted
+            default_deleted = self.db.execute(
+                text(f"DELETE FROM {POSITIONS_DEFAULT_PARTITION} WHERE timestamp < :cutoff"),
+                {"cutoff": cutoff_time}
+            ).rowcount
+            
+            for name in partitions:
+                if not name.startswith(POSITIONS_PARTITION_PREFIX):
+                    continue
+                try:
+                    start = datetime.strptime(name[len(POSITIONS_PARTITION_PREFIX):], "%Y%m%d%H")
+                except ValueError:
+                    continue
+                if start + timedelta(hours=1) <= cutoff_time:
+                    self.db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    dropped += 1
             
             self.db.commit()
             
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} expired position cache entries")
-            
-            return deleted_count
+            if dropped > 0:
+                logger.info(f"Dropped {dropped} expired position cache partitions")
+            if default_deleted > 0:
+                logger.info(f"Deleted {default_deleted} expired rows from the default position cache partition")
             
         except Exception as e:
-            logger.error(f"Error cleaning up expired position cache: {e}")
+            logger.error(f"Error dropping expired position cache partitions: {e}")
             self.db.rollback()
             return 0
+        
+        return dropped
     
     # Satellite Pass Caching
     
@@ -247,6 +347,233 @@ class CacheService:
             self.db.rollback()
             return 0
     
+    # Satellite Info Caching
+    
+    def get_cached_info(self, norad_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get cached satellite information.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            
+        Returns:
+            Satellite information dictionary or None if not cached
+        """
+        try:
+            return cache.get(f"satellite_info:{norad_id}")
+        except Exception as e:
+            logger.error(f"Error getting cached info for satellite {norad_id}: {e}")
+            return None
+    
+    def cache_info(self, norad_id: int, info_data: Dict[str, Any]) -> bool:
+        """
+        Cache satellite information.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            info_data: Satellite information dictionary
+            
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        try:
+            return cache.set(f"satellite_info:{norad_id}", info_data, ttl=settings.satellite_info_cache_ttl)
+        except Exception as e:
+            logger.error(f"Error caching info for satellite {norad_id}: {e}")
+            return False
+    
+    def get_cached_bundle(self, norad_id: int, latitude: Optional[float] = None,
+                          longitude: Optional[float] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Any]]:
+        """
+        Get cached satellite information together with its position, or with
+        its passes when an observer location is given, in one Redis round trip.
+        
+        Only Redis is consulted; callers fall back to the regular lookups
+        (which also check the database cache) for entries that are missing.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            latitude: Observer latitude for pass predictions
+            longitude: Observer longitude for pass predictions
+            
+        Returns:
+            Tuple of (info, position or passes), with None for missing entries
+        """
+        if latitude is None or longitude is None:
+            data_key = f"satellite_position:{norad_id}"
+        else:
+            data_key = f"satellite_passes:{norad_id}:{latitude}:{longitude}"
+        
+        try:
+            info_data, cached_data = cache.get_many([f"satellite_info:{norad_id}", data_key])
+            return info_data, cached_data
+        except Exception as e:
+            logger.error(f"Error getting cached bundle for satellite {norad_id}: {e}")
+            return None, None
+    
+    # Satellite Search Caching
+    
+    @staticmethod
+    def _search_cache_key(query: str, category: Optional[str], limit: int) -> str:
+        """Build the Redis key for a search result page."""
+        return f"satellite_search:{query.lower()}:{(category or '').lower()}:{limit}"
+    
+    def get_cached_search(self, query: str, category: Optional[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached satellite search results.
+        
+        Args:
+            query: Search query
+            category: Optional category filter
+            limit: Maximum number of results
+            
+        Returns:
+            List of satellite dictionaries or None if not cached
+        """
+        try:
+            cached_data = cache.get(self._search_cache_key(query, category, limit))
+            if cached_data is not None:
+                logger.debug(f"Search cache hit for '{query}'")
+            return cached_data
+            
+        except Exception as e:
+            logger.error(f"Error getting cached search for '{query}': {e}")
+            return None
+    
+    def cache_search(self, query: str, category: Optional[str], limit: int, results: List[Dict[str, Any]]) -> bool:
+        """
+        Cache satellite search results.
+        
+        Args:
+            query: Search query
+            category: Optional category filter
+            limit: Maximum number of results
+            results: Satellite dictionaries to cache
+            
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        try:
+            return cache.set(
+                self._search_cache_key(query, category, limit),
+                results,
+                ttl=settings.satellite_search_cache_ttl
+            )
+            
+        except Exception as e:
+            logger.error(f"Error caching search for '{query}': {e}")
+            return False
+    
+    # Tracking Query Caching
+    
+    @staticmethod
+    def _upcoming_passes_cache_key(user_id: int) -> str:
+        """Build the Redis hash key holding a user's upcoming pass lookups."""
+        return f"upcoming_passes:{user_id}"
+    
+    def get_cached_upcoming_passes(self, user_id: int, hours: int,
+                                   min_elevation: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached upcoming passes for a user's favorites.
+        
+        Args:
+            user_id: ID of the user
+            hours: Number of hours looked ahead
+            min_elevation: Minimum elevation for passes
+            
+        Returns:
+            List of raw pass dictionaries or None if not cached
+        """
+        try:
+            return cache.get_field(self._upcoming_passes_cache_key(user_id), f"{hours}:{min_elevation}")
+            
+        except Exception as e:
+            logger.error(f"Error getting cached upcoming passes for user {user_id}: {e}")
+            return None
+    
+    def cache_upcoming_passes(self, user_id: int, hours: int, min_elevation: float,
+                              passes: List[Dict[str, Any]]) -> bool:
+        """
+        Cache upcoming passes for a user's favorites.
+        
+        Args:
+            user_id: ID of the user
+            hours: Number of hours looked ahead
+            min_elevation: Minimum elevation for passes
+            passes: Raw pass dictionaries to cache, without time-relative fields
+            
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        try:
+            return cache.set_field(
+                self._upcoming_passes_cache_key(user_id),
+                f"{hours}:{min_elevation}",
+                passes,
+                ttl=settings.upcoming_passes_cache_ttl
+            )
+            
+        except Exception as e:
+            logger.error(f"Error caching upcoming passes for user {user_id}: {e}")
+            return False
+    
+    @staticmethod
+    def invalidate_upcoming_passes(user_id: int) -> bool:
+        """
+        Drop every cached upcoming pass lookup for a user.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            True if anything was cached, False otherwise
+        """
+        return cache.delete(CacheService._upcoming_passes_cache_key(user_id))
+    
+    def get_cached_position_history(self, norad_id: int, hours: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached position history for a satellite.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            hours: Number of hours of history
+            limit: Maximum number of position records
+            
+        Returns:
+            List of raw position dictionaries or None if not cached
+        """
+        try:
+            return cache.get(f"position_history:{norad_id}:{hours}:{limit}")
+            
+        except Exception as e:
+            logger.error(f"Error getting cached position history for satellite {norad_id}: {e}")
+            return None
+    
+    def cache_position_history(self, norad_id: int, hours: int, limit: int,
+                               history: List[Dict[str, Any]]) -> bool:
+        """
+        Cache position history for a satellite.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            hours: Number of hours of history
+            limit: Maximum number of position records
+            history: Raw position dictionaries to cache, without age_seconds
+            
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        try:
+            return cache.set(
+                f"position_history:{norad_id}:{hours}:{limit}",
+                history,
+                ttl=settings.position_history_cache_ttl
+            )
+            
+        except Exception as e:
+            logger.error(f"Error caching position history for satellite {norad_id}: {e}")
+            return False
+    
     # General Cache Management
     
     def invalidate_satellite_cache(self, norad_id: int) -> bool:
@@ -263,6 +590,7 @@ class CacheService:
             # Clear Redis cache
             position_key = f"satellite_position:{norad_id}"
             cache.delete(position_key)
+            cache.delete(f"satellite_info:{norad_id}")
             
             # Clear pass cache patterns (this is approximate since Redis doesn't support pattern deletion easily)
             # In a production environment, you might want to use Redis SCAN with pattern matching
@@ -291,9 +619,11 @@ class CacheService:
         Clean up all expired cache entries.
         
         Returns:
-            Dictionary with cleanup counts
+            Dictionary with cleanup counts; 'positions' counts dropped position
+            cache partitions rather than rows
         """
-        positions_cleaned = self.cleanup_expired_positions()
+        # Expired positions go with their hourly partitions, no row-level DELETE needed
+        positions_cleaned = self.roll_position_partitions()
         passes_cleaned = self.cleanup_expired_passes()
         
         return {
@@ -3,17 +3,24 @@ Favorite satellites service for managing user's favorite satellite list.
 Provides operations for adding, removing, and retrieving favorite satellites with position data.
 """
 
+import asyncio
 import logging
+import secrets
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Set
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from fastapi import Depends
 
+from app.config import settings
 from app.database import get_db
 from app.models.favorite import UserFavoriteSatellite
 from app.models.satellite import Satellite
 from app.models.user import User
+from app.redis_client import cache
+from app.services.cache_service import CacheService
 from app.services.satellite_service import SatelliteService
 from app.utils.exceptions import (
     NotFoundError, 
@@ -24,6 +31,53 @@ from app.utils.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming favorites
+FAVORITES_FETCH_CHUNK_SIZE = 100
+
+# Per-user favorites version used to build ETags for cheap existence checks.
+# Versions live in Redis and are bumped with INCR, so every worker sees a
+# mutation made by any other worker. A missing version starts from a random
+# seed rather than 0, so a version lost to eviction or a flush never repeats
+# one an old ETag was built from. The key expires after a while, bounding how
+# long a bump lost to a Redis outage can leave an old ETag valid.
+FAVORITES_VERSION_KEY = "favorites_version:{user_id}"
+FAVORITES_VERSION_TTL_SECONDS = 3600
+
+
+def _favorites_version_seed() -> int:
+    """Random starting version, leaving headroom below Redis' 64-bit INCR limit."""
+    return secrets.randbits(62)
+
+
+def _bump_favorites_version(user_id: int) -> None:
+    """Invalidate outstanding ETags and cached upcoming passes for a user's favorites."""
+    key = FAVORITES_VERSION_KEY.format(user_id=user_id)
+    if cache.incr(key, seed=_favorites_version_seed(), ttl=FAVORITES_VERSION_TTL_SECONDS) is None:
+        # Best effort: a deleted version is re-seeded on the next read
+        cache.delete(key)
+    CacheService.invalidate_upcoming_passes(user_id)
+
+
+def get_favorites_etag(user_id: int, norad_id: int) -> Optional[str]:
+    """
+    Get the current ETag for a user's favorite status of a satellite.
+    
+    Args:
+        user_id: ID of the user
+        norad_id: NORAD ID of the satellite
+        
+    Returns:
+        Quoted ETag value, or None if the version can't be read from Redis
+    """
+    version = cache.get_counter(
+        FAVORITES_VERSION_KEY.format(user_id=user_id),
+        seed=_favorites_version_seed(),
+        ttl=FAVORITES_VERSION_TTL_SECONDS
+    )
+    if version is None:
+        return None
+    return f'"{user_id}-{version}-{norad_id}"'
+
 
 class FavoriteService:
     """
@@ -35,13 +89,16 @@ class FavoriteService:
         self.db = db
         self.satellite_service = SatelliteService(db)
     
-    async def add_favorite(self, user_id: int, norad_id: int) -> Dict[str, Any]:
+    async def add_favorite(self, user_id: int, norad_id: int,
+                           allow_missing_satellite: bool = False) -> Dict[str, Any]:
         """
         Add a satellite to user's favorites list.
         
         Args:
             user_id: ID of the user
             norad_id: NORAD ID of the satellite to add
+            allow_missing_satellite: Store a placeholder satellite when its details
+                can't be retrieved instead of failing
             
         Returns:
             Dictionary containing favorite information
@@ -50,6 +107,8 @@ class FavoriteService:
             ValidationError: If NORAD ID is invalid
             NotFoundError: If user or satellite not found
             ConflictError: If satellite is already in favorites
+            ExternalAPIError: If satellite details are unavailable and
+                allow_missing_satellite is False
         """
         # Validate NORAD ID
         if not (1 <= norad_id <= 999999):
@@ -61,16 +120,11 @@ class FavoriteService:
             raise NotFoundError(f"User {user_id} not found", resource_type="user", resource_id=str(user_id))
         
         # Check if satellite is already in favorites
-        existing_favorite = self.db.query(UserFavoriteSatellite).filter(
-            UserFavoriteSatellite.user_id == user_id,
-            UserFavoriteSatellite.norad_id == norad_id
-        ).first()
-        
-        if existing_favorite:
+        if self.is_satellite_favorite(user_id, norad_id):
             raise ConflictError(
                 f"Satellite {norad_id} is already in favorites",
                 resource_type="favorite",
-                details={"norad_id": norad_id, "existing_favorite_id": existing_favorite.id}
+                details={"norad_id": norad_id}
             )
         
         # Get or create satellite information
@@ -79,6 +133,8 @@ class FavoriteService:
         except (ExternalAPIError, NotFoundError):
             # If we can't get satellite info from API, create a basic entry
             satellite = self.db.query(Satellite).filter(Satellite.norad_id == norad_id).first()
+            if not satellite and not allow_missing_satellite:
+                raise
             if not satellite:
                 satellite = Satellite(
                     norad_id=norad_id,
@@ -103,17 +159,16 @@ class FavoriteService:
         
         try:
             self.db.commit()
+            _bump_favorites_version(user_id)
             self.db.refresh(favorite)
             
             # Load the satellite relationship
-            favorite = self.db.query(UserFavoriteSatellite).options(
-                joinedload(UserFavoriteSatellite.satellite)
-            ).filter(UserFavoriteSatellite.id == favorite.id).first()
+            favorite = self._get_favorite_row(user_id, norad_id)
             
             logger.info(f"Added satellite {norad_id} to favorites for user {user_id}")
             
             return {
-                "id": favorite.id,
+                "id": favorite.norad_id,
                 "norad_id": favorite.norad_id,
                 "name": favorite.satellite.name if favorite.satellite else f"Satellite {norad_id}",
                 "category": favorite.satellite.category if favorite.satellite else "Unknown",
@@ -129,38 +184,44 @@ class FavoriteService:
                 details={"norad_id": norad_id}
             )
     
-    def remove_favorite(self, user_id: int, favorite_id: int) -> Dict[str, Any]:
+    def _get_favorite_row(self, user_id: int, norad_id: int) -> Optional[UserFavoriteSatellite]:
+        """
+        Load a favorite and its satellite by primary key using a cached lambda statement.
+        """
+        return self.db.execute(lambda_stmt(lambda: select(UserFavoriteSatellite).options(
+            joinedload(UserFavoriteSatellite.satellite)
+        ).where(
+            UserFavoriteSatellite.user_id == user_id,
+            UserFavoriteSatellite.norad_id == norad_id
+        ))).scalars().first()
+    
+    def remove_favorite(self, user_id: int, norad_id: int) -> Dict[str, Any]:
         """
         Remove a satellite from user's favorites list.
         
         Args:
             user_id: ID of the user
-            favorite_id: ID of the favorite to remove
+            norad_id: NORAD ID of the satellite to remove
             
         Returns:
             Dictionary containing removal confirmation
             
         Raises:
-            NotFoundError: If favorite not found or doesn't belong to user
+            NotFoundError: If satellite is not in the user's favorites
         """
         # Find the favorite
-        favorite = self.db.query(UserFavoriteSatellite).options(
-            joinedload(UserFavoriteSatellite.satellite)
-        ).filter(
-            UserFavoriteSatellite.id == favorite_id,
-            UserFavoriteSatellite.user_id == user_id
-        ).first()
+        favorite = self._get_favorite_row(user_id, norad_id)
         
         if not favorite:
             raise NotFoundError(
-                f"Favorite {favorite_id} not found for user {user_id}",
+                f"Satellite {norad_id} not found in favorites for user {user_id}",
                 resource_type="favorite",
-                resource_id=str(favorite_id)
+                resource_id=str(norad_id)
             )
         
         # Store favorite info before deletion
         favorite_info = {
-            "id": favorite.id,
+            "id": favorite.norad_id,
             "norad_id": favorite.norad_id,
             "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
             "added_at": favorite.created_at
@@ -169,110 +230,155 @@ class FavoriteService:
         # Delete the favorite
         self.db.delete(favorite)
         self.db.commit()
+        _bump_favorites_version(user_id)
         
-        logger.info(f"Removed favorite {favorite_id} (satellite {favorite.norad_id}) for user {user_id}")
+        logger.info(f"Removed satellite {norad_id} from favorites for user {user_id}")
         
         return {
-            "message": f"Satellite {favorite.norad_id} removed from favorites",
+            "message": f"Satellite {norad_id} removed from favorites",
             "deleted_favorite": favorite_info
         }
     
-    def remove_favorite_by_norad_id(self, user_id: int, norad_id: int) -> Dict[str, Any]:
+    def _get_active_user(self, user_id: int) -> User:
+        """
+        Load an active user or raise.
+        
+        Raises:
+            NotFoundError: If user not found
+        """
+        user = self.db.query(User).filter(User.id == user_id, User.is_active == True).first()
+        if not user:
+            raise NotFoundError(f"User {user_id} not found", resource_type="user", resource_id=str(user_id))
+        return user
+    
+    def _favorites_page_statement(self, user_id: int, limit: Optional[int], cursor: Optional[int]):
         """
-        Remove a satellite from user's favorites list by NORAD ID.
+        Build the keyset-paginated favorites query, ordered by NORAD ID.
+        
+        Walks the (user_id, norad_id) primary key as a range scan. Built as a
+        lambda statement so its construction and compiled SQL are cached.
         
         Args:
             user_id: ID of the user
-            norad_id: NORAD ID of the satellite to remove
-            
-        Returns:
-            Dictionary containing removal confirmation
-            
-        Raises:
-            NotFoundError: If favorite not found
+            limit: Maximum number of favorites to return (None for all)
+            cursor: Only return favorites with a NORAD ID above this value
         """
-        # Find the favorite
-        favorite = self.db.query(UserFavoriteSatellite).options(
+        stmt = lambda_stmt(lambda: select(UserFavoriteSatellite).options(
             joinedload(UserFavoriteSatellite.satellite)
-        ).filter(
-            UserFavoriteSatellite.user_id == user_id,
-            UserFavoriteSatellite.norad_id == norad_id
-        ).first()
-        
-        if not favorite:
-            raise NotFoundError(
-                f"Satellite {norad_id} not found in favorites for user {user_id}",
-                resource_type="favorite",
-                resource_id=str(norad_id)
-            )
+        ).where(
+            UserFavoriteSatellite.user_id == user_id
+        ))
+        if cursor is not None:
+            stmt += lambda s: s.where(UserFavoriteSatellite.norad_id > cursor)
+        stmt += lambda s: s.order_by(UserFavoriteSatellite.norad_id)
+        if limit is not None:
+            stmt += lambda s: s.limit(limit)
+        return stmt
+    
+    async def _serialize_favorites(self, favorites: List[UserFavoriteSatellite], location,
+                                   use_cache: bool) -> List[Dict[str, Any]]:
+        """
+        Convert favorites to response dictionaries, resolving positions in one batch when a location is given.
+        """
+        positions = {}
+        if location is not None and favorites:
+            try:
+                positions = await self.satellite_service.get_multiple_satellite_positions(
+                    [favorite.norad_id for favorite in favorites],
+                    float(location.latitude),
+                    float(location.longitude),
+                    0,  # altitude
+                    use_cache
+                )
+            except Exception as e:
+                logger.warning(f"Failed to get positions for favorite satellites: {e}")
+                # Continue without position data
         
-        return self.remove_favorite(user_id, favorite.id)
+        return [
+            {
+                "id": favorite.norad_id,
+                "norad_id": favorite.norad_id,
+                "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
+                "category": favorite.satellite.category if favorite.satellite else "Unknown",
+                "added_at": favorite.created_at,
+                "current_position": positions.get(favorite.norad_id)
+            }
+            for favorite in favorites
+        ]
     
     async def get_user_favorites(self, user_id: int, include_positions: bool = True, 
-                               use_cache: bool = True) -> List[Dict[str, Any]]:
+                               use_cache: bool = True, limit: Optional[int] = None,
+                               cursor: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get all favorite satellites for a user with optional position data.
+        Get favorite satellites for a user with optional position data.
         
         Args:
             user_id: ID of the user
             include_positions: Whether to include current position data
             use_cache: Whether to use cached position data
+            limit: Maximum number of favorites to return (None for all)
+            cursor: NORAD ID to continue after, from a previous page
             
         Returns:
-            List of favorite satellite dictionaries with position data
+            List of favorite satellite dictionaries with position data, ordered by NORAD ID
             
         Raises:
             NotFoundError: If user not found
         """
-        # Check if user exists
-        user = self.db.query(User).filter(User.id == user_id, User.is_active == True).first()
-        if not user:
-            raise NotFoundError(f"User {user_id} not found", resource_type="user", resource_id=str(user_id))
+        user = self._get_active_user(user_id)
+        # Use the user's most recent location
+        location = user.locations[-1] if include_positions and user.locations else None
         
-        # Get user's favorites with satellite information
-        favorites = self.db.query(UserFavoriteSatellite).options(
-            joinedload(UserFavoriteSatellite.satellite)
-        ).filter(
-            UserFavoriteSatellite.user_id == user_id
-        ).order_by(UserFavoriteSatellite.created_at.desc()).all()
-        
-        result = []
+        favorites = self.db.execute(
+            self._favorites_page_statement(user_id, limit, cursor)
+        ).scalars().all()
         
-        for favorite in favorites:
-            favorite_data = {
-                "id": favorite.id,
-                "norad_id": favorite.norad_id,
-                "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
-                "category": favorite.satellite.category if favorite.satellite else "Unknown",
-                "added_at": favorite.created_at,
-                "current_position": None
-            }
-            
-            # Add position data if requested
-            if include_positions and user.locations:
-                # Use the user's most recent location
-                location = user.locations[-1]  # Assuming locations are ordered by creation
-                try:
-                    position_data = await self.satellite_service.get_satellite_position(
-                        favorite.norad_id,
-                        float(location.latitude),
-                        float(location.longitude),
-                        0,  # altitude
-                        use_cache
-                    )
-                    favorite_data["current_position"] = position_data
-                except Exception as e:
-                    logger.warning(f"Failed to get position for satellite {favorite.norad_id}: {e}")
-                    # Continue without position data
-            
-            result.append(favorite_data)
+        result = await self._serialize_favorites(favorites, location, use_cache)
         
         logger.info(f"Retrieved {len(result)} favorites for user {user_id}")
         return result
     
-    async def add_multiple_favorites(self, user_id: int, norad_ids: List[int]) -> Dict[str, Any]:
+    def iter_user_favorites(self, user_id: int, include_positions: bool = True,
+                            use_cache: bool = True, limit: Optional[int] = None,
+                            cursor: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
         """
-        Add multiple satellites to user's favorites list.
+        Stream favorite satellites for a user, fetching rows from the database in chunks.
+        
+        Takes the same arguments as get_user_favorites, but returns an async iterator
+        that yields each favorite as soon as it is ready instead of building the whole
+        list first. The user is validated before this method returns.
+        
+        Raises:
+            NotFoundError: If user not found
+        """
+        user = self._get_active_user(user_id)
+        location = user.locations[-1] if include_positions and user.locations else None
+        
+        result = self.db.execute(
+            self._favorites_page_statement(user_id, limit, cursor),
+            execution_options={"yield_per": FAVORITES_FETCH_CHUNK_SIZE}
+        ).scalars()
+        
+        return self._stream_favorites(result, location, use_cache)
+    
+    async def _stream_favorites(self, result, location, use_cache: bool) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            # Positions are resolved per fetched chunk, so each chunk costs one batch lookup
+            for chunk in result.partitions():
+                for favorite_data in await self._serialize_favorites(chunk, location, use_cache):
+                    yield favorite_data
+        finally:
+            result.close()
+    
+    async def add_multiple_favorites_bulk(self, user_id: int, norad_ids: List[int]) -> Dict[str, Any]:
+        """
+        Add multiple satellites to user's favorites list in a single statement.
+        
+        Uses one ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` for the favorites
+        instead of a round-trip per NORAD ID. Satellite metadata is read with one
+        ``SELECT``; satellites not stored yet are fetched from the API
+        concurrently (bounded by ``n2yo_max_concurrent_requests``), and any the
+        API can't resolve get a placeholder row.
         
         Args:
             user_id: ID of the user
@@ -280,31 +386,113 @@ class FavoriteService:
             
         Returns:
             Dictionary containing batch operation results
+            
+        Raises:
+            NotFoundError: If user not found
         """
-        added = []
-        skipped = []
+        # Check if user exists
+        user = self.db.query(User).filter(User.id == user_id, User.is_active == True).first()
+        if not user:
+            raise NotFoundError(f"User {user_id} not found", resource_type="user", resource_id=str(user_id))
         
-        for norad_id in norad_ids:
-            try:
-                favorite_data = await self.add_favorite(user_id, norad_id)
-                added.append(favorite_data)
-            except ConflictError:
-                skipped.append({
-                    "norad_id": norad_id,
-                    "reason": "Already in favorites"
-                })
-            except ValidationError as e:
+        skipped = []
+        valid_ids = []
+        for norad_id in dict.fromkeys(norad_ids):
+            if 1 <= norad_id <= 999999:
+                valid_ids.append(norad_id)
+            else:
                 skipped.append({
                     "norad_id": norad_id,
-                    "reason": f"Invalid NORAD ID: {e.message}"
+                    "reason": f"Invalid NORAD ID: {norad_id}"
                 })
-            except Exception as e:
-                logger.error(f"Unexpected error adding favorite {norad_id}: {e}")
-                skipped.append({
-                    "norad_id": norad_id,
-                    "reason": "Internal error"
+        
+        if not valid_ids:
+            return {"added": [], "skipped": skipped, "total_added": 0, "total_skipped": len(skipped)}
+        
+        # Resolve satellite metadata for the whole batch in one query
+        satellites = {
+            satellite.norad_id: satellite
+            for satellite in self.db.query(Satellite).filter(Satellite.norad_id.in_(valid_ids)).all()
+        }
+        
+        # Satellites we have never seen need a row before the favorite FK can reference them;
+        # try the API first and fall back to a placeholder row for anything it can't resolve
+        unknown_ids = [norad_id for norad_id in valid_ids if norad_id not in satellites]
+        if unknown_ids:
+            semaphore = asyncio.Semaphore(settings.n2yo_max_concurrent_requests)
+            
+            async def fetch_info(norad_id: int) -> Optional[int]:
+                async with semaphore:
+                    try:
+                        await self.satellite_service.get_satellite_info(norad_id)
+                        return norad_id
+                    except (ExternalAPIError, NotFoundError):
+                        return None
+            
+            fetched_ids = [
+                norad_id for norad_id in await asyncio.gather(*map(fetch_info, unknown_ids))
+                if norad_id is not None
+            ]
+            if fetched_ids:
+                satellites.update({
+                    satellite.norad_id: satellite
+                    for satellite in self.db.query(Satellite).filter(Satellite.norad_id.in_(fetched_ids)).all()
                 })
         
+        missing_ids = [
+            norad_id for norad_id in valid_ids
+            if norad_id not in satellites
+        ]
+        if missing_ids:
+            self.db.execute(
+                pg_insert(Satellite).values([
+                    {"norad_id": norad_id, "name": f"Satellite {norad_id}", "category": "Unknown"}
+                    for norad_id in missing_ids
+                ]).on_conflict_do_nothing(index_elements=["norad_id"])
+            )
+            satellites.update({
+                satellite.norad_id: satellite
+                for satellite in self.db.query(Satellite).filter(Satellite.norad_id.in_(missing_ids)).all()
+            })
+        
+        try:
+            inserted = self.db.execute(
+                pg_insert(UserFavoriteSatellite).values([
+                    {"user_id": user_id, "norad_id": norad_id}
+                    for norad_id in valid_ids
+                ]).on_conflict_do_nothing(
+                    index_elements=["user_id", "norad_id"]
+                ).returning(
+                    UserFavoriteSatellite.norad_id,
+                    UserFavoriteSatellite.created_at
+                )
+            ).all()
+            self.db.commit()
+            _bump_favorites_version(user_id)
+        except IntegrityError as e:
+            self.db.rollback()
+            logger.error(f"Database error adding favorites {valid_ids} for user {user_id}: {e}")
+            raise
+        
+        added = []
+        added_ids = set()
+        for row in inserted:
+            satellite = satellites.get(row.norad_id)
+            added_ids.add(row.norad_id)
+            added.append({
+                "id": row.norad_id,
+                "norad_id": row.norad_id,
+                "name": satellite.name if satellite else f"Satellite {row.norad_id}",
+                "category": satellite.category if satellite else "Unknown",
+                "added_at": row.created_at
+            })
+        
+        skipped.extend(
+            {"norad_id": norad_id, "reason": "Already in favorites"}
+            for norad_id in valid_ids
+            if norad_id not in added_ids
+        )
+        
         logger.info(f"Batch add favorites for user {user_id}: {len(added)} added, {len(skipped)} skipped")
         
         return {
@@ -314,13 +502,13 @@ class FavoriteService:
             "total_skipped": len(skipped)
         }
     
-    def get_favorite_by_id(self, user_id: int, favorite_id: int) -> Dict[str, Any]:
+    def get_favorite(self, user_id: int, norad_id: int) -> Dict[str, Any]:
         """
-        Get a specific favorite by ID.
+        Get a specific favorite by NORAD ID.
         
         Args:
             user_id: ID of the user
-            favorite_id: ID of the favorite
+            norad_id: NORAD ID of the favorite satellite
             
         Returns:
             Dictionary containing favorite information
@@ -328,22 +516,17 @@ class FavoriteService:
         Raises:
             NotFoundError: If favorite not found
         """
-        favorite = self.db.query(UserFavoriteSatellite).options(
-            joinedload(UserFavoriteSatellite.satellite)
-        ).filter(
-            UserFavoriteSatellite.id == favorite_id,
-            UserFavoriteSatellite.user_id == user_id
-        ).first()
+        favorite = self._get_favorite_row(user_id, norad_id)
         
         if not favorite:
             raise NotFoundError(
-                f"Favorite {favorite_id} not found for user {user_id}",
+                f"Satellite {norad_id} not found in favorites for user {user_id}",
                 resource_type="favorite",
-                resource_id=str(favorite_id)
+                resource_id=str(norad_id)
             )
         
         return {
-            "id": favorite.id,
+            "id": favorite.norad_id,
             "norad_id": favorite.norad_id,
             "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
             "category": favorite.satellite.category if favorite.satellite else "Unknown",
@@ -354,6 +537,8 @@ class FavoriteService:
         """
         Check if a satellite is in user's favorites.
         
+        Resolved by an index-only lookup on the (user_id, norad_id) primary key.
+        
         Args:
             user_id: ID of the user
             norad_id: NORAD ID of the satellite
@@ -361,12 +546,54 @@ class FavoriteService:
         Returns:
             True if satellite is in favorites, False otherwise
         """
-        favorite = self.db.query(UserFavoriteSatellite).filter(
+        return self.db.execute(lambda_stmt(lambda: select(UserFavoriteSatellite.norad_id).where(
             UserFavoriteSatellite.user_id == user_id,
             UserFavoriteSatellite.norad_id == norad_id
-        ).first()
+        ).limit(1))).scalar() is not None
+    
+    def get_favorites_summary(self, user_id: int, include: Set[str]) -> Dict[str, Any]:
+        """
+        Get the favorites count, NORAD IDs and/or list from a single query.
         
-        return favorite is not None
+        Without "list" only norad_id is selected, which the (user_id, norad_id)
+        primary key answers with an index-only scan.
+        
+        Args:
+            user_id: ID of the user
+            include: Parts to return, any of "list", "count" and "norad_ids"
+            
+        Returns:
+            Dictionary with the requested parts
+        """
+        if "list" in include:
+            favorites = self.db.execute(
+                self._favorites_page_statement(user_id, limit=None, cursor=None)
+            ).scalars().all()
+            norad_ids = [favorite.norad_id for favorite in favorites]
+        else:
+            favorites = None
+            norad_ids = list(self.db.execute(lambda_stmt(lambda: select(UserFavoriteSatellite.norad_id).where(
+                UserFavoriteSatellite.user_id == user_id
+            ).order_by(UserFavoriteSatellite.norad_id))).scalars())
+        
+        summary = {}
+        if "count" in include:
+            summary["count"] = len(norad_ids)
+        if "norad_ids" in include:
+            summary["norad_ids"] = norad_ids
+        if favorites is not None:
+            summary["favorites"] = [
+                {
+                    "id": favorite.norad_id,
+                    "norad_id": favorite.norad_id,
+                    "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
+                    "category": favorite.satellite.category if favorite.satellite else "Unknown",
+                    "added_at": favorite.created_at
+                }
+                for favorite in favorites
+            ]
+        
+        return summary
     
     def get_favorites_count(self, user_id: int) -> int:
         """
@@ -9,6 +9,7 @@ from decimal import Decimal
 
 from app.models.location import UserLocation
 from app.schemas.location import LocationCreate, LocationUpdate
+from app.services.cache_service import CacheService
 from app.utils.location import validate_coordinates
 
 
@@ -63,6 +64,7 @@ class LocationService:
             db.add(db_location)
             db.commit()
             db.refresh(db_location)
+            CacheService.invalidate_upcoming_passes(user_id)
             return db_location
         except IntegrityError as e:
             db.rollback()
@@ -130,6 +132,7 @@ class LocationService:
         try:
             db.commit()
             db.refresh(db_location)
+            CacheService.invalidate_upcoming_passes(user_id)
             return db_location
         except IntegrityError as e:
             db.rollback()
@@ -156,6 +159,7 @@ class LocationService:
         
         db.delete(db_location)
         db.commit()
+        CacheService.invalidate_upcoming_passes(user_id)
         return True
     
     @staticmethod
@@ -24,31 +24,75 @@ logger = logging.getLogger(__name__)
 class N2YOService:
     """Service for interacting with the N2YO API."""
     
-    def __init__(self):
+    def __init__(self, shared: bool = False):
+        """
+        Args:
+            shared: Keep the HTTP client open between uses so keep-alive
+                connections are reused; it is closed by aclose() instead
+        """
         self.base_url = settings.n2yo_base_url
         self.api_key = settings.n2yo_api_key
         self.client = None
         self._rate_limit_reset = None
         self._requests_remaining = None
+        self._shared = shared
+        self._context_depth = 0
         
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        )
+        """Async context manager entry (re-entrant, shares one client)."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20)
+            )
+        self._context_depth += 1
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
+        """Async context manager exit; closes the client when the last user leaves."""
+        self._context_depth -= 1
+        if self._context_depth == 0 and not self._shared:
+            await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the HTTP client, if one is open."""
         if self.client:
-            await self.client.aclose()
+            client, self.client = self.client, None
+            await client.aclose()
     
     def _check_api_key(self) -> None:
         """Check if API key is configured."""
         if not self.api_key:
             raise ConfigurationError("N2YO API key not configured", config_key="n2yo_api_key")
     
+    async def health_ping(self) -> int:
+        """
+        Check that the N2YO API is reachable without spending request quota.
+        
+        Issues a HEAD request against the API root (no API key, no body to parse).
+        
+        Returns:
+            HTTP status code of the response
+            
+        Raises:
+            ExternalAPIError: If the API is unreachable or returns a server error
+        """
+        if not self.client:
+            raise ExternalAPIError("HTTP client not initialized. Use async context manager.", api_name="N2YO")
+        
+        try:
+            response = await self.client.head(f"{self.base_url}/")
+        except httpx.RequestError as e:
+            raise ExternalAPIError(f"N2YO API unreachable: {str(e)}", api_name="N2YO")
+        
+        if response.status_code >= 500:
+            raise ExternalAPIError(
+                f"N2YO API returned {response.status_code}",
+                api_name="N2YO",
+                status_code=response.status_code
+            )
+        return response.status_code
+    
     async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make a request to the N2YO API with error handling and rate limiting.
@@ -315,8 +359,8 @@ class N2YOService:
         }
 
 
-# Singleton instance for dependency injection
-n2yo_service = N2YOService()
+# Singleton instance for dependency injection; its client is closed on app shutdown
+n2yo_service = N2YOService(shared=True)
 
 
 async def get_n2yo_service() -> N2YOService:
@@ -3,25 +3,32 @@ Pass prediction service for satellite pass forecasting and management.
 Provides enhanced pass predictions with filtering, sorting, caching, and alert preparation.
 """
 
+import asyncio
 import logging
+import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from fastapi import Depends
 
 from app.database import get_db
 from app.services.satellite_service import SatelliteService
-from app.services.cache_service import CacheService
 from app.models.cache import SatellitePassCache
 from app.models.favorite import UserFavoriteSatellite
+from app.models.location import UserLocation
 from app.models.user import User
 from app.utils.exceptions import ValidationError, NotFoundError, ExternalAPIError
-from app.utils.satellite_utils import validate_norad_id, validate_coordinates
+from app.utils.satellite_utils import calculate_distance, validate_norad_id, validate_coordinates
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Minutes before a pass at which alerts are raised by default
+DEFAULT_ALERT_MINUTES: Tuple[int, ...] = (60, 15, 5)
+
+KM_PER_DEGREE_LATITUDE = 111.32
+
 
 class PassPredictionService:
     """
@@ -32,7 +39,8 @@ class PassPredictionService:
     def __init__(self, db: Session):
         self.db = db
         self.satellite_service = SatelliteService(db)
-        self.cache_service = CacheService(db)
+        # Share the satellite service's cache service; both wrap the same session
+        self.cache_service = self.satellite_service.cache_service
     
     async def get_satellite_passes(self, norad_id: int, latitude: float, longitude: float,
                                  altitude: float = 0, days: int = 10, min_elevation: float = 0,
@@ -76,14 +84,16 @@ class PassPredictionService:
             norad_id, latitude, longitude, altitude, days, min_elevation, use_cache
         )
         
-        # Enhance pass data with additional information
-        enhanced_passes = []
-        for pass_data in passes_data:
-            enhanced_pass = self._enhance_pass_data(pass_data, latitude, longitude)
-            enhanced_passes.append(enhanced_pass)
+        # Apply visibility filtering first; it only reads raw fields, so
+        # rejected passes are never enhanced
+        filtered_passes = self._filter_passes_by_visibility(passes_data, visibility_filter)
         
-        # Apply visibility filtering
-        filtered_passes = self._filter_passes_by_visibility(enhanced_passes, visibility_filter)
+        # Enhance pass data with additional information
+        now = datetime.utcnow()
+        filtered_passes = [
+            self._enhance_pass_data(pass_data, latitude, longitude, now)
+            for pass_data in filtered_passes
+        ]
         
         # Sort passes by start time and elevation
         sorted_passes = self._sort_passes_by_priority(filtered_passes)
@@ -131,31 +141,34 @@ class PassPredictionService:
         if not favorites:
             return []
         
-        # Get passes for all favorites
-        all_passes = []
+        # Fetch passes for all favorites concurrently, bounded to spare the N2YO quota
+        semaphore = asyncio.Semaphore(settings.n2yo_max_concurrent_requests)
         
-        for favorite in favorites:
-            try:
-                satellite_passes = await self.get_satellite_passes(
-                    favorite.norad_id, latitude, longitude, 0, days, min_elevation, visibility_filter
-                )
-                
-                # Limit passes per satellite
-                limited_passes = satellite_passes[:max_passes_per_satellite]
-                
-                # Add satellite information to each pass
-                for pass_data in limited_passes:
-                    pass_data["satellite"] = {
-                        "norad_id": favorite.norad_id,
-                        "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
-                        "category": favorite.satellite.category if favorite.satellite else "Unknown",
-                        "favorite_id": favorite.id
-                    }
-                    all_passes.append(pass_data)
-                
-            except Exception as e:
-                logger.warning(f"Failed to get passes for satellite {favorite.norad_id}: {e}")
-                continue
+        async def get_favorite_passes(favorite: UserFavoriteSatellite) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    satellite_passes = await self.get_satellite_passes(
+                        favorite.norad_id, latitude, longitude, 0, days, min_elevation, visibility_filter
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to get passes for satellite {favorite.norad_id}: {e}")
+                    return []
+            
+            # Limit passes per satellite
+            limited_passes = satellite_passes[:max_passes_per_satellite]
+            
+            # Add satellite information to each pass
+            for pass_data in limited_passes:
+                pass_data["satellite"] = {
+                    "norad_id": favorite.norad_id,
+                    "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
+                    "category": favorite.satellite.category if favorite.satellite else "Unknown",
+                    "favorite_id": favorite.norad_id
+                }
+            return limited_passes
+        
+        results = await asyncio.gather(*(get_favorite_passes(favorite) for favorite in favorites))
+        all_passes = [pass_data for satellite_passes in results for pass_data in satellite_passes]
         
         # Sort all passes by start time
         all_passes.sort(key=lambda x: x.get("start_time", ""))
@@ -175,19 +188,55 @@ class PassPredictionService:
         Returns:
             List of upcoming pass predictions from cache
         """
+        # Raw rows are cached; time-relative fields are computed on every read
+        pass_rows = self.cache_service.get_cached_upcoming_passes(user_id, hours, min_elevation)
+        if pass_rows is None:
+            pass_rows = self._load_upcoming_pass_rows(user_id, hours, min_elevation)
+            if pass_rows is None:
+                return []
+            self.cache_service.cache_upcoming_passes(user_id, hours, min_elevation, pass_rows)
+        
+        now = datetime.utcnow()
+        upcoming_passes = [
+            self._enhance_pass_data(
+                pass_row, pass_row["observer"]["latitude"], pass_row["observer"]["longitude"], now
+            )
+            for pass_row in pass_rows
+        ]
+        
+        logger.info(f"Retrieved {len(upcoming_passes)} upcoming passes from cache")
+        return upcoming_passes
+    
+    def _load_upcoming_pass_rows(self, user_id: int, hours: int,
+                                 min_elevation: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load the raw cached passes for a user's favorites at their latest location.
+        
+        Rows carry the observer coordinates and satellite information but none of
+        the fields that depend on the current time, so they can be cached as is.
+        
+        Args:
+            user_id: ID of the user
+            hours: Number of hours to look ahead
+            min_elevation: Minimum elevation for passes
+            
+        Returns:
+            List of raw pass dictionaries, or None if the user has no location or favorites
+        """
         # Get user and location
         user = self.db.query(User).filter(User.id == user_id, User.is_active == True).first()
         if not user or not user.locations:
-            return []
+            return None
         
         location = user.locations[-1]
         latitude = float(location.latitude)
         longitude = float(location.longitude)
         
-        # Get user's favorite NORAD IDs
-        favorite_norad_ids = [fav.norad_id for fav in user.favorites]
+        # Get user's favorites, keyed by NORAD ID
+        favorites_by_norad_id = {fav.norad_id: fav for fav in user.favorite_satellites}
+        favorite_norad_ids = list(favorites_by_norad_id)
         if not favorite_norad_ids:
-            return []
+            return None
         
         # Calculate time range
         now = datetime.utcnow()
@@ -206,39 +255,35 @@ class PassPredictionService:
             )
         ).order_by(SatellitePassCache.start_time).all()
         
-        # Convert to enhanced format
-        upcoming_passes = []
+        pass_rows = []
         for cached_pass in cached_passes:
-            pass_data = cached_pass.to_dict()
-            enhanced_pass = self._enhance_pass_data(pass_data, latitude, longitude)
-            
             # Add satellite information
-            satellite = self.db.query(UserFavoriteSatellite).filter(
-                and_(
-                    UserFavoriteSatellite.user_id == user_id,
-                    UserFavoriteSatellite.norad_id == cached_pass.norad_id
-                )
-            ).first()
+            satellite = favorites_by_norad_id.get(cached_pass.norad_id)
             
             if satellite:
-                enhanced_pass["satellite"] = {
+                pass_data = cached_pass.to_dict()
+                pass_data["observer"] = {
+                    "latitude": latitude,
+                    "longitude": longitude
+                }
+                pass_data["satellite"] = {
                     "norad_id": satellite.norad_id,
                     "name": satellite.satellite.name if satellite.satellite else f"Satellite {satellite.norad_id}",
                     "category": satellite.satellite.category if satellite.satellite else "Unknown",
-                    "favorite_id": satellite.id
+                    "favorite_id": satellite.norad_id
                 }
-                upcoming_passes.append(enhanced_pass)
+                pass_rows.append(pass_data)
         
-        logger.info(f"Retrieved {len(upcoming_passes)} upcoming passes from cache")
-        return upcoming_passes
+        return pass_rows
     
-    def get_pass_alerts(self, user_id: int, alert_minutes: List[int] = [60, 15, 5]) -> List[Dict[str, Any]]:
+    def get_pass_alerts(self, user_id: int,
+                        alert_minutes: Sequence[int] = DEFAULT_ALERT_MINUTES) -> List[Dict[str, Any]]:
         """
         Get passes that should trigger alerts based on timing.
         
         Args:
             user_id: ID of the user
-            alert_minutes: List of minutes before pass to trigger alerts
+            alert_minutes: Minutes before pass to trigger alerts
             
         Returns:
             List of passes requiring alerts with alert timing information
@@ -246,17 +291,20 @@ class PassPredictionService:
         alerts = []
         now = datetime.utcnow()
         
+        # The upcoming passes and their start times don't depend on the alert offset,
+        # so they are loaded and parsed once for all offsets
+        upcoming_passes = [
+            (pass_data, datetime.fromisoformat(pass_data["start_time"].replace("Z", "+00:00")))
+            for pass_data in self.get_upcoming_passes(user_id, hours=24)
+        ]
+        
         for minutes in alert_minutes:
             alert_time = now + timedelta(minutes=minutes)
             alert_window_start = alert_time - timedelta(minutes=1)  # 1-minute window
             alert_window_end = alert_time + timedelta(minutes=1)
             
             # Get passes starting in the alert window
-            passes_for_alert = self.get_upcoming_passes(user_id, hours=24)
-            
-            for pass_data in passes_for_alert:
-                pass_start = datetime.fromisoformat(pass_data["start_time"].replace("Z", "+00:00"))
-                
+            for pass_data, pass_start in upcoming_passes:
                 if alert_window_start <= pass_start <= alert_window_end:
                     alert_info = {
                         "pass": pass_data,
@@ -280,29 +328,18 @@ class PassPredictionService:
         Returns:
             Dictionary with optimization statistics
         """
-        # Get all user locations
-        users_with_locations = self.db.query(User).filter(User.locations.any()).all()
-        
-        if not users_with_locations:
+        # Get each user's most recent location
+        latest_locations = {}
+        for user_id, latitude, longitude in self.db.query(
+            UserLocation.user_id, UserLocation.latitude, UserLocation.longitude
+        ).order_by(UserLocation.user_id, UserLocation.id):
+            latest_locations[user_id] = (float(latitude), float(longitude))
+        
+        if not latest_locations:
             return {"locations_processed": 0, "passes_cached": 0}
         
-        # Group nearby locations (simplified - could use proper clustering)
-        unique_locations = []
-        for user in users_with_locations:
-            if user.locations:
-                location = user.locations[-1]
-                lat, lon = float(location.latitude), float(location.longitude)
-                
-                # Check if this location is close to any existing location
-                is_duplicate = False
-                for existing_lat, existing_lon in unique_locations:
-                    # Simple distance check (could be improved)
-                    if abs(lat - existing_lat) < 0.5 and abs(lon - existing_lon) < 0.5:
-                        is_duplicate = True
-                        break
-                
-                if not is_duplicate:
-                    unique_locations.append((lat, lon))
+        # Group nearby locations
+        unique_locations = self._cluster_locations(latest_locations.values(), location_radius_km)
         
         # Get all favorite satellites
         favorite_norad_ids = self.db.query(UserFavoriteSatellite.norad_id).distinct().all()
@@ -338,7 +375,46 @@ class PassPredictionService:
         logger.info(f"Cache optimization completed: {len(unique_locations)} locations, {passes_cached} passes cached")
         return {"locations_processed": len(unique_locations), "passes_cached": passes_cached}
     
-    def _enhance_pass_data(self, pass_data: Dict[str, Any], observer_lat: float, observer_lon: float) -> Dict[str, Any]:
+    def _cluster_locations(self, locations: Iterable[Tuple[float, float]],
+                           radius_km: float) -> List[Tuple[float, float]]:
+        """
+        Pick representative locations so every location lies within radius_km of one.
+        
+        Representatives are bucketed into a latitude/longitude grid with cells about
+        radius_km tall, so each location is only compared against representatives in
+        the neighbouring cells instead of all of them.
+        
+        Args:
+            locations: (latitude, longitude) pairs in degrees
+            radius_km: Clustering radius in kilometers
+            
+        Returns:
+            List of representative (latitude, longitude) pairs
+        """
+        cell_deg = max(radius_km / KM_PER_DEGREE_LATITUDE, 1e-6)
+        max_lon_cells = int(360 / cell_deg) + 1
+        grid: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+        representatives = []
+        
+        for lat, lon in locations:
+            row, col = int(lat // cell_deg), int(lon // cell_deg)
+            # A degree of longitude shrinks with latitude, so widen the search accordingly
+            lon_cells = min(math.ceil(1 / max(math.cos(math.radians(lat)), 1e-6)), max_lon_cells)
+            
+            is_duplicate = any(
+                calculate_distance(lat, lon, rep_lat, rep_lon) <= radius_km
+                for d_row in (-1, 0, 1)
+                for d_col in range(-lon_cells, lon_cells + 1)
+                for rep_lat, rep_lon in grid.get((row + d_row, col + d_col), ())
+            )
+            if not is_duplicate:
+                grid.setdefault((row, col), []).append((lat, lon))
+                representatives.append((lat, lon))
+        
+        return representatives
+    
+    def _enhance_pass_data(self, pass_data: Dict[str, Any], observer_lat: float, observer_lon: float,
+                           now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Enhance pass data with additional calculations and information.
         
@@ -346,6 +422,7 @@ class PassPredictionService:
             pass_data: Raw pass data
             observer_lat: Observer latitude
             observer_lon: Observer longitude
+            now: Current UTC time, shared across a batch of passes
             
         Returns:
             Enhanced pass data dictionary
@@ -369,7 +446,7 @@ class PassPredictionService:
                 enhanced["duration_formatted"] = self._format_duration(duration)
                 
                 # Time until pass
-                now = datetime.utcnow().replace(tzinfo=start_time.tzinfo)
+                now = (now or datetime.utcnow()).replace(tzinfo=start_time.tzinfo)
                 if start_time > now:
                     time_until = (start_time - now).total_seconds()
                     enhanced["time_until_seconds"] = int(time_until)
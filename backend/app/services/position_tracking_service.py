@@ -5,15 +5,14 @@ Provides enhanced position tracking with history, automatic refresh, and coordin
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 from fastapi import Depends
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.services.satellite_service import SatelliteService
-from app.services.cache_service import CacheService
 from app.models.cache import SatellitePositionCache
 from app.models.favorite import UserFavoriteSatellite
 from app.models.user import User
@@ -23,6 +22,14 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming position history
+POSITION_HISTORY_FETCH_CHUNK_SIZE = 100
+
+# In-flight position lookups keyed by (NORAD ID, rounded observer coordinates, observer
+# altitude), so a burst of requests for the same satellite from nearby observers shares one fetch
+POSITION_COALESCE_PRECISION = 2
+_position_inflight: Dict[Tuple[int, float, float, float], "asyncio.Future[Dict[str, Any]]"] = {}
+
 
 class PositionTrackingService:
     """
@@ -33,7 +40,8 @@ class PositionTrackingService:
     def __init__(self, db: Session):
         self.db = db
         self.satellite_service = SatelliteService(db)
-        self.cache_service = CacheService(db)
+        # Share the satellite service's cache service; both wrap the same session
+        self.cache_service = self.satellite_service.cache_service
     
     async def get_real_time_position(self, norad_id: int, latitude: float, longitude: float,
                                    altitude: float = 0, force_refresh: bool = False) -> Dict[str, Any]:
@@ -63,10 +71,12 @@ class PositionTrackingService:
             raise ValidationError(error_msg, field="coordinates")
         
         # Get position data (force refresh if requested)
-        use_cache = not force_refresh
-        position_data = await self.satellite_service.get_satellite_position(
-            norad_id, latitude, longitude, altitude, use_cache=use_cache
-        )
+        if force_refresh:
+            position_data = await self.satellite_service.get_satellite_position(
+                norad_id, latitude, longitude, altitude, use_cache=False
+            )
+        else:
+            position_data = await self._load_position(norad_id, latitude, longitude, altitude)
         
         # Enhance position data with additional calculations
         enhanced_position = self._enhance_position_data(position_data, latitude, longitude, altitude)
@@ -74,8 +84,65 @@ class PositionTrackingService:
         logger.info(f"Retrieved real-time position for satellite {norad_id}")
         return enhanced_position
     
+    async def _load_position(self, norad_id: int, latitude: float, longitude: float,
+                             altitude: float) -> Dict[str, Any]:
+        """
+        Load a cached-or-fresh position, joining an in-flight lookup for the same
+        satellite and nearby observer instead of starting another one.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            latitude: Observer latitude
+            longitude: Observer longitude
+            altitude: Observer altitude in meters
+            
+        Returns:
+            Raw position data
+        """
+        key = (
+            norad_id,
+            round(latitude, POSITION_COALESCE_PRECISION),
+            round(longitude, POSITION_COALESCE_PRECISION),
+            altitude
+        )
+        inflight = _position_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_shared_position(norad_id, latitude, longitude, altitude))
+            _position_inflight[key] = inflight
+            inflight.add_done_callback(lambda _: _position_inflight.pop(key, None))
+        
+        # Shield so one cancelled request doesn't cancel the lookup for the others
+        return dict(await asyncio.shield(inflight))
+    
+    @staticmethod
+    async def _fetch_shared_position(norad_id: int, latitude: float, longitude: float,
+                                     altitude: float) -> Dict[str, Any]:
+        """
+        Load a cached-or-fresh position on a dedicated Session.
+        
+        A shared lookup can outlive the request that started it, so it must not
+        use that request's Session, which get_db closes when the request ends.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            latitude: Observer latitude
+            longitude: Observer longitude
+            altitude: Observer altitude in meters
+            
+        Returns:
+            Raw position data
+        """
+        db = SessionLocal()
+        try:
+            return await SatelliteService(db).get_satellite_position(
+                norad_id, latitude, longitude, altitude, use_cache=True
+            )
+        finally:
+            db.close()
+    
     async def get_multiple_positions(self, norad_ids: List[int], latitude: float, longitude: float,
-                                   altitude: float = 0, max_concurrent: int = 5) -> Dict[int, Dict[str, Any]]:
+                                   altitude: float = 0, max_concurrent: Optional[int] = None,
+                                   force_refresh: bool = False) -> Dict[int, Dict[str, Any]]:
         """
         Get positions for multiple satellites efficiently with concurrency control.
         
@@ -84,7 +151,8 @@ class PositionTrackingService:
             latitude: Observer latitude
             longitude: Observer longitude
             altitude: Observer altitude in meters
-            max_concurrent: Maximum concurrent API requests
+            max_concurrent: Maximum concurrent API requests (defaults to settings)
+            force_refresh: Force fresh data from API
             
         Returns:
             Dictionary mapping NORAD ID to position data
@@ -95,12 +163,14 @@ class PositionTrackingService:
             raise ValidationError(error_msg, field="coordinates")
         
         # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(max_concurrent)
+        semaphore = asyncio.Semaphore(max_concurrent or settings.n2yo_max_concurrent_requests)
         
         async def get_single_position(norad_id: int) -> Tuple[int, Optional[Dict[str, Any]]]:
             async with semaphore:
                 try:
-                    position = await self.get_real_time_position(norad_id, latitude, longitude, altitude)
+                    position = await self.get_real_time_position(
+                        norad_id, latitude, longitude, altitude, force_refresh
+                    )
                     return norad_id, position
                 except Exception as e:
                     logger.warning(f"Failed to get position for satellite {norad_id}: {e}")
@@ -164,13 +234,15 @@ class PositionTrackingService:
         norad_ids = [fav.norad_id for fav in favorites]
         
         # Get positions for all favorites
-        positions = await self.get_multiple_positions(norad_ids, latitude, longitude)
+        positions = await self.get_multiple_positions(
+            norad_ids, latitude, longitude, force_refresh=force_refresh
+        )
         
         # Combine with favorite information
         result = []
         for favorite in favorites:
             satellite_info = {
-                "favorite_id": favorite.id,
+                "favorite_id": favorite.norad_id,
                 "norad_id": favorite.norad_id,
                 "name": favorite.satellite.name if favorite.satellite else f"Satellite {favorite.norad_id}",
                 "category": favorite.satellite.category if favorite.satellite else "Unknown",
@@ -194,12 +266,32 @@ class PositionTrackingService:
         Returns:
             List of historical position data
             
+        Raises:
+            ValidationError: If NORAD ID is invalid
+        """
+        history = list(self.iter_position_history(norad_id, hours, limit))
+        logger.info(f"Retrieved {len(history)} position records for satellite {norad_id}")
+        return history
+    
+    def iter_position_history(self, norad_id: int, hours: int = 24, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Stream position history for a satellite, fetching rows from the database in chunks.
+        
+        Takes the same arguments as get_position_history, but returns an iterator
+        that yields each record as soon as it is read. The NORAD ID is validated
+        before this method returns.
+        
         Raises:
             ValidationError: If NORAD ID is invalid
         """
         if not validate_norad_id(norad_id):
             raise ValidationError(f"Invalid NORAD ID: {norad_id}", field="norad_id")
         
+        cached_history = self.cache_service.get_cached_position_history(norad_id, hours, limit)
+        if cached_history is not None:
+            now = datetime.now(timezone.utc)
+            return (self._with_position_age(position_data, now) for position_data in cached_history)
+        
         # Calculate time range
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
@@ -207,23 +299,33 @@ class PositionTrackingService:
         positions = self.db.query(SatellitePositionCache).filter(
             and_(
                 SatellitePositionCache.norad_id == norad_id,
-                SatellitePositionCache.created_at >= cutoff_time
+                SatellitePositionCache.timestamp >= cutoff_time
             )
-        ).order_by(desc(SatellitePositionCache.created_at)).limit(limit).all()
+        ).order_by(desc(SatellitePositionCache.timestamp)).limit(limit).yield_per(POSITION_HISTORY_FETCH_CHUNK_SIZE)
         
-        # Convert to dictionaries and enhance
+        return self._stream_position_history(norad_id, hours, limit, positions)
+    
+    def _stream_position_history(self, norad_id: int, hours: int, limit: int, positions) -> Iterator[Dict[str, Any]]:
         history = []
+        # created_at is timezone-aware, so compare it with an aware now
+        now = datetime.now(timezone.utc)
         for position in positions:
             position_data = position.to_dict()
-            # Add time since last update
-            if position.created_at:
-                time_diff = datetime.utcnow() - position.created_at
-                position_data["age_seconds"] = int(time_diff.total_seconds())
-            
+            # The raw row is cached; its age is added to each response separately
             history.append(position_data)
+            yield self._with_position_age(position_data, now)
         
-        logger.info(f"Retrieved {len(history)} position records for satellite {norad_id}")
-        return history
+        # Only a fully consumed history is cached; limit bounds its size
+        self.cache_service.cache_position_history(norad_id, hours, limit, history)
+    
+    @staticmethod
+    def _with_position_age(position_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Copy a position record, adding the time since it was cached."""
+        aged = dict(position_data)
+        if position_data.get("created_at"):
+            time_diff = now - datetime.fromisoformat(position_data["created_at"])
+            aged["age_seconds"] = int(time_diff.total_seconds())
+        return aged
     
     async def refresh_stale_positions(self, max_age_minutes: int = 5, batch_size: int = 10) -> Dict[str, int]:
         """
@@ -240,7 +342,7 @@ class PositionTrackingService:
         
         # Find satellites with stale position data that are in someone's favorites
         stale_satellites = self.db.query(SatellitePositionCache.norad_id).filter(
-            SatellitePositionCache.created_at < cutoff_time
+            SatellitePositionCache.timestamp < cutoff_time
         ).distinct().limit(batch_size).all()
         
         if not stale_satellites:
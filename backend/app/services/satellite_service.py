@@ -3,14 +3,18 @@ Satellite service that integrates N2YO API with caching layer.
 Provides high-level satellite data operations with automatic caching and fallback logic.
 """
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
-from app.database import get_db
-from app.services.n2yo_service import N2YOService
+from app.database import SessionLocal, get_db
+from app.services.n2yo_service import N2YOService, n2yo_service
 from app.services.cache_service import CacheService
 from app.models.satellite import Satellite
 from app.utils.exceptions import ExternalAPIError, NotFoundError, ValidationError
@@ -25,6 +29,37 @@ from app.utils.satellite_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent N2YO requests when resolving many positions
+POSITION_FETCH_CONCURRENCY = 16
+
+# Satellite metadata barely changes, so hot entries are also kept in-process
+INFO_CACHE_SIZE = 4096
+INFO_CACHE_TTL = 3600  # seconds
+
+_info_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_info_inflight: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _get_local_info(norad_id: int) -> Optional[Dict[str, Any]]:
+    """Return a copy of the in-process info entry, or None if missing or expired."""
+    entry = _info_cache.get(norad_id)
+    if entry is None:
+        return None
+    expires_at, info_data = entry
+    if expires_at < time.monotonic():
+        _info_cache.pop(norad_id, None)
+        return None
+    _info_cache.move_to_end(norad_id)
+    return dict(info_data)
+
+
+def _remember_info(norad_id: int, info_data: Dict[str, Any]) -> None:
+    """Store satellite info in the in-process cache, evicting the oldest entries."""
+    _info_cache[norad_id] = (time.monotonic() + INFO_CACHE_TTL, dict(info_data))
+    _info_cache.move_to_end(norad_id)
+    while len(_info_cache) > INFO_CACHE_SIZE:
+        _info_cache.popitem(last=False)
+
 
 class SatelliteService:
     """
@@ -35,14 +70,17 @@ class SatelliteService:
     def __init__(self, db: Session):
         self.db = db
         self.cache_service = CacheService(db)
-        self.n2yo_service = N2YOService()
+        self.n2yo_service = n2yo_service
     
-    async def search_satellites(self, query: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+    async def search_satellites(self, query: str, category: Optional[str] = None, limit: int = 50,
+                                use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Search for satellites by name with caching support.
         
         Args:
             query: Search query (satellite name)
+            category: Optional category filter (case-insensitive)
+            limit: Maximum number of results to return
             use_cache: Whether to use cached results
             
         Returns:
@@ -57,13 +95,16 @@ class SatelliteService:
         
         query = query.strip()
         
+        if use_cache:
+            cached_results = self.cache_service.get_cached_search(query, category, limit)
+            if cached_results is not None:
+                return cached_results
+        
         try:
-            # For search operations, we'll always hit the API since results can change
-            # and search queries are too varied to cache effectively
             async with self.n2yo_service as n2yo:
-                satellites = await n2yo.search_satellites(query)
+                satellites = await n2yo.search_satellites(query, category=category)
             
-            # Process and enhance satellite data
+            # Filter before storing so only the returned page is persisted
             enhanced_satellites = []
             for sat_data in satellites:
                 # Format and categorize satellite
@@ -71,10 +112,17 @@ class SatelliteService:
                 if not sat_data.get("category"):
                     sat_data["category"] = categorize_satellite(sat_data["name"])
                 
+                if category and sat_data["category"].lower() != category.lower():
+                    continue
+                
                 # Store/update satellite in database for future reference
                 await self._store_satellite_info(sat_data)
                 
                 enhanced_satellites.append(sat_data)
+                if len(enhanced_satellites) >= limit:
+                    break
+            
+            self.cache_service.cache_search(query, category, limit, enhanced_satellites)
             
             logger.info(f"Search for '{query}' returned {len(enhanced_satellites)} satellites")
             return enhanced_satellites
@@ -82,7 +130,7 @@ class SatelliteService:
         except ExternalAPIError:
             # If API fails, try to find satellites in local database
             logger.warning(f"N2YO API failed for search '{query}', falling back to local database")
-            return self._search_local_satellites(query)
+            return self._search_local_satellites(query, category, limit)
     
     async def get_satellite_info(self, norad_id: int, use_cache: bool = True) -> Dict[str, Any]:
         """
@@ -103,6 +151,76 @@ class SatelliteService:
         if not validate_norad_id(norad_id):
             raise ValidationError(f"Invalid NORAD ID: {norad_id}", field="norad_id")
         
+        if use_cache:
+            cached_info = _get_local_info(norad_id)
+            if cached_info:
+                return cached_info
+            
+            cached_info = self.cache_service.get_cached_info(norad_id)
+            if cached_info:
+                logger.debug(f"Using cached info for satellite {norad_id}")
+                _remember_info(norad_id, cached_info)
+                return cached_info
+        
+        return await self._load_satellite_info(norad_id, coalesce=use_cache)
+    
+    async def _load_satellite_info(self, norad_id: int, coalesce: bool = True) -> Dict[str, Any]:
+        """
+        Load satellite information from the API, sharing one in-flight fetch
+        between concurrent callers for the same satellite when coalesce is set.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            coalesce: Whether to join an in-flight fetch for the same satellite
+            
+        Returns:
+            Satellite information dictionary
+        """
+        if not coalesce:
+            return await self._fetch_satellite_info(norad_id)
+        
+        inflight = _info_inflight.get(norad_id)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_shared_satellite_info(norad_id))
+            _info_inflight[norad_id] = inflight
+            inflight.add_done_callback(lambda _: _info_inflight.pop(norad_id, None))
+        
+        # Shield so one cancelled request doesn't cancel the fetch for the others
+        return dict(await asyncio.shield(inflight))
+    
+    @staticmethod
+    async def _fetch_shared_satellite_info(norad_id: int) -> Dict[str, Any]:
+        """
+        Fetch satellite information on a dedicated Session.
+        
+        A shared fetch can outlive the request that started it, so it must not
+        use that request's Session, which get_db closes when the request ends.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            
+        Returns:
+            Satellite information dictionary
+        """
+        db = SessionLocal()
+        try:
+            return await SatelliteService(db)._fetch_satellite_info(norad_id)
+        finally:
+            db.close()
+    
+    async def _fetch_satellite_info(self, norad_id: int) -> Dict[str, Any]:
+        """
+        Fetch satellite information from the API, falling back to the database.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            
+        Returns:
+            Satellite information dictionary
+            
+        Raises:
+            NotFoundError: If the API fails and the satellite is not stored locally
+        """
         # Check local database first
         satellite = self.db.query(Satellite).filter(Satellite.norad_id == norad_id).first()
         
@@ -117,6 +235,8 @@ class SatelliteService:
                 api_data["category"] = categorize_satellite(api_data["name"])
             
             await self._store_satellite_info(api_data)
+            self.cache_service.cache_info(norad_id, api_data)
+            _remember_info(norad_id, api_data)
             
             logger.info(f"Retrieved satellite info for {norad_id} from API")
             return api_data
@@ -260,12 +380,90 @@ class SatelliteService:
             logger.error(f"N2YO API failed and no cached passes for satellite {norad_id}: {e}")
             raise ExternalAPIError(f"Unable to get passes for satellite {norad_id}: {e}", api_name="N2YO")
     
+    async def get_satellite_bundle(self, norad_id: int, latitude: float, longitude: float,
+                                   altitude: float = 0, include: str = "position", days: int = 10,
+                                   min_elevation: float = 0, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Get satellite information together with its position or pass predictions.
+        
+        Both cached entries are read in a single Redis round trip; whatever is
+        missing is fetched concurrently through the regular lookups.
+        
+        Args:
+            norad_id: NORAD ID of the satellite
+            latitude: Observer latitude
+            longitude: Observer longitude
+            altitude: Observer altitude in meters
+            include: Either "position" or "passes"
+            days: Number of days to predict (passes only)
+            min_elevation: Minimum elevation for visible passes (passes only)
+            use_cache: Whether to use cached data
+            
+        Returns:
+            Dictionary with "satellite" and either "position" or "passes"
+            
+        Raises:
+            ValidationError: If parameters are invalid
+            NotFoundError: If satellite is not found
+            ExternalAPIError: If API request fails and no cached data available
+        """
+        if include not in ("position", "passes"):
+            raise ValidationError(f"Unsupported bundle part: {include}", field="include")
+        
+        if not validate_norad_id(norad_id):
+            raise ValidationError(f"Invalid NORAD ID: {norad_id}", field="norad_id")
+        
+        is_valid, error_msg = validate_coordinates(latitude, longitude)
+        if not is_valid:
+            raise ValidationError(error_msg, field="coordinates")
+        
+        info_data, data = None, None
+        if use_cache:
+            # On an in-process info hit only position/passes remain, left to the regular lookup
+            info_data = _get_local_info(norad_id)
+            if not info_data:
+                if include == "passes":
+                    info_data, data = self.cache_service.get_cached_bundle(norad_id, latitude, longitude)
+                else:
+                    info_data, data = self.cache_service.get_cached_bundle(norad_id)
+                if info_data:
+                    _remember_info(norad_id, info_data)
+        
+        # Redis was already checked above, so misses go straight to the regular lookups
+        info_fetch = None if info_data else self._load_satellite_info(norad_id, coalesce=use_cache)
+        
+        data_fetch = None
+        if data and include == "passes":
+            data = sort_passes_by_time(filter_passes_by_visibility(data, min_elevation))
+        elif not data and include == "passes":
+            data_fetch = self.get_satellite_passes(
+                norad_id, latitude, longitude, altitude, days, min_elevation, use_cache=use_cache
+            )
+        elif not data:
+            data_fetch = self.get_satellite_position(
+                norad_id, latitude, longitude, altitude, use_cache=use_cache
+            )
+        
+        fetches = [fetch for fetch in (info_fetch, data_fetch) if fetch is not None]
+        if fetches:
+            results = iter(await asyncio.gather(*fetches))
+            if info_fetch is not None:
+                info_data = next(results)
+            if data_fetch is not None:
+                data = next(results)
+        
+        return {"satellite": info_data, include: data}
+    
     async def get_multiple_satellite_positions(self, norad_ids: List[int], latitude: float, 
                                              longitude: float, altitude: float = 0,
                                              use_cache: bool = True) -> Dict[int, Dict[str, Any]]:
         """
         Get positions for multiple satellites efficiently.
         
+        Cached positions are loaded in one batch; the remaining satellites are
+        fetched from N2YO concurrently over a shared client, at most
+        POSITION_FETCH_CONCURRENCY at a time.
+        
         Args:
             norad_ids: List of NORAD IDs
             latitude: Observer latitude
@@ -276,17 +474,43 @@ class SatelliteService:
         Returns:
             Dictionary mapping NORAD ID to position data
         """
-        positions = {}
-        
-        for norad_id in norad_ids:
-            try:
-                position = await self.get_satellite_position(norad_id, latitude, longitude, altitude, use_cache)
-                positions[norad_id] = position
-            except Exception as e:
-                logger.warning(f"Failed to get position for satellite {norad_id}: {e}")
-                # Continue with other satellites
+        is_valid, error_msg = validate_coordinates(latitude, longitude)
+        if not is_valid:
+            raise ValidationError(error_msg, field="coordinates")
+        
+        norad_ids = [norad_id for norad_id in dict.fromkeys(norad_ids) if validate_norad_id(norad_id)]
+        
+        positions = self.cache_service.get_cached_positions(norad_ids) if use_cache else {}
+        missing_ids = [norad_id for norad_id in norad_ids if norad_id not in positions]
+        if not missing_ids:
+            return positions
+        
+        semaphore = asyncio.Semaphore(POSITION_FETCH_CONCURRENCY)
+        
+        async def fetch_position(n2yo: N2YOService, norad_id: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await n2yo.get_satellite_position(norad_id, latitude, longitude, altitude)
+                except Exception as e:
+                    logger.warning(f"Failed to get position for satellite {norad_id}: {e}")
+                    return None
+        
+        async with self.n2yo_service as n2yo:
+            results = await asyncio.gather(*(fetch_position(n2yo, norad_id) for norad_id in missing_ids))
+        
+        stale_ids = []
+        for norad_id, position_data in zip(missing_ids, results):
+            if position_data is None:
+                stale_ids.append(norad_id)
                 continue
+            self.cache_service.cache_position(norad_id, position_data)
+            positions[norad_id] = position_data
+        
+        # Mirror get_satellite_position: fall back to cached data the caller opted out of
+        if stale_ids and not use_cache:
+            positions.update(self.cache_service.get_cached_positions(stale_ids))
         
+        logger.info(f"Retrieved positions for {len(positions)}/{len(norad_ids)} satellites")
         return positions
     
     def invalidate_satellite_cache(self, norad_id: int) -> bool:
@@ -299,6 +523,7 @@ class SatelliteService:
         Returns:
             True if successful, False otherwise
         """
+        _info_cache.pop(norad_id, None)
         return self.cache_service.invalidate_satellite_cache(norad_id)
     
     def cleanup_expired_cache(self) -> Dict[str, int]:
@@ -363,20 +588,24 @@ class SatelliteService:
         
         return satellite
     
-    def _search_local_satellites(self, query: str) -> List[Dict[str, Any]]:
+    def _search_local_satellites(self, query: str, category: Optional[str] = None,
+                                 limit: int = 50) -> List[Dict[str, Any]]:
         """
         Search satellites in local database as fallback.
         
         Args:
             query: Search query
+            category: Optional category filter (case-insensitive)
+            limit: Maximum number of results to return
             
         Returns:
             List of satellite dictionaries
         """
         try:
-            satellites = self.db.query(Satellite).filter(
-                Satellite.name.ilike(f"%{query}%")
-            ).limit(50).all()
+            satellites_query = self.db.query(Satellite).filter(Satellite.name.ilike(f"%{query}%"))
+            if category:
+                satellites_query = satellites_query.filter(func.lower(Satellite.category) == category.lower())
+            satellites = satellites_query.limit(limit).all()
             
             result = [satellite.to_dict() for satellite in satellites]
             logger.info(f"Local search for '{query}' returned {len(result)} satellites")
@@ -2,12 +2,33 @@
 Token blacklist service for handling JWT token invalidation.
 """
 
+from collections import OrderedDict
 from typing import Optional, Dict, Set
 from datetime import datetime, timedelta
-import redis
-from app.config import settings
+import hashlib
+import logging
+import threading
+import time
+from app.redis_client import async_redis_client, redis_client
 from app.utils.auth import verify_token
 
+logger = logging.getLogger(__name__)
+
+# Number of recently blacklisted tokens remembered in-process
+RECENT_BLACKLIST_SIZE = 10_000
+
+# Tokens Redis recently reported as not blacklisted are trusted for this long
+# without asking again. Revocations made by this process take effect at once;
+# ones made by other processes take effect within this window.
+CLEAR_TOKEN_CACHE_TTL_SECONDS = 10
+CLEAR_TOKEN_CACHE_SIZE = 10_000
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Fixed-size digest of a token, so the clear-token cache doesn't hold raw tokens."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
 class TokenBlacklistService:
     """Service for managing blacklisted JWT tokens."""
     
@@ -15,14 +36,20 @@ class TokenBlacklistService:
         """Initialize Redis connection for token blacklist with fallback to in-memory store."""
         self.redis_client = None
         self.in_memory_blacklist: Dict[str, datetime] = {}  # Fallback storage
+        # LRU of tokens blacklisted by this process, checked before Redis
+        self._recent_blacklist: "OrderedDict[str, datetime]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        # LRU of token digests Redis reported as not blacklisted, with expiry times
+        self._clear_tokens: "OrderedDict[bytes, float]" = OrderedDict()
         
         try:
-            self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+            # Share the application's Redis connection pool
+            self.redis_client = redis_client
             # Test connection
             self.redis_client.ping()
-            print("Connected to Redis for token blacklisting")
+            logger.info("Connected to Redis for token blacklisting")
         except Exception as e:
-            print(f"Redis connection failed, using in-memory blacklist: {e}")
+            logger.warning(f"Redis connection failed, using in-memory blacklist: {e}")
             self.redis_client = None
     
     def blacklist_token(self, token: str) -> bool:
@@ -35,19 +62,59 @@ class TokenBlacklistService:
         Returns:
             bool: True if token was successfully blacklisted
         """
+        exp_datetime = self.remember_blacklisted_token(token)
+        if exp_datetime is None:
+            return False
+        return self.store_blacklisted_token(token, exp_datetime)
+    
+    def remember_blacklisted_token(self, token: str) -> Optional[datetime]:
+        """
+        Validate a token and blacklist it in this process without touching Redis.
+        
+        Pair with store_blacklisted_token (e.g. as a background task) to make the
+        blacklisting visible to other processes.
+        
+        Args:
+            token: The JWT token to blacklist
+            
+        Returns:
+            datetime: The token expiration time, or None if the token is invalid
+        """
         try:
-            # Verify token and get expiration
             payload = verify_token(token)
             if not payload:
-                return False
+                return None
             
-            # Get token expiration time
             exp_timestamp = payload.get("exp")
             if not exp_timestamp:
-                return False
+                return None
             
-            # Calculate expiration datetime
             exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
+        except Exception as e:
+            logger.error(f"Error blacklisting token: {e}")
+            return None
+        
+        with self._recent_lock:
+            self._clear_tokens.pop(_token_cache_key(token), None)
+            self._recent_blacklist[token] = exp_datetime
+            self._recent_blacklist.move_to_end(token)
+            while len(self._recent_blacklist) > RECENT_BLACKLIST_SIZE:
+                self._recent_blacklist.popitem(last=False)
+        
+        return exp_datetime
+    
+    def store_blacklisted_token(self, token: str, exp_datetime: datetime) -> bool:
+        """
+        Persist a blacklisted token in Redis, or the in-memory fallback store.
+        
+        Args:
+            token: The JWT token to blacklist
+            exp_datetime: The token expiration time
+            
+        Returns:
+            bool: True if token was successfully stored
+        """
+        try:
             current_time = datetime.utcnow()
             
             if exp_datetime <= current_time:
@@ -68,9 +135,83 @@ class TokenBlacklistService:
             return True
             
         except Exception as e:
-            print(f"Error blacklisting token: {e}")
+            logger.error(f"Error blacklisting token: {e}")
             return False
     
+    def _is_recently_blacklisted(self, token: str) -> bool:
+        """Check the in-process LRU of blacklisted tokens."""
+        with self._recent_lock:
+            exp_time = self._recent_blacklist.get(token)
+            if exp_time is None:
+                return False
+            if datetime.utcnow() >= exp_time:
+                del self._recent_blacklist[token]
+                return False
+            return True
+    
+    def _is_recently_cleared(self, cache_key: bytes) -> bool:
+        """Check the in-process LRU of tokens Redis reported as not blacklisted."""
+        with self._recent_lock:
+            expires_at = self._clear_tokens.get(cache_key)
+            if expires_at is None:
+                return False
+            if time.monotonic() >= expires_at:
+                del self._clear_tokens[cache_key]
+                return False
+            return True
+    
+    def _remember_cleared(self, cache_key: bytes, token_exp: Optional[float] = None) -> None:
+        """
+        Remember that Redis reported a token as not blacklisted.
+        
+        The entry never outlives the token itself when its exp claim is known.
+        """
+        ttl = CLEAR_TOKEN_CACHE_TTL_SECONDS
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+        with self._recent_lock:
+            self._clear_tokens[cache_key] = time.monotonic() + ttl
+            self._clear_tokens.move_to_end(cache_key)
+            while len(self._clear_tokens) > CLEAR_TOKEN_CACHE_SIZE:
+                self._clear_tokens.popitem(last=False)
+    
+    async def is_token_blacklisted_async(self, token: str, token_exp: Optional[float] = None) -> bool:
+        """
+        Check if a token is blacklisted without blocking the event loop.
+        
+        Behaves like is_token_blacklisted, but queries Redis with the async client.
+        
+        Args:
+            token: The JWT token to check
+            token_exp: The token's exp claim, if already decoded; bounds how
+                long a "not blacklisted" answer is cached
+            
+        Returns:
+            bool: True if token is blacklisted
+        """
+        if not self.redis_client:
+            return self.is_token_blacklisted(token)
+        
+        if self._is_recently_blacklisted(token):
+            return True
+        
+        cache_key = _token_cache_key(token)
+        if self._is_recently_cleared(cache_key):
+            return False
+        
+        try:
+            blacklisted = await async_redis_client.exists(f"blacklisted_token:{token}") > 0
+        except Exception as e:
+            logger.warning(f"Error checking token blacklist: {e}")
+            # If there's an error, allow the request (fail open)
+            return False
+        
+        if not blacklisted:
+            self._remember_cleared(cache_key, token_exp)
+        return blacklisted
+    
     def is_token_blacklisted(self, token: str) -> bool:
         """
         Check if a token is blacklisted.
@@ -81,11 +222,21 @@ class TokenBlacklistService:
         Returns:
             bool: True if token is blacklisted
         """
+        if self._is_recently_blacklisted(token):
+            return True
+        
         try:
             if self.redis_client:
                 # Use Redis if available
+                cache_key = _token_cache_key(token)
+                if self._is_recently_cleared(cache_key):
+                    return False
+                
                 key = f"blacklisted_token:{token}"
-                return self.redis_client.exists(key) > 0
+                blacklisted = self.redis_client.exists(key) > 0
+                if not blacklisted:
+                    self._remember_cleared(cache_key)
+                return blacklisted
             else:
                 # Use in-memory storage as fallback
                 if token in self.in_memory_blacklist:
@@ -98,7 +249,7 @@ class TokenBlacklistService:
                     return True
                 return False
         except Exception as e:
-            print(f"Error checking token blacklist: {e}")
+            logger.warning(f"Error checking token blacklist: {e}")
             # If there's an error, allow the request (fail open)
             return False
     
@@ -140,5 +291,5 @@ class TokenBlacklistService:
                 return initial_count - len(self.in_memory_blacklist)
             
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            logger.error(f"Error during cleanup: {e}")
             return 0
\ No newline at end of file
@@ -4,6 +4,7 @@ Authentication utilities for password hashing and JWT token management.
 
 from datetime import datetime, timedelta
 from typing import Optional, Union
+import uuid
 from jose import JWTError, jwt
 import bcrypt
 from app.config import settings
@@ -59,7 +60,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),  # Issued at time
-        "type": "access"  # Token type
+        "type": "access",  # Token type
+        "jti": uuid.uuid4().hex  # Token ID
     })
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
@@ -87,7 +89,8 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),  # Issued at time
-        "type": "refresh"  # Token type
+        "type": "refresh",  # Token type
+        "jti": uuid.uuid4().hex  # Token ID
     })
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
@@ -116,6 +119,87 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
         return None
 
 
+def get_token_jti(token: str) -> Optional[str]:
+    """
+    Read the token ID from a JWT without verifying it.
+    
+    Only use this on tokens that have already been verified.
+    
+    Args:
+        token: The JWT token
+        
+    Returns:
+        str: The token's jti claim, or None if absent
+    """
+    try:
+        return jwt.get_unverified_claims(token).get("jti")
+    except JWTError:
+        return None
+
+
+def decode_token_claims(token: str) -> Optional[dict]:
+    """
+    Verify a JWT token's signature and decode its claims without checking expiry.
+    
+    Decode once and pass the claims to is_claims_expired and user_id_from_claims
+    instead of decoding the same token for each check.
+    
+    Args:
+        token: The JWT token
+        
+    Returns:
+        dict: The token claims if the signature is valid, None otherwise
+    """
+    try:
+        return jwt.decode(
+            token,
+            settings.secret_key,
+            algorithms=[settings.algorithm],
+            options={"verify_exp": False}
+        )
+    except JWTError:
+        return None
+
+
+def is_claims_expired(claims: dict) -> bool:
+    """
+    Check if decoded JWT claims are expired.
+    
+    Args:
+        claims: Claims returned by decode_token_claims
+        
+    Returns:
+        bool: True if the claims are expired or carry no expiration, False otherwise
+    """
+    exp_timestamp = claims.get("exp")
+    if exp_timestamp:
+        exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
+        return datetime.utcnow() >= exp_datetime
+    return True  # No expiration means invalid token
+
+
+def user_id_from_claims(claims: dict, token_type: str = "access") -> Optional[int]:
+    """
+    Extract user ID from decoded JWT claims.
+    
+    Args:
+        claims: Claims returned by decode_token_claims
+        token_type: Expected token type ("access" or "refresh")
+        
+    Returns:
+        int: The user ID if the claims are of the expected type, None otherwise
+    """
+    if token_type and claims.get("type") != token_type:
+        return None
+    user_id: Union[str, int] = claims.get("sub")
+    if user_id:
+        try:
+            return int(user_id)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
 def extract_user_id_from_token(token: str, token_type: str = "access") -> Optional[int]:
     """
     Extract user ID from a JWT token.
@@ -129,12 +213,7 @@ def extract_user_id_from_token(token: str, token_type: str = "access") -> Option
     """
     payload = verify_token(token, token_type)
     if payload:
-        user_id: Union[str, int] = payload.get("sub")
-        if user_id:
-            try:
-                return int(user_id)
-            except (ValueError, TypeError):
-                return None
+        return user_id_from_claims(payload, token_type)
     return None
 
 
@@ -148,12 +227,7 @@ def is_token_expired(token: str) -> bool:
     Returns:
         bool: True if token is expired, False otherwise
     """
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        exp_timestamp = payload.get("exp")
-        if exp_timestamp:
-            exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
-            return datetime.utcnow() >= exp_datetime
-        return True  # No expiration means invalid token
-    except JWTError:
-        return True  # Invalid token is considered expired
\ No newline at end of file
+    claims = decode_token_claims(token)
+    if claims is None:
+        return True  # Invalid token is considered expired
+    return is_claims_expired(claims)
\ No newline at end of file
@@ -2,8 +2,11 @@
 FastAPI dependencies for authentication and database access.
 """
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -11,15 +14,25 @@ from app.database import get_db
 from app.models.user import User
 from app.services.auth_service import AuthService
 from app.services.token_blacklist_service import TokenBlacklistService
-from app.utils.auth import extract_user_id_from_token, is_token_expired
+from app.utils.auth import decode_token_claims, is_claims_expired, user_id_from_claims
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Resolved users keyed by token jti, so concurrent requests with the same token
+# share one SELECT. Entries are detached snapshots merged into each request's session.
+USER_CACHE_TTL_SECONDS = 10
+_user_cache: Dict[str, Tuple[float, User]] = {}
+_user_cache_lock = threading.Lock()
 
+
+@lru_cache()
 def get_token_blacklist_service() -> TokenBlacklistService:
     """
-    Get token blacklist service instance.
+    Get the shared token blacklist service instance.
+    
+    The service opens a Redis connection pool and pings it on construction,
+    so it is built once per process rather than per request.
     
     Returns:
         TokenBlacklistService: The token blacklist service instance
@@ -40,7 +53,60 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
     return AuthService(db)
 
 
+def _get_token_claims(request: Optional[Request], token: str) -> Optional[dict]:
+    """
+    Get a token's verified claims, reusing the ones AuthenticationMiddleware decoded.
+    
+    Args:
+        request: The incoming request, if available
+        token: The JWT token
+        
+    Returns:
+        dict: The token claims, or None if the signature is invalid
+    """
+    if request is not None and getattr(request.state, "jwt_token", None) == token:
+        return request.state.jwt_claims
+    return decode_token_claims(token)
+
+
+def _get_user_for_token(token: str, claims: dict, user_id: int, auth_service: AuthService) -> Optional[User]:
+    """
+    Load the user a token belongs to, reusing a recent lookup for the same token.
+    
+    Args:
+        token: The verified JWT token
+        claims: The token's verified claims
+        user_id: User ID from the token
+        auth_service: Authentication service instance
+        
+    Returns:
+        User: The user bound to the request's session, or None if not found
+    """
+    cache_key = claims.get("jti") or token
+    now = time.monotonic()
+    
+    with _user_cache_lock:
+        cached = _user_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return auth_service.db.merge(cached[1], load=False)
+    
+    user = auth_service.get_user_by_id(user_id)
+    if user is None:
+        return None
+    
+    # Detach the instance so commits in this session don't expire the cached copy
+    auth_service.db.expunge(user)
+    with _user_cache_lock:
+        if len(_user_cache) > 1000:
+            for key in [key for key, (expires, _) in _user_cache.items() if expires <= now]:
+                del _user_cache[key]
+        _user_cache[cache_key] = (now + USER_CACHE_TTL_SECONDS, user)
+    
+    return auth_service.db.merge(user, load=False)
+
+
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
     blacklist_service: TokenBlacklistService = Depends(get_token_blacklist_service)
@@ -48,7 +114,11 @@ def get_current_user(
     """
     Get the current authenticated user from JWT token.
     
+    The resolved user is stored on request.state.user and reused for the rest
+    of the request; the raw bearer token is stored on request.state.raw_token.
+    
     Args:
+        request: The incoming request
         credentials: HTTP authorization credentials
         auth_service: Authentication service instance
         blacklist_service: Token blacklist service instance
@@ -59,10 +129,15 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid, blacklisted, expired, or user not found
     """
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+    
     token = credentials.credentials
+    claims = _get_token_claims(request, token)
     
     # Check if token is expired first (requirement 8.3)
-    if is_token_expired(token):
+    if claims is None or is_claims_expired(claims):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Access token has expired. Please login again to continue.",
@@ -78,7 +153,7 @@ def get_current_user(
         )
     
     # Extract user ID from token
-    user_id = extract_user_id_from_token(token)
+    user_id = user_id_from_claims(claims)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -87,7 +162,7 @@ def get_current_user(
         )
     
     # Get user from database
-    user = auth_service.get_user_by_id(user_id)
+    user = _get_user_for_token(token, claims, user_id, auth_service)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,6 +178,8 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    request.state.raw_token = token
+    request.state.user = user
     return user
 
 
@@ -130,6 +207,7 @@ def get_current_active_user(
 
 
 def get_optional_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
     blacklist_service: TokenBlacklistService = Depends(get_token_blacklist_service)
@@ -139,6 +217,7 @@ def get_optional_current_user(
     This is useful for endpoints that work for both authenticated and anonymous users.
     
     Args:
+        request: The incoming request
         credentials: HTTP authorization credentials (optional)
         auth_service: Authentication service instance
         blacklist_service: Token blacklist service instance
@@ -151,20 +230,21 @@ def get_optional_current_user(
     
     try:
         token = credentials.credentials
+        claims = _get_token_claims(request, token)
         
         # Check if token is expired
-        if is_token_expired(token):
+        if claims is None or is_claims_expired(claims):
             return None
         
         # Check if token is blacklisted
         if blacklist_service.is_token_blacklisted(token):
             return None
         
-        user_id = extract_user_id_from_token(token)
+        user_id = user_id_from_claims(claims)
         if user_id is None:
             return None
         
-        user = auth_service.get_user_by_id(user_id)
+        user = _get_user_for_token(token, claims, user_id, auth_service)
         if user is None or not user.is_active:
             return None
         
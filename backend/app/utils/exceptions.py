@@ -2,12 +2,17 @@
 Custom exception classes for the satellite tracker application.
 """
 
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
+from fastapi import HTTPException
+
 
 class SatelliteTrackerException(Exception):
     """Base exception class for satellite tracker application."""
     
+    __slots__ = ("message", "error_code", "details")
+    
     def __init__(self, message: str, error_code: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         self.message = message
         self.error_code = error_code or "GENERAL_ERROR"
@@ -18,6 +23,8 @@ class SatelliteTrackerException(Exception):
 class ValidationError(SatelliteTrackerException):
     """Exception raised for validation errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, field: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if field:
@@ -28,6 +35,8 @@ class ValidationError(SatelliteTrackerException):
 class AuthenticationError(SatelliteTrackerException):
     """Exception raised for authentication errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Authentication failed", details: Optional[Dict[str, Any]] = None):
         super().__init__(message, "AUTHENTICATION_ERROR", details)
 
@@ -35,6 +44,8 @@ class AuthenticationError(SatelliteTrackerException):
 class AuthorizationError(SatelliteTrackerException):
     """Exception raised for authorization errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Access denied", details: Optional[Dict[str, Any]] = None):
         super().__init__(message, "AUTHORIZATION_ERROR", details)
 
@@ -42,6 +53,8 @@ class AuthorizationError(SatelliteTrackerException):
 class NotFoundError(SatelliteTrackerException):
     """Exception raised when a resource is not found."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, resource_type: Optional[str] = None, resource_id: Optional[str] = None):
         details = {}
         if resource_type:
@@ -54,6 +67,8 @@ class NotFoundError(SatelliteTrackerException):
 class ConflictError(SatelliteTrackerException):
     """Exception raised when a resource conflict occurs (e.g., duplicate entries)."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, resource_type: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if resource_type:
@@ -64,6 +79,8 @@ class ConflictError(SatelliteTrackerException):
 class ExternalAPIError(SatelliteTrackerException):
     """Exception raised for external API errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, api_name: Optional[str] = None, status_code: Optional[int] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if api_name:
@@ -76,6 +93,8 @@ class ExternalAPIError(SatelliteTrackerException):
 class RateLimitExceededError(SatelliteTrackerException):
     """Exception raised when rate limits are exceeded."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Rate limit exceeded", reset_time: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if reset_time:
@@ -86,6 +105,8 @@ class RateLimitExceededError(SatelliteTrackerException):
 class CacheError(SatelliteTrackerException):
     """Exception raised for cache-related errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, cache_key: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if cache_key:
@@ -96,6 +117,8 @@ class CacheError(SatelliteTrackerException):
 class DatabaseError(SatelliteTrackerException):
     """Exception raised for database-related errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, operation: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if operation:
@@ -106,8 +129,45 @@ class DatabaseError(SatelliteTrackerException):
 class ConfigurationError(SatelliteTrackerException):
     """Exception raised for configuration-related errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, config_key: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         error_details = details or {}
         if config_key:
             error_details["config_key"] = config_key
-        super().__init__(message, "CONFIGURATION_ERROR", error_details)
\ No newline at end of file
+        super().__init__(message, "CONFIGURATION_ERROR", error_details)
+
+
+# HTTP status codes for service exceptions that escape the API routers
+SERVICE_EXCEPTION_STATUS_CODES = {
+    ValidationError: 422,
+    AuthenticationError: 401,
+    AuthorizationError: 403,
+    NotFoundError: 404,
+    ConflictError: 409,
+    RateLimitExceededError: 429,
+    ExternalAPIError: 502,
+}
+
+
+def status_code_for(exc: SatelliteTrackerException) -> int:
+    """Return the HTTP status code for a service exception (500 if unmapped)."""
+    for exc_type in type(exc).__mro__:
+        if exc_type in SERVICE_EXCEPTION_STATUS_CODES:
+            return SERVICE_EXCEPTION_STATUS_CODES[exc_type]
+    return 500
+
+
+def http_error(status_code: int, code: str, message: str, details: Optional[Dict[str, Any]] = None) -> HTTPException:
+    """Build an HTTPException with the standard API error body."""
+    return HTTPException(
+        status_code=status_code,
+        detail={
+            "error": {
+                "code": code,
+                "message": message,
+                "details": details,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        }
+    )
@@ -2,10 +2,14 @@
 Logging configuration for the Satellite Tracker application.
 """
 
+import atexit
+import copy
 import logging
 import logging.config
+import queue
 import sys
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from app.config import settings
@@ -50,7 +54,9 @@ class StructuredFormatter(logging.Formatter):
                           'filename', 'module', 'lineno', 'funcName', 'created', 
                           'msecs', 'relativeCreated', 'thread', 'threadName', 
                           'processName', 'process', 'getMessage', 'exc_info', 
-                          'exc_text', 'stack_info', 'correlation_id']:
+                          'exc_text', 'stack_info', 'correlation_id',
+                          # Set on the record by other handlers' formatters
+                          'message', 'asctime', 'taskName']:
                 extra_fields[key] = value
         
         if extra_fields:
@@ -59,6 +65,54 @@ class StructuredFormatter(logging.Formatter):
         return str(log_entry)
 
 
+class RoutingQueueHandler(QueueHandler):
+    """
+    Queue handler that remembers which real handlers a record is bound for.
+    
+    Each configured logger gets one of these in place of its own handlers, so
+    the logger only enqueues and the listener thread does the actual I/O.
+    """
+    
+    def __init__(self, log_queue: queue.SimpleQueue, target_handlers: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.target_handlers = target_handlers
+    
+    def prepare(self, record):
+        """
+        Enqueue a shallow copy of the record without formatting it.
+        
+        QueueHandler.prepare would merge the message, arguments and traceback
+        into msg, losing exc_info and the separate fields the structured
+        handler records; the target handlers format the record themselves.
+        """
+        return copy.copy(record)
+    
+    def enqueue(self, record):
+        """Enqueue the record together with its target handlers."""
+        self.queue.put_nowait((self.target_handlers, record))
+
+
+class RoutingQueueListener(QueueListener):
+    """
+    Queue listener that passes each record to the handlers it was routed to.
+    """
+    
+    def __init__(self, log_queue: queue.SimpleQueue):
+        super().__init__(log_queue, respect_handler_level=True)
+    
+    def handle(self, item):
+        """Emit a dequeued record through its target handlers."""
+        target_handlers, record = item
+        for handler in target_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_queue_listener: Optional[RoutingQueueListener] = None
+# Loggers whose handlers were replaced by a RoutingQueueHandler, with the originals
+_queued_loggers: List[Tuple[logging.Logger, List[logging.Handler]]] = []
+
+
 def get_logging_config() -> Dict[str, Any]:
     """
     Get logging configuration based on environment settings.
@@ -192,14 +246,51 @@ def setup_logging():
     """
     Set up logging configuration for the application.
     """
+    global _queue_listener
+    
+    stop_logging()
     config = get_logging_config()
     logging.config.dictConfig(config)
     
+    # Move handler I/O off the calling thread: loggers only enqueue records and
+    # a listener thread writes them to the configured handlers
+    log_queue = queue.SimpleQueue()
+    for name in [None, *config['loggers']]:
+        configured_logger = logging.getLogger(name)
+        if configured_logger.handlers:
+            target_handlers = list(configured_logger.handlers)
+            _queued_loggers.append((configured_logger, target_handlers))
+            configured_logger.handlers = [RoutingQueueHandler(log_queue, target_handlers)]
+    _queue_listener = RoutingQueueListener(log_queue)
+    _queue_listener.start()
+    
     # Log startup message
     logger = logging.getLogger('app')
     logger.info("Logging configuration initialized")
 
 
+def stop_logging():
+    """
+    Stop the logging queue listener, flushing records still in the queue.
+    
+    The original handlers are put back first, so records logged afterwards
+    (e.g. uvicorn's own shutdown messages) are written directly instead of
+    going into a queue nobody reads.
+    """
+    global _queue_listener
+    
+    for configured_logger, target_handlers in _queued_loggers:
+        configured_logger.handlers = target_handlers
+    _queued_loggers.clear()
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the specified name.
@@ -0,0 +1,30 @@
+"""
+Response classes for large JSON payloads.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode the types orjson doesn't handle natively the way jsonable_encoder does."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class PayloadResponse(ORJSONResponse):
+    """
+    orjson response for endpoints that return plain dicts and lists directly.
+    
+    Returning this from a handler skips FastAPI's jsonable_encoder pass, which
+    dominates serialization cost for large list-of-dict bodies.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.auth import create_access_token
+from app.utils.dependencies import get_auth_service, get_token_blacklist_service
+
+client = TestClient(app)
+
+
+class FakeAuthService:
+    def __init__(self):
+        self.db = SimpleNamespace(expunge=lambda user: None, merge=lambda user, load=True: user)
+
+    def get_user_by_id(self, user_id):
+        return SimpleNamespace(id=user_id, is_active=True)
+
+
+def test_logout_blacklists_token():
+    app.dependency_overrides[get_auth_service] = FakeAuthService
+    try:
+        token = create_access_token({"sub": "1"})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post("/api/v1/auth/logout", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"message": "Successfully logged out"}
+        assert get_token_blacklist_service().is_token_blacklisted(token)
+
+        # Rejected by the authentication middleware before reaching any route
+        response = client.post("/api/v1/auth/logout", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["error"]["code"] == "TOKEN_REVOKED"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_logout_leaves_other_tokens_valid():
+    app.dependency_overrides[get_auth_service] = FakeAuthService
+    try:
+        revoked = create_access_token({"sub": "2"})
+        other = create_access_token({"sub": "2"})
+
+        assert client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {revoked}"}).status_code == 200
+        assert not get_token_blacklist_service().is_token_blacklisted(other)
+    finally:
+        app.dependency_overrides.clear()
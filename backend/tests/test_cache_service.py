@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from app.services.cache_service import CacheService
+
+
+def executed_sql(db):
+    return [str(call.args[0]) for call in db.execute.call_args_list]
+
+
+def test_roll_position_partitions_cleans_default_partition():
+    db = MagicMock()
+    expired = datetime.utcnow() - timedelta(days=1)
+    db.execute.return_value.scalars.return_value.all.return_value = [
+        "satellite_positions_cache_default",
+        f"satellite_positions_cache_p{expired:%Y%m%d%H}"
+    ]
+    db.execute.return_value.rowcount = 3
+
+    assert CacheService(db).roll_position_partitions(hours_ahead=2) == 1
+
+    statements = executed_sql(db)
+    assert sum("PARTITION OF satellite_positions_cache" in sql for sql in statements) == 3
+    assert "DELETE FROM satellite_positions_cache_default WHERE timestamp < :cutoff" in statements
+    assert f"DROP TABLE IF EXISTS satellite_positions_cache_p{expired:%Y%m%d%H}" in statements
+    # The default partition itself is never dropped
+    assert "DROP TABLE IF EXISTS satellite_positions_cache_default" not in statements
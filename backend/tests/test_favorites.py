@@ -0,0 +1,218 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.redis_client import cache
+from app.services import favorite_service as favorite_module
+from app.services.favorite_service import FavoriteService, get_favorite_service
+from app.utils.dependencies import get_current_user
+from app.utils.exceptions import ExternalAPIError
+
+client = TestClient(app)
+
+USER = SimpleNamespace(id=1, is_active=True)
+
+
+def favorite(norad_id):
+    return {
+        "id": norad_id,
+        "norad_id": norad_id,
+        "name": f"Satellite {norad_id}",
+        "category": "Unknown",
+        "added_at": datetime(2024, 1, 1),
+        "current_position": None
+    }
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    store = {}
+    monkeypatch.setattr(cache, "get", store.get)
+    monkeypatch.setattr(cache, "delete", lambda key: store.pop(key, None) is not None)
+
+    def get_counter(key, seed, ttl=None):
+        return store.setdefault(key, seed)
+
+    def incr(key, seed=None, ttl=None):
+        store[key] = store.get(key, seed or 0) + 1
+        return store[key]
+
+    monkeypatch.setattr(cache, "get_counter", get_counter)
+    monkeypatch.setattr(cache, "incr", incr)
+    return store
+
+
+class FakeFavoriteService:
+    def __init__(self, favorite_ids):
+        self.favorite_ids = sorted(favorite_ids)
+        self.checks = 0
+
+    def is_satellite_favorite(self, user_id, norad_id):
+        self.checks += 1
+        return norad_id in self.favorite_ids
+
+    def get_favorites_count(self, user_id):
+        return len(self.favorite_ids)
+
+    def _page(self, limit, cursor):
+        ids = [norad_id for norad_id in self.favorite_ids if cursor is None or norad_id > cursor]
+        return [favorite(norad_id) for norad_id in ids[:limit]]
+
+    async def get_user_favorites(self, user_id, include_positions, use_cache, limit, cursor):
+        return self._page(limit, cursor)
+
+    async def iter_user_favorites(self, user_id, include_positions, use_cache, limit, cursor):
+        for item in self._page(limit, cursor):
+            yield item
+
+
+@pytest.fixture
+def favorites(fake_cache):
+    service = FakeFavoriteService([10, 20, 30])
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_favorite_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+def test_check_favorite_etag_not_modified(favorites):
+    response = client.get("/api/v1/users/favorites/check/20")
+    assert response.status_code == 200
+    assert response.json() == {"norad_id": 20, "is_favorite": True, "favorite_id": 20}
+    etag = response.headers["etag"]
+
+    response = client.get("/api/v1/users/favorites/check/20", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert favorites.checks == 1
+
+    response = client.head("/api/v1/users/favorites/check/20", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_favorites_mutation_invalidates_etag(favorites):
+    etag = client.get("/api/v1/users/favorites/check/20").headers["etag"]
+
+    favorite_module._bump_favorites_version(USER.id)
+
+    response = client.get("/api/v1/users/favorites/check/20", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_lost_favorites_version_is_reseeded(favorites, fake_cache):
+    etag = client.get("/api/v1/users/favorites/check/20").headers["etag"]
+
+    # An evicted or flushed version must not come back as a value an old ETag used
+    fake_cache.clear()
+    favorite_module._bump_favorites_version(USER.id)
+
+    response = client.get("/api/v1/users/favorites/check/20", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_check_favorite_without_redis_skips_etag(favorites, monkeypatch):
+    etag = client.get("/api/v1/users/favorites/check/20").headers["etag"]
+    monkeypatch.setattr(cache, "get_counter", lambda key, seed, ttl=None: None)
+
+    response = client.get("/api/v1/users/favorites/check/20", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert favorites.checks == 2
+
+    response = client.head("/api/v1/users/favorites/check/30", headers={"If-None-Match": etag})
+    assert response.status_code == 204
+    assert "etag" not in response.headers
+
+
+def test_favorites_keyset_pagination(favorites):
+    response = client.get("/api/v1/users/favorites", params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["norad_id"] for item in page["favorites"]] == [10, 20]
+    assert page["total"] == 3
+    assert page["next_cursor"] == 20
+
+    response = client.get("/api/v1/users/favorites", params={"limit": 2, "cursor": page["next_cursor"]})
+    page = response.json()
+    assert [item["norad_id"] for item in page["favorites"]] == [30]
+    assert page["total"] == 3
+    assert page["next_cursor"] is None
+
+
+def test_favorites_ndjson_next_cursor(favorites):
+    response = client.get(
+        "/api/v1/users/favorites",
+        params={"limit": 2},
+        headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["norad_id"] for line in lines[:-1]] == [10, 20]
+    assert lines[-1] == {"total": 3, "next_cursor": 20}
+
+
+def test_favorites_page_statement_uses_keyset():
+    service = FavoriteService(MagicMock())
+    sql = str(service._favorites_page_statement(1, 50, 25544).compile(dialect=postgresql.dialect()))
+    assert "user_favorite_satellites.norad_id >" in sql
+    assert "ORDER BY user_favorite_satellites.norad_id" in sql
+    assert "LIMIT" in sql
+    assert "OFFSET" not in sql
+
+
+def test_bulk_add_fetches_unknown_satellites_concurrently(fake_cache):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = USER
+    known = SimpleNamespace(norad_id=10, name="Known", category="Test")
+    fetched = SimpleNamespace(norad_id=20, name="Fetched", category="Test")
+    placeholder = SimpleNamespace(norad_id=30, name="Satellite 30", category="Unknown")
+    # Existing satellites, then the ones the API stored, then the placeholders
+    db.query.return_value.filter.return_value.all.side_effect = [[known], [fetched], [placeholder]]
+    added_at = datetime(2024, 1, 1)
+    inserted = MagicMock()
+    inserted.all.return_value = [
+        SimpleNamespace(norad_id=20, created_at=added_at),
+        SimpleNamespace(norad_id=30, created_at=added_at)
+    ]
+    db.execute.side_effect = [MagicMock(), inserted]
+
+    service = FavoriteService(db)
+    in_flight = 0
+    peak = 0
+    fetched_ids = []
+
+    async def get_satellite_info(norad_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        fetched_ids.append(norad_id)
+        if norad_id == 30:
+            raise ExternalAPIError("Unknown satellite")
+        return {"norad_id": norad_id}
+
+    service.satellite_service.get_satellite_info = get_satellite_info
+
+    result = asyncio.run(service.add_multiple_favorites_bulk(USER.id, [10, 20, 30, 20, 0]))
+
+    assert sorted(fetched_ids) == [20, 30]
+    assert peak == 2
+    # Placeholder row only for the satellite the API could not resolve
+    placeholder_insert = db.execute.call_args_list[0].args[0]
+    assert placeholder_insert.compile().params["norad_id_m0"] == 30
+    assert [item["name"] for item in result["added"]] == ["Fetched", "Satellite 30"]
+    assert result["total_added"] == 2
+    assert result["skipped"] == [
+        {"norad_id": 0, "reason": "Invalid NORAD ID: 0"},
+        {"norad_id": 10, "reason": "Already in favorites"}
+    ]
+    db.commit.assert_called_once()
+    assert fake_cache["favorites_version:1"] > 0
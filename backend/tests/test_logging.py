@@ -0,0 +1,71 @@
+import logging
+import queue
+
+from app.utils.logging_config import (
+    RoutingQueueHandler,
+    RoutingQueueListener,
+    StructuredFormatter,
+    setup_logging,
+    stop_logging
+)
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_queued_records_reach_their_target_handlers():
+    log_queue = queue.SimpleQueue()
+    info_handler = CaptureHandler(logging.INFO)
+    error_handler = CaptureHandler(logging.ERROR)
+    other_handler = CaptureHandler()
+    listener = RoutingQueueListener(log_queue)
+
+    logger = logging.getLogger("tests.queued")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [RoutingQueueHandler(log_queue, [info_handler, error_handler])]
+    listener.start()
+    try:
+        logger.debug("dropped by handler level")
+        logger.info("position %s", 25544, extra={"norad_id": 25544})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        listener.stop()
+        logger.handlers = []
+
+    assert [record.getMessage() for record in info_handler.records] == ["position 25544", "failed"]
+    assert [record.getMessage() for record in error_handler.records] == ["failed"]
+    assert other_handler.records == []
+
+    # Records are queued unformatted, so exc_info and extras survive for the formatter
+    info_record, error_record = info_handler.records
+    assert info_record.args == (25544,)
+    assert info_record.norad_id == 25544
+    assert error_record.exc_info[0] is ValueError
+    structured = StructuredFormatter().format(error_record)
+    assert "'exception': 'Traceback" in structured
+    assert "ValueError: boom" in structured
+
+
+def test_stop_logging_restores_original_handlers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app_logger = logging.getLogger("app")
+    try:
+        setup_logging()
+        assert [type(handler) for handler in app_logger.handlers] == [RoutingQueueHandler]
+        target_handlers = app_logger.handlers[0].target_handlers
+
+        stop_logging()
+        assert app_logger.handlers == target_handlers
+        assert not any(isinstance(handler, RoutingQueueHandler) for handler in app_logger.handlers)
+    finally:
+        stop_logging()
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import http_request_duration_seconds
+
+client = TestClient(app)
+
+
+def request_count(method, route, status_code):
+    for metric in http_request_duration_seconds.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels == {
+                "method": method, "route": route, "status_code": str(status_code)
+            }:
+                return sample.value
+    return 0
+
+
+def test_requests_rejected_by_authentication_are_measured():
+    before = request_count("GET", "unmatched", 401)
+
+    response = client.get("/api/v1/auth/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+    assert request_count("GET", "unmatched", 401) == before + 1
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from app.services import position_tracking_service as tracking_module
+from app.services.position_tracking_service import PositionTrackingService
+
+
+@pytest.fixture
+def shared_fetches(monkeypatch):
+    calls = []
+
+    async def fetch(norad_id, latitude, longitude, altitude):
+        calls.append((norad_id, latitude, longitude, altitude))
+        await asyncio.sleep(0.01)
+        return {"satlatitude": 1.0, "satlongitude": 2.0, "norad_id": norad_id}
+
+    monkeypatch.setattr(PositionTrackingService, "_fetch_shared_position", staticmethod(fetch))
+    return calls
+
+
+def test_concurrent_position_lookups_share_one_fetch(shared_fetches):
+    service = PositionTrackingService(MagicMock())
+
+    async def run():
+        return await asyncio.gather(
+            service._load_position(25544, 40.7128, -74.0060, 0),
+            service._load_position(25544, 40.7131, -74.0059, 0),
+            service._load_position(25544, 40.7128, -74.0060, 0)
+        )
+
+    results = asyncio.run(run())
+
+    assert len(shared_fetches) == 1
+    assert results[0] == results[1] == results[2]
+    # Each caller gets its own copy
+    assert results[0] is not results[1]
+    assert tracking_module._position_inflight == {}
+
+
+def test_position_lookups_are_not_shared_across_keys(shared_fetches):
+    service = PositionTrackingService(MagicMock())
+
+    async def run():
+        await asyncio.gather(
+            service._load_position(25544, 40.71, -74.00, 0),
+            service._load_position(25544, 40.71, -74.00, 500),
+            service._load_position(25544, 51.50, -0.12, 0),
+            service._load_position(20580, 40.71, -74.00, 0)
+        )
+
+    asyncio.run(run())
+
+    assert len(shared_fetches) == 4
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch(shared_fetches):
+    service = PositionTrackingService(MagicMock())
+
+    async def run():
+        first = asyncio.ensure_future(service._load_position(25544, 40.71, -74.00, 0))
+        second = asyncio.ensure_future(service._load_position(25544, 40.71, -74.00, 0))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run())["norad_id"] == 25544
+    assert len(shared_fetches) == 1
+
+
+def test_cached_history_age_is_computed_on_read():
+    service = PositionTrackingService(MagicMock())
+    service.cache_service = MagicMock()
+    created_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+    position = MagicMock(created_at=created_at)
+    position.to_dict.return_value = {"norad_id": 25544, "created_at": created_at.isoformat()}
+
+    history = list(service._stream_position_history(25544, 1, 10, [position]))
+    assert 119 <= history[0]["age_seconds"] <= 121
+
+    # The cached rows are stored without age, so a later read ages them again
+    cached_rows = service.cache_service.cache_position_history.call_args.args[3]
+    assert "age_seconds" not in cached_rows[0]
+    service.cache_service.get_cached_position_history.return_value = [
+        {**cached_rows[0], "created_at": (created_at - timedelta(seconds=60)).isoformat()}
+    ]
+    (aged,) = service.iter_position_history(25544, 1, 10)
+    assert 179 <= aged["age_seconds"] <= 181
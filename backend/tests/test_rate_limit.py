@@ -0,0 +1,116 @@
+import pytest
+from secrets import token_hex
+from time import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.auth_middleware import (
+    RATE_LIMIT_ALLOWED,
+    RATE_LIMIT_BLOCKED,
+    RATE_LIMIT_EXCEEDED,
+    RATE_LIMIT_SCRIPT,
+    RateLimitMiddleware
+)
+from app.redis_client import redis_client
+
+
+def make_client(redis=None):
+    app = FastAPI()
+
+    @app.get("/api/v1/auth/login")
+    def login():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, redis_client=redis)
+    return TestClient(app)
+
+
+class FakeScript:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.results.pop(0)
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+        self.registered = []
+
+    def register_script(self, source):
+        self.registered.append(source)
+        return self.script
+
+
+class BrokenRedis:
+    def register_script(self, source):
+        raise ConnectionError("Redis is down")
+
+
+def redis_available():
+    try:
+        return redis_client.ping()
+    except Exception:
+        return False
+
+
+def test_redis_script_decides_each_request():
+    script = FakeScript([RATE_LIMIT_ALLOWED, RATE_LIMIT_EXCEEDED, RATE_LIMIT_BLOCKED])
+    redis = FakeRedis(script)
+    client = make_client(redis)
+
+    assert client.get("/api/v1/auth/login").status_code == 200
+    response = client.get("/api/v1/auth/login")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "900"
+    assert response.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert client.get("/api/v1/auth/login").status_code == 429
+
+    # Registered once, then one EVALSHA per request
+    assert redis.registered == [RATE_LIMIT_SCRIPT]
+    assert len(script.calls) == 3
+    keys, args = script.calls[0]
+    assert keys == ["rate:auth:testclient", "blocked:auth:testclient"]
+    assert args[1:4] == [300, 5, 900]
+    # Each request gets its own sorted set member
+    assert script.calls[0][1][4] != script.calls[1][1][4]
+
+
+def test_falls_back_to_memory_when_redis_fails():
+    client = make_client(BrokenRedis())
+
+    for _ in range(5):
+        assert client.get("/api/v1/auth/login").status_code == 200
+    assert client.get("/api/v1/auth/login").status_code == 429
+
+
+def test_in_memory_limit_blocks_client():
+    client = make_client()
+
+    for _ in range(5):
+        assert client.get("/api/v1/auth/login").status_code == 200
+    response = client.get("/api/v1/auth/login")
+    assert response.status_code == 429
+    assert response.json()["error"]["details"]["retry_after"] == 900
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis is not available")
+def test_rate_limit_script_in_redis():
+    script = redis_client.register_script(RATE_LIMIT_SCRIPT)
+    keys = [f"rate:test:{token_hex(4)}", f"blocked:test:{token_hex(4)}"]
+
+    def admit():
+        return int(script(keys=keys, args=[time(), 60, 2, 30, token_hex(8)]))
+
+    try:
+        assert admit() == RATE_LIMIT_ALLOWED
+        assert admit() == RATE_LIMIT_ALLOWED
+        assert admit() == RATE_LIMIT_EXCEEDED
+        assert admit() == RATE_LIMIT_BLOCKED
+        assert redis_client.zcard(keys[0]) == 2
+        assert 0 < redis_client.ttl(keys[1]) <= 30
+    finally:
+        redis_client.delete(*keys)
@@ -1,5 +1,8 @@
 import httpClient from './httpClient';
 
+// Largest page the favorites endpoint accepts
+const FAVORITES_PAGE_SIZE = 200;
+
 class UserService {
   /**
    * Get user's saved location
@@ -73,12 +76,24 @@ class UserService {
 
   /**
    * Get user's favorite satellites
+   * The endpoint is paginated, so pages are followed through next_cursor
+   * until the whole list has been read.
    * @returns {Promise<Array>} Array of favorite satellites with current positions
    */
   async getFavorites() {
     try {
-      const response = await httpClient.get('/users/favorites');
-      return response.data.favorites || [];
+      const favorites = [];
+      let cursor = null;
+      do {
+        const params = { limit: FAVORITES_PAGE_SIZE };
+        if (cursor !== null) {
+          params.cursor = cursor;
+        }
+        const response = await httpClient.get('/users/favorites', { params });
+        favorites.push(...(response.data.favorites || []));
+        cursor = response.data.next_cursor ?? null;
+      } while (cursor !== null);
+      return favorites;
     } catch (error) {
       // Handle specific error cases more gracefully
       if (error.response?.status === 404) {